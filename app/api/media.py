@@ -0,0 +1,69 @@
+import os
+from fastapi import APIRouter, Request, Response
+from fastapi.responses import RedirectResponse, StreamingResponse
+
+from app.services.media_service import MEDIA_OFFLOAD_HEADER, MediaService
+
+router = APIRouter()
+
+@router.api_route("/{filename:path}", methods=["GET", "HEAD"])
+def read_media(filename: str, request: Request) -> Response:
+    """
+    Serve an uploaded photo, thumbnail or document.
+
+    Content-addressed files are served with `Cache-Control: immutable` (their
+    name changes with their content); all files get a strong ETag, honour
+    If-None-Match, single byte ranges (with If-Range) and precompressed
+    .br/.gz siblings. With MEDIA_OFFLOAD_HEADER set, only headers are
+    returned and the front proxy sends the bytes. With an object store
+    backend, redirects to a presigned URL instead.
+    """
+    redirect = MediaService.presigned_redirect(filename)
+    if redirect:
+        url, cache_control = redirect
+        return RedirectResponse(url, status_code=307, headers={"Cache-Control": cache_control})
+
+    media = MediaService.resolve(filename, request.headers.get("accept-encoding", ""))
+    headers = {
+        "ETag": media.etag,
+        "Cache-Control": media.cache_control,
+        "Accept-Ranges": "bytes",
+        "Vary": "Accept-Encoding",
+    }
+    if media.content_encoding:
+        headers["Content-Encoding"] = media.content_encoding
+
+    if MediaService.etag_matches(request.headers.get("if-none-match"), media.etag):
+        return Response(status_code=304, headers=headers)
+
+    if MEDIA_OFFLOAD_HEADER:
+        if MEDIA_OFFLOAD_HEADER.lower() == "x-accel-redirect":
+            headers[MEDIA_OFFLOAD_HEADER] = MediaService.offload_path(media)
+        else:
+            headers[MEDIA_OFFLOAD_HEADER] = os.path.abspath(media.path)
+        return Response(headers=headers, media_type=media.content_type)
+
+    # Ranges address the encoded bytes: only offered for identity responses
+    byte_range = None
+    if not media.content_encoding:
+        if_range = request.headers.get("if-range")
+        if not if_range or if_range.strip() == media.etag:
+            byte_range = MediaService.parse_range(request.headers.get("range"), media.size)
+
+    if byte_range:
+        start, end = byte_range
+        status_code = 206
+        headers["Content-Range"] = f"bytes {start}-{end}/{media.size}"
+    else:
+        start, end = 0, media.size - 1
+        status_code = 200
+    headers["Content-Length"] = str(end - start + 1)
+
+    if request.method == "HEAD":
+        return Response(status_code=status_code, headers=headers, media_type=media.content_type)
+    return StreamingResponse(
+        MediaService.iter_file(media.path, start, end),
+        status_code=status_code,
+        headers=headers,
+        media_type=media.content_type,
+    )
@@ -16,3 +16,5 @@ from app.api.v1.endpoints import maintenance
 api_router.include_router(maintenance.router, prefix="/operations/maintenance", tags=["maintenance"])
 from app.api.v1.endpoints import reports
 api_router.include_router(reports.router, prefix="/reports", tags=["reports"])
+from app.api.v1.endpoints import archive
+api_router.include_router(archive.router, prefix="/archive", tags=["archive"])
@@ -0,0 +1,47 @@
+from typing import Any, List, Optional
+from fastapi import APIRouter, HTTPException, Query
+
+from app.api.deps import SessionDep, CurrentUser
+from app.core.rbac import RoleChecker
+from app.models.archive import ArchivedAsset
+from app.services.archive_service import ArchiveService
+
+router = APIRouter()
+
+@router.post("/run")
+def run_archive(
+    session: SessionDep,
+    current_user: CurrentUser,
+    retention_days: Optional[int] = Query(None, ge=0),
+) -> Any:
+    """
+    Move DISPOSED assets whose disposal is older than the retention period
+    (ARCHIVE_RETENTION_DAYS by default) into the archive, with their photos,
+    verifications, maintenance, transfers and disposals.
+    """
+    if not RoleChecker.is_admin(current_user.roles):
+        raise HTTPException(status_code=403, detail="Only IT Admins can run the archival")
+    archived = ArchiveService.archive_disposed(session, retention_days=retention_days)
+    return {"archived": archived}
+
+@router.get("/assets", response_model=List[ArchivedAsset])
+def read_archived_assets(
+    session: SessionDep,
+    current_user: CurrentUser,
+    skip: int = 0,
+    limit: int = Query(100, le=1000),
+) -> Any:
+    """Archived assets, most recently archived first"""
+    return ArchiveService.list_archived(session, skip=skip, limit=limit)
+
+@router.get("/assets/{asset_id}", response_model=ArchivedAsset)
+def read_archived_asset(
+    asset_id: str,
+    session: SessionDep,
+    current_user: CurrentUser,
+) -> Any:
+    """An archived asset with its photos, verifications, maintenance, transfers and disposals"""
+    archived = ArchiveService.get_archived(session, asset_id)
+    if not archived:
+        raise HTTPException(status_code=404, detail="Archived asset not found")
+    return archived
@@ -1,20 +1,38 @@
-from typing import Any, List
+from typing import Any, Dict, List
 import shutil
-import os
 import uuid
-from fastapi import APIRouter, UploadFile, File, HTTPException, Path
+from fastapi import APIRouter, UploadFile, File, HTTPException, Path, Request
+from fastapi.concurrency import run_in_threadpool
 from sqlmodel import select
 
 from app.api.deps import SessionDep, CurrentUser
 from app.models.asset import Asset
 from app.models.asset_photo import AssetPhoto
-from app.schemas.asset_photo import AssetPhotoRead
-from app.core.config import settings
+from app.schemas.asset_photo import AssetPhotoBatchRequest, AssetPhotoRead
+from app.core.uploads import PHOTO_UPLOAD, UPLOAD_CHUNK_SIZE, UploadWriter, too_large
 
-from app.services.photo_service import PhotoService
+from app.services.photo_service import MAX_PHOTOS_PER_ASSET, PhotoService
+from app.services.blob_service import BlobService
 
 router = APIRouter()
 
+@router.post("/photos/batch", response_model=Dict[str, List[AssetPhotoRead]])
+def get_photos_batch(
+    *,
+    session: SessionDep,
+    batch_in: AssetPhotoBatchRequest,
+    current_user: CurrentUser,
+) -> Any:
+    """
+    Photos of up to 500 assets in one call, keyed by asset ID (profile photo first).
+    Unknown assets and assets without photos map to an empty list.
+    """
+    photos = PhotoService.get_photos_for_assets(session, list(dict.fromkeys(batch_in.asset_ids)))
+    return {
+        asset_id: [PhotoService.to_read(p) for p in asset_photos]
+        for asset_id, asset_photos in photos.items()
+    }
+
 @router.post("/{asset_id}/photos", response_model=AssetPhotoRead)
 def upload_asset_photo(
     *,
@@ -43,7 +61,66 @@ def upload_asset_photo(
         filename=db_photo.filename,
         is_profile=db_photo.is_profile,
         created_at=db_photo.created_at,
-        url=PhotoService.get_photo_url(db_photo.filename)
+        url=PhotoService.get_photo_url(db_photo.filename),
+        thumb_url=PhotoService.get_thumb_url(db_photo.filename, db_photo.thumb_filename)
+    )
+
+def _save_streamed_photo(session: SessionDep, asset_id: str, writer: UploadWriter) -> AssetPhoto:
+    db_photo = PhotoService.save_photo_upload(session, asset_id, writer)
+    if not db_photo:
+        raise HTTPException(status_code=400, detail="Maximum of 3 photos allowed per asset")
+    session.commit()
+    session.refresh(db_photo)
+    return db_photo
+
+@router.post("/{asset_id}/photos/stream", response_model=AssetPhotoRead)
+async def stream_asset_photo(
+    *,
+    session: SessionDep,
+    asset_id: str,
+    request: Request,
+    current_user: CurrentUser,
+) -> Any:
+    """
+    Upload a photo sent as the raw request body instead of a multipart form
+    (e.g. `curl --data-binary @photo.jpg`). The body is streamed straight to
+    storage, hashed and type-checked on the fly, and rejected with 413 as soon
+    as it exceeds the photo size limit. Disk and database work run in the threadpool,
+    photo normalization (resize, re-encode, EXIF removal) in its process pool.
+    """
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > PHOTO_UPLOAD.max_bytes:
+        raise too_large(PHOTO_UPLOAD)
+    asset = await run_in_threadpool(session.get, Asset, asset_id)
+    if not asset:
+        raise HTTPException(status_code=404, detail="Asset not found")
+    if await run_in_threadpool(PhotoService.photo_count, session, asset_id) >= MAX_PHOTOS_PER_ASSET:
+        raise HTTPException(status_code=400, detail="Maximum of 3 photos allowed per asset")
+
+    writer = await run_in_threadpool(UploadWriter, PHOTO_UPLOAD)
+    try:
+        # Small network chunks are batched into one disk write per UPLOAD_CHUNK_SIZE
+        pending = bytearray()
+        async for chunk in request.stream():
+            pending += chunk
+            if len(pending) >= UPLOAD_CHUNK_SIZE:
+                await run_in_threadpool(writer.write, bytes(pending))
+                pending.clear()
+        if pending:
+            await run_in_threadpool(writer.write, bytes(pending))
+        await run_in_threadpool(writer.finish)
+        db_photo = await run_in_threadpool(_save_streamed_photo, session, asset_id, writer)
+    finally:
+        await run_in_threadpool(writer.discard)
+
+    return AssetPhotoRead(
+        id=db_photo.id,
+        asset_id=db_photo.asset_id,
+        filename=db_photo.filename,
+        is_profile=db_photo.is_profile,
+        created_at=db_photo.created_at,
+        url=PhotoService.get_photo_url(db_photo.filename),
+        thumb_url=PhotoService.get_thumb_url(db_photo.filename, db_photo.thumb_filename)
     )
 
 @router.delete("/{asset_id}/photos/{photo_id}")
@@ -60,10 +137,8 @@ def delete_asset_photo(
     if photo.asset_id != asset_id:
         raise HTTPException(status_code=400, detail="Photo does not belong to this asset")
         
-    # delete from file system
-    file_path = os.path.join(settings.UPLOAD_DIR, photo.filename)
-    if os.path.exists(file_path):
-        os.remove(file_path)
+    # Files are removed after the commit if no other photo shares them
+    BlobService.release(session, photo.filename, photo.thumb_filename)
         
     session.delete(photo)
     session.commit()
@@ -107,7 +182,8 @@ def set_profile_picture(
         filename=target_photo.filename,
         is_profile=target_photo.is_profile,
         created_at=target_photo.created_at,
-        url=f"/static/{target_photo.filename}"
+        url=PhotoService.get_photo_url(target_photo.filename),
+        thumb_url=PhotoService.get_thumb_url(target_photo.filename, target_photo.thumb_filename)
     )
     return photo_read
 
@@ -128,6 +204,7 @@ def get_asset_photos(
             filename=p.filename,
             is_profile=p.is_profile,
             created_at=p.created_at,
-            url=f"/static/{p.filename}"
+            url=PhotoService.get_photo_url(p.filename),
+            thumb_url=PhotoService.get_thumb_url(p.filename, p.thumb_filename)
         ) for p in photos
     ]
@@ -1,17 +1,35 @@
-from typing import Any, List
-from fastapi import APIRouter, HTTPException, Form, File, UploadFile
-from sqlmodel import select
-from sqlalchemy.orm import selectinload
+from datetime import datetime
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Form, File, UploadFile, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.exc import IntegrityError
 import logging
 import json
 
 from app.api.deps import SessionDep, CurrentUser
+from app.core.http_cache import conditional_response
+from app.core.pagination import decode_cursor, set_next_cursor, set_total_count
+from app.core.rbac import RoleChecker
+from app.core.sparse_fields import resolve_fields, sparse_response
 from app.models.asset import Asset
-from app.schemas.asset import AssetCreate, AssetUpdate, AssetRead, AssetDetailedRead, LocationInfo, SiteInfo
-from app.services.asset_service import AssetService
+from app.models.asset_change import AssetChange
+from app.schemas.asset import (
+    AssetCreate, AssetUpdate, AssetRead, AssetDetailedRead, AssetFilter, AssetImportReport,
+    AssetBulkUpdate, AssetBulkUpdateResult, AssetScanRead, SiteNode
+)
 from app.services.photo_service import PhotoService
-from app.models.master_data import AssetSubCategory, Location, Site
+from app.services.blob_service import BlobService
+from app.services.asset_query_service import AssetQueryService, DEFAULT_SORT
+from app.services.search_service import AssetSearchService
+from app.services.export_service import AssetExportService
+from app.services.import_service import AssetImportService
+from app.services.scom_id_service import ScomIdService
+from app.services.bulk_update_service import AssetBulkService
+from app.services.scan_service import ScanService
+from app.services.journal_service import AssetJournalService
+from app.services.archive_service import ArchiveService
+from app.services.hierarchy_service import HierarchyService
+from app.models.master_data import AssetSubCategory
 
 router = APIRouter()
 
@@ -19,102 +37,190 @@ router = APIRouter()
 def read_assets(
     session: SessionDep,
     current_user: CurrentUser,
+    request: Request,
+    response: Response,
+    filters: AssetFilter = Depends(),
+    sort: str = DEFAULT_SORT,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
 ) -> Any:
-    """Get all assets with location and site information"""
-    assets = session.exec(select(Asset).options(selectinload(Asset.photos)).offset(skip).limit(limit)).all()
-    
-    results = []
-    for asset in assets:
-        # Create AssetDetailedRead from asset data
-        asset_detailed = AssetDetailedRead.model_validate(asset)
-        
-        # Populate photo info
-        asset_detailed.photo_count = len(asset.photos)
-        
-        if asset.photos:
-            # Try to find profile photo, otherwise use the first one
-            profile_photo = next((p for p in asset.photos if p.is_profile), asset.photos[0])
-            
-            # Construct URL
-            asset_detailed.profile_photo_url = f"/static/{profile_photo.filename}"
-            asset_detailed.profile_photo_thumb_url = f"/static/{profile_photo.filename}"
-        
-        # Load location and site information
-        if asset.location_id:
-            location = session.get(Location, asset.location_id)
-            if location:
-                location_info = LocationInfo(
-                    location_id=location.location_id,
-                    location_code=location.location_code,
-                    location_name=location.location_name,
-                    location_name_code=location.location_name_code
-                )
-                
-                # Load site information
-                if location.site_id:
-                    site = session.get(Site, location.site_id)
-                    if site:
-                        location_info.site = SiteInfo(
-                            site_id=site.site_id,
-                            site_code=site.site_code,
-                            site_name=site.site_name
-                        )
-                
-                asset_detailed.location = location_info
-            
-        results.append(asset_detailed)
-        
+    """
+    Get all assets with location and site information.
+
+    Filters are applied server-side. `sort` is one of the whitelisted fields,
+    prefixed with "-" for descending order (e.g. "-date_of_acquisition").
+    Pass the X-Next-Cursor response header back as `cursor` (with the same
+    filters and sort) to walk the register page by page; `skip` is kept for
+    backward compatibility.
+    Supports conditional GET: send the ETag back in If-None-Match to get a 304.
+    `fields` (e.g. "SCOMAssetID,assetName") returns only those asset columns, without enrichment.
+    X-Total-Count holds the number of matching assets (an estimate for large
+    filtered results on Postgres, flagged by X-Total-Count-Estimated).
+    """
+    resolved = resolve_fields(Asset, fields) if fields else None
+    after = decode_cursor(cursor, AssetQueryService.cursor_types(sort)) if cursor else None
+    # The total is part of the ETag: a 304 keeps the client's X-Total-Count
+    total = AssetQueryService.count(session, filters)
+    etag = AssetQueryService.page_etag(
+        session, filters=filters, sort=sort, skip=skip, limit=limit, after=after, total=total
+    )
+    not_modified = conditional_response(request, response, etag)
+    if not_modified:
+        return not_modified
+    set_total_count(response, *total)
+
+    if resolved:
+        rows = AssetQueryService.list_fields(
+            session, resolved, filters=filters, sort=sort, skip=skip, limit=limit, after=after
+        )
+        if rows:
+            set_next_cursor(response, len(rows), limit, *AssetQueryService.cursor_values(rows[-1], sort))
+        return sparse_response(rows, resolved, response)
+
+    # Location/site/photo summary come from the read model joined on the primary key: one query per page
+    results = AssetQueryService.list_detailed(
+        session, filters=filters, sort=sort, skip=skip, limit=limit, after=after
+    )
+    if results:
+        set_next_cursor(response, len(results), limit, *AssetQueryService.cursor_values(results[-1], sort))
     return results
 
+@router.get("/export")
+def export_assets(
+    current_user: CurrentUser,
+    filters: AssetFilter = Depends(),
+    export_format: str = Query("csv", alias="format", pattern="^(csv|ndjson)$"),
+) -> Any:
+    """
+    Stream the whole (optionally filtered) asset register as CSV or NDJSON.
+    Rows are read through a server-side cursor, so memory stays flat whatever the register size.
+    """
+    if export_format == "ndjson":
+        return StreamingResponse(
+            AssetExportService.stream_ndjson(filters),
+            media_type="application/x-ndjson",
+            headers={"Content-Disposition": 'attachment; filename="assets.ndjson"'},
+        )
+    return StreamingResponse(
+        AssetExportService.stream_csv(filters),
+        media_type="text/csv",
+        headers={"Content-Disposition": 'attachment; filename="assets.csv"'},
+    )
+
+@router.get("/search", response_model=List[AssetDetailedRead])
+def search_assets(
+    session: SessionDep,
+    current_user: CurrentUser,
+    q: str = Query(..., min_length=2),
+    limit: int = Query(20, ge=1, le=100),
+) -> Any:
+    """
+    Ranked search across asset name, brand, model, tag number, VIN and SCOM ID.
+    Backed by the trigram/full-text index (FTS5 on SQLite).
+    """
+    asset_ids = AssetSearchService.search(session, q, limit=limit)
+    return AssetQueryService.get_detailed_many(session, asset_ids)
+
+@router.get("/as-of", response_model=List[AssetRead])
+def read_assets_as_of(
+    session: SessionDep,
+    current_user: CurrentUser,
+    at: datetime = Query(..., description="Point in time (ISO 8601, UTC if no offset)"),
+    location_id: Optional[str] = None,
+    custodian_id: Optional[str] = None,
+    skip: int = 0,
+    limit: int = Query(100, le=1000),
+) -> Any:
+    """
+    The asset register as it was at `at`, rebuilt from the change journal.
+    Assets created later are left out, assets deleted since are included.
+    `location_id` / `custodian_id` filter on the values at `at`.
+    """
+    states = AssetJournalService.register_as_of(
+        session, at, location_id=location_id, custodian_id=custodian_id, skip=skip, limit=limit
+    )
+    return [AssetRead.model_validate(s) for s in states]
+
+@router.get("/hierarchy", response_model=List[SiteNode])
+def read_asset_hierarchy(
+    session: SessionDep,
+    current_user: CurrentUser,
+) -> Any:
+    """
+    Site -> location tree with the number of assets and their total acquisition
+    value per location and per site. Computed with one grouped query and cached.
+    """
+    return HierarchyService.get_tree(session)
+
+@router.get("/by-tag/{physical_asset_tag_number}", response_model=AssetScanRead)
+def read_asset_by_tag(
+    physical_asset_tag_number: str,
+    session: SessionDep,
+    current_user: CurrentUser,
+) -> Any:
+    """
+    Scanner lookup by physical tag number: ID, name, status, location code and
+    custodian name only. Served from an in-process cache when possible.
+    """
+    asset = ScanService.lookup_by_tag(session, physical_asset_tag_number)
+    if not asset:
+        raise HTTPException(status_code=404, detail="Asset not found")
+    return asset
+
 @router.get("/{asset_id}", response_model=AssetDetailedRead)
 def read_asset(
     asset_id: str,
     session: SessionDep,
     current_user: CurrentUser,
+    request: Request,
+    response: Response,
+    include_archived: bool = False,
 ) -> Any:
-    """Get detailed asset information including location and site"""
-    asset = session.get(Asset, asset_id)
-    if not asset:
+    """
+    Get detailed asset information including location and site (supports If-None-Match).
+    With include_archived, archived (disposed) assets are returned as well.
+    """
+    version = AssetQueryService.asset_version(session, asset_id)
+    if not version:
+        archived = ArchiveService.get_archived(session, asset_id) if include_archived else None
+        if archived:
+            return ArchiveService.to_detailed_read(archived)
+        raise HTTPException(status_code=404, detail="Asset not found")
+    not_modified = conditional_response(request, response, *version)
+    if not_modified:
+        return not_modified
+
+    asset_detailed = AssetQueryService.get_detailed(session, asset_id)
+    if not asset_detailed:
         raise HTTPException(status_code=404, detail="Asset not found")
-    
-    # Create the detailed response
-    asset_detailed = AssetDetailedRead.model_validate(asset)
-    
-    # Load location and site information
-    if asset.location_id:
-        location = session.get(Location, asset.location_id)
-        if location:
-            location_info = LocationInfo(
-                location_id=location.location_id,
-                location_code=location.location_code,
-                location_name=location.location_name,
-                location_name_code=location.location_name_code
-            )
-            
-            # Load site information
-            if location.site_id:
-                site = session.get(Site, location.site_id)
-                if site:
-                    location_info.site = SiteInfo(
-                        site_id=site.site_id,
-                        site_code=site.site_code,
-                        site_name=site.site_name
-                    )
-            
-            asset_detailed.location = location_info
-    
-    # Load photo information
-    photos = session.exec(select(Asset).where(Asset.scom_asset_id == asset_id).options(selectinload(Asset.photos))).first()
-    if photos and photos.photos:
-        asset_detailed.photo_count = len(photos.photos)
-        profile_photo = next((p for p in photos.photos if p.is_profile), photos.photos[0])
-        asset_detailed.profile_photo_url = f"/static/{profile_photo.filename}"
-        asset_detailed.profile_photo_thumb_url = f"/static/{profile_photo.filename}"
-    
     return asset_detailed
 
+@router.get("/{asset_id}/as-of", response_model=AssetRead)
+def read_asset_as_of(
+    asset_id: str,
+    session: SessionDep,
+    current_user: CurrentUser,
+    at: datetime = Query(..., description="Point in time (ISO 8601, UTC if no offset)"),
+) -> Any:
+    """Asset as it was at `at` (e.g. where it was on 31 Dec), rebuilt from the change journal"""
+    state = AssetJournalService.asset_as_of(session, asset_id, at)
+    if state is None:
+        raise HTTPException(status_code=404, detail="Asset did not exist at that time")
+    return AssetRead.model_validate(state)
+
+@router.get("/{asset_id}/history", response_model=List[AssetChange])
+def read_asset_history(
+    asset_id: str,
+    session: SessionDep,
+    current_user: CurrentUser,
+    skip: int = 0,
+    limit: int = Query(100, le=1000),
+) -> Any:
+    """Journaled changes of an asset, newest first"""
+    return AssetJournalService.history(session, asset_id, skip=skip, limit=limit)
+
 @router.post("/", response_model=Asset)
 def create_asset(
     *,
@@ -132,7 +238,7 @@ def create_asset(
 
     # 2. Generate SCOM ID
     try:
-        scom_id = AssetService.generate_scom_id(
+        scom_id = ScomIdService.allocate(
             session, 
             asset_in.legal_entity_id, 
             asset_in.location_id, 
@@ -158,6 +264,7 @@ def create_asset(
         "date_of_last_physical_verification": date.today()
     })
     session.add(asset)
+    AssetJournalService.attribute(session, "create_asset", current_user.user_id)
     
     try:
         session.commit()
@@ -191,6 +298,38 @@ def create_asset(
         
     return asset
 
+@router.post("/import", response_model=AssetImportReport)
+def import_assets(
+    *,
+    session: SessionDep,
+    file: UploadFile = File(...),
+    current_user: CurrentUser,
+) -> Any:
+    """
+    Bulk-create assets from a CSV or XLSX file (one asset per row, AssetCreate columns).
+    Rows are validated, resolved and inserted in chunks; per-row errors are reported at the end.
+    """
+    if not RoleChecker.can_manage(current_user.roles):
+        raise HTTPException(status_code=403, detail="Not enough permissions")
+    return AssetImportService.import_assets(
+        session, file, verified_by=current_user.full_name, changed_by=current_user.user_id
+    )
+
+@router.patch("/bulk", response_model=AssetBulkUpdateResult)
+def bulk_update_assets(
+    *,
+    session: SessionDep,
+    bulk_in: AssetBulkUpdate,
+    current_user: CurrentUser,
+) -> Any:
+    """
+    Apply the same partial AssetUpdate to a list of asset IDs or to every asset matching a filter,
+    in one transaction. Returns a summary instead of the updated rows.
+    """
+    if not RoleChecker.can_manage(current_user.roles):
+        raise HTTPException(status_code=403, detail="Not enough permissions")
+    return AssetBulkService.bulk_update(session, bulk_in, changed_by=current_user.user_id)
+
 @router.patch("/{asset_id}", response_model=Asset)
 def update_asset(
     *,
@@ -208,6 +347,7 @@ def update_asset(
         setattr(asset, key, value)
         
     session.add(asset)
+    AssetJournalService.attribute(session, "update_asset", current_user.user_id)
     session.commit()
     session.refresh(asset)
     return asset
@@ -222,6 +362,12 @@ def delete_asset(
     if not asset:
         raise HTTPException(status_code=404, detail="Asset not found")
     
+    # Photos go with the asset; their files are removed after the commit
+    # unless another photo shares them
+    for photo in asset.photos:
+        BlobService.release(session, photo.filename, photo.thumb_filename)
+        session.delete(photo)
     session.delete(asset)
+    AssetJournalService.attribute(session, "delete_asset", current_user.user_id)
     session.commit()
     return asset
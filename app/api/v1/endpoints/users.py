@@ -1,5 +1,5 @@
-from typing import Any, List
-from fastapi import APIRouter, HTTPException
+from typing import Any, List, Optional
+from fastapi import APIRouter, HTTPException, Response
 from sqlmodel import select
 
 from app.core import security
@@ -7,7 +7,10 @@ from app.api.deps import SessionDep, CurrentUser
 from app.models.user import User
 from app.models.enums import UserRole
 from app.core.rbac import RoleChecker
+from app.core.pagination import decode_cursor, set_next_cursor, set_total_count
+from app.core.sparse_fields import fields_statement, resolve_fields, sparse_response
 from app.schemas.user import UserCreate, UserUpdate
+from app.services.count_service import CountService
 
 router = APIRouter()
 
@@ -15,15 +18,38 @@ router = APIRouter()
 def read_users(
     session: SessionDep,
     current_user: CurrentUser,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
 ) -> Any:
     """
     Retrieve users.
+
+    Ordered by user_id. Pass the X-Next-Cursor response header back as
+    `cursor` for keyset pagination; `skip` still works.
+    `fields` (e.g. "userId,fullName") selects only those columns.
+    X-Total-Count holds the number of users.
     """
     # Note: All authenticated users can view the user list
     # Add role-based filtering here if needed using RoleChecker
-    users = session.exec(select(User).offset(skip).limit(limit)).all()
+    resolved = resolve_fields(User, fields) if fields else None
+    if resolved:
+        statement = fields_statement(User, resolved, required=["user_id"])
+    else:
+        statement = select(User)
+    statement = statement.order_by(User.user_id)
+    if cursor:
+        statement = statement.where(User.user_id > decode_cursor(cursor, [str])[0])
+    else:
+        statement = statement.offset(skip)
+    users = session.exec(statement.limit(limit)).all()
+    if users:
+        set_next_cursor(response, len(users), limit, users[-1].user_id)
+    set_total_count(response, CountService.total(session, User))
+    if resolved:
+        return sparse_response(users, resolved, response)
     return users
 
 @router.get("/me", response_model=User)
@@ -1,6 +1,6 @@
 from datetime import datetime
 from typing import Any, List, Optional
-from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi import APIRouter, HTTPException, Depends, Query, Response
 from sqlmodel import select, and_
 
 from app.api.deps import SessionDep, CurrentUser
@@ -14,6 +14,10 @@ from app.models.asset import Asset
 from app.models.user import User
 from app.models.enums import UserRole
 from app.core.rbac import RoleChecker
+from app.core.pagination import decode_cursor, keyset_after, set_next_cursor, set_total_count
+from app.core.sparse_fields import fields_statement, resolve_fields, sparse_response
+from app.services.journal_service import AssetJournalService
+from app.services.count_service import CountService
 from app.schemas.verification import (
     VerificationSessionCreate, 
     VerificationSessionRead,
@@ -56,10 +60,25 @@ def create_session(
 def read_sessions(
     session: SessionDep,
     current_user: CurrentUser,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
 ) -> Any:
-    db_sessions = session.exec(select(VerificationSession).offset(skip).limit(limit)).all()
+    """
+    List verification sessions ordered by id.
+    Pass the X-Next-Cursor response header back as `cursor` for keyset pagination.
+    X-Total-Count holds the number of sessions.
+    """
+    statement = select(VerificationSession).order_by(VerificationSession.id)
+    if cursor:
+        statement = statement.where(VerificationSession.id > decode_cursor(cursor, [int])[0])
+    else:
+        statement = statement.offset(skip)
+    db_sessions = session.exec(statement.limit(limit)).all()
+    if db_sessions:
+        set_next_cursor(response, len(db_sessions), limit, db_sessions[-1].id)
+    set_total_count(response, CountService.total(session, VerificationSession))
     
     results = []
     for s in db_sessions:
@@ -206,6 +225,8 @@ def record_asset_verification(
         notes=verification_in.notes
     )
     session.add(db_verification)
+    session.flush()
+    AssetJournalService.attribute(session, "verification", current_user.user_id, reference=str(db_verification.id))
     
     # Update Asset status and verification metadata
     asset.asset_status = verification_in.status_at_verification
@@ -241,15 +262,44 @@ def get_session_report(
 def get_all_verifications(
     session: SessionDep,
     current_user: CurrentUser,
+    response: Response,
     asset_id: Optional[str] = Query(None),
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
 ) -> Any:
     """
     Retrieve all verification records, optionally filtered by asset.
+
+    Ordered by (scanned_at, id). Pass the X-Next-Cursor response header back
+    as `cursor` for keyset pagination; `skip` still works.
+    `fields` (e.g. "asset_id,scanned_at") selects only those columns.
+    X-Total-Count holds the number of matching records.
     """
-    statement = select(AssetVerification)
+    sort_key = [AssetVerification.scanned_at, AssetVerification.id]
+    resolved = resolve_fields(AssetVerification, fields) if fields else None
+    if resolved:
+        statement = fields_statement(AssetVerification, resolved, required=["scanned_at", "id"])
+    else:
+        statement = select(AssetVerification)
+    statement = statement.order_by(*sort_key)
     if asset_id:
         statement = statement.where(AssetVerification.asset_id == asset_id)
-    verifications = session.exec(statement.offset(skip).limit(limit)).all()
+    if cursor:
+        statement = statement.where(keyset_after(sort_key, decode_cursor(cursor, [datetime, int])))
+    else:
+        statement = statement.offset(skip)
+    verifications = session.exec(statement.limit(limit)).all()
+    if verifications:
+        last = verifications[-1]
+        set_next_cursor(response, len(verifications), limit, last.scanned_at, last.id)
+    if asset_id:
+        set_total_count(response, *CountService.count(
+            session, select(AssetVerification.id).where(AssetVerification.asset_id == asset_id)
+        ))
+    else:
+        set_total_count(response, CountService.total(session, AssetVerification))
+    if resolved:
+        return sparse_response(verifications, resolved, response)
     return verifications
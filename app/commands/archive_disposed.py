@@ -0,0 +1,28 @@
+"""
+Archive disposed assets past the retention period, e.g. from a nightly cron:
+
+    python -m app.commands.archive_disposed --retention-days 365
+"""
+
+import argparse
+
+from sqlmodel import Session
+
+from app.core.db import engine
+from app.services.archive_service import ARCHIVE_BATCH_SIZE, ArchiveService
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--retention-days", type=int, default=None,
+                        help="days since the disposal was approved (default: ARCHIVE_RETENTION_DAYS)")
+    parser.add_argument("--batch-size", type=int, default=ARCHIVE_BATCH_SIZE)
+    args = parser.parse_args()
+
+    with Session(engine) as session:
+        archived = ArchiveService.archive_disposed(session, args.retention_days, args.batch_size)
+    print(f"Archived {archived} disposed assets")
+
+
+if __name__ == "__main__":
+    main()
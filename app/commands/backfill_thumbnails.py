@@ -0,0 +1,41 @@
+"""
+Generate thumbnails for asset photos uploaded before thumbnails existed:
+
+    python -m app.commands.backfill_thumbnails [--limit N]
+"""
+
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlmodel import Session, select
+
+from app.core.db import engine
+from app.models.asset_photo import AssetPhoto
+from app.services.thumbnail_service import THUMBNAIL_WORKERS, ThumbnailService
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--limit", type=int, default=None, help="process at most N files")
+    parser.add_argument("--workers", type=int, default=THUMBNAIL_WORKERS)
+    args = parser.parse_args()
+
+    with Session(engine) as session:
+        statement = (
+            select(AssetPhoto.filename)
+            .where(AssetPhoto.thumb_filename.is_(None))
+            .distinct()
+            .order_by(AssetPhoto.filename)
+        )
+        if args.limit:
+            statement = statement.limit(args.limit)
+        filenames = session.exec(statement).all()
+
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        results = list(pool.map(ThumbnailService.generate, filenames))
+    done = sum(1 for r in results if r)
+    print(f"Generated {done} thumbnails, {len(filenames) - done} failed or skipped")
+
+
+if __name__ == "__main__":
+    main()
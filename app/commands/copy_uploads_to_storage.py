@@ -0,0 +1,47 @@
+"""
+Copy the uploads of the local UPLOAD_DIR into the configured storage backend:
+
+    STORAGE_BACKEND=s3 python -m app.commands.copy_uploads_to_storage
+
+Run it (after dedupe_uploads and shard_uploads) when moving to an object
+store. Files already present in the backend are skipped, so the command can
+be re-run to pick up files uploaded meanwhile; local files are left in place.
+"""
+
+import os
+import shutil
+import tempfile
+
+from app.core.config import settings
+from app.core.storage import LocalStorage, get_storage
+from app.core.uploads import upload_path
+
+
+def main() -> None:
+    storage = get_storage()
+    if isinstance(storage, LocalStorage):
+        print("STORAGE_BACKEND is local: nothing to copy")
+        return
+
+    copied = skipped = 0
+    for stored in LocalStorage().iter_files():
+        if storage.exists(stored.name):
+            skipped += 1
+            continue
+        # put_file consumes its input: hand it a copy
+        fd, copy_path = tempfile.mkstemp(dir=settings.UPLOAD_DIR, prefix=".copy_")
+        os.close(fd)
+        try:
+            shutil.copyfile(upload_path(stored.name), copy_path)
+            storage.put_file(copy_path, stored.name)
+        finally:
+            if os.path.exists(copy_path):
+                os.remove(copy_path)
+        copied += 1
+        if copied % 1000 == 0:
+            print(f"Copied {copied} files")
+    print(f"Copied {copied} files, {skipped} already stored")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+Move existing uploads to content-addressed storage and remove duplicates:
+
+    python -m app.commands.dedupe_uploads
+
+Every file referenced by an asset photo or disposal (archived ones included)
+is hashed and re-pointed at its <sha256><ext> blob; identical files collapse
+into one. Each file is migrated in its own transaction and the original is
+only removed after that commit, so the command can be interrupted and re-run.
+
+Works on the local UPLOAD_DIR: run it before switching STORAGE_BACKEND to s3.
+"""
+
+import os
+import shutil
+import tempfile
+from collections import defaultdict
+from typing import Dict, List
+
+from sqlalchemy import update
+from sqlalchemy.orm.attributes import flag_modified
+from sqlmodel import Session, select
+
+from app.core.config import settings
+from app.core.db import engine
+from app.core.uploads import upload_path
+from app.models.archive import ArchivedAsset
+from app.models.asset_photo import AssetPhoto
+from app.models.operations import Disposal
+from app.models.stored_blob import StoredBlob
+from app.services.blob_service import BlobService
+from app.services.read_model_service import AssetReadModelService
+
+
+def _referenced_files(session: Session) -> List[str]:
+    filenames = set(session.exec(select(AssetPhoto.filename).distinct()).all())
+    filenames.update(session.exec(select(Disposal.document_path).distinct()).all())
+    for photos, disposals in session.exec(select(ArchivedAsset.photos, ArchivedAsset.disposals)).all():
+        filenames.update(p["filename"] for p in photos)
+        filenames.update(d["document_path"] for d in disposals)
+    return sorted(filenames)
+
+
+def _archive_index(session: Session) -> Dict[str, List[str]]:
+    """filename -> archived asset ids referencing it"""
+    index = defaultdict(list)
+    for asset_id, photos, disposals in session.exec(
+        select(ArchivedAsset.scom_asset_id, ArchivedAsset.photos, ArchivedAsset.disposals)
+    ).all():
+        for name in {p["filename"] for p in photos} | {d["document_path"] for d in disposals}:
+            index[name].append(asset_id)
+    return index
+
+
+def _move_thumbnail(old_thumb: str, new_filename: str) -> str:
+    new_thumb = f"{os.path.splitext(new_filename)[0]}_thumb{os.path.splitext(old_thumb)[1]}"
+    old_path = upload_path(old_thumb)
+    new_path = upload_path(new_thumb)
+    if os.path.exists(old_path) and not os.path.exists(new_path):
+        shutil.copyfile(old_path, new_path)
+    return new_thumb
+
+
+def _migrate_file(old: str, archived_ids: List[str]) -> str:
+    path = upload_path(old)
+    digest, size = BlobService.hash_file(path)
+    obsolete = [path]
+
+    # add_file moves its input into place: give it a copy so the original
+    # survives until the commit
+    fd, copy_path = tempfile.mkstemp(dir=settings.UPLOAD_DIR, prefix=".dedupe_")
+    os.close(fd)
+    shutil.copyfile(path, copy_path)
+    try:
+        with Session(engine) as session:
+            new = BlobService.add_file(session, copy_path, digest, size, os.path.splitext(old)[1], references=0)
+            if new != old:
+                thumbs = {}
+                for old_thumb in session.exec(
+                    select(AssetPhoto.thumb_filename)
+                    .where(AssetPhoto.filename == old, AssetPhoto.thumb_filename.is_not(None))
+                    .distinct()
+                ).all():
+                    thumbs[old_thumb] = _move_thumbnail(old_thumb, new)
+                    session.execute(
+                        update(AssetPhoto).where(AssetPhoto.thumb_filename == old_thumb)
+                        .values(thumb_filename=thumbs[old_thumb])
+                    )
+                    obsolete.append(upload_path(old_thumb))
+                asset_ids = session.execute(
+                    update(AssetPhoto).where(AssetPhoto.filename == old).values(filename=new)
+                    .returning(AssetPhoto.asset_id)
+                ).scalars().all()
+                # Set-based UPDATE: refresh the profile photo names in the read model
+                AssetReadModelService.refresh_assets(session.connection(), asset_ids)
+                session.execute(update(Disposal).where(Disposal.document_path == old).values(document_path=new))
+
+                for archived in session.exec(select(ArchivedAsset).where(ArchivedAsset.scom_asset_id.in_(archived_ids))):
+                    for photo in archived.photos:
+                        if photo["filename"] == old:
+                            photo["filename"] = new
+                            old_thumb = photo.get("thumb_filename")
+                            if old_thumb:
+                                if old_thumb not in thumbs:
+                                    thumbs[old_thumb] = _move_thumbnail(old_thumb, new)
+                                    obsolete.append(upload_path(old_thumb))
+                                photo["thumb_filename"] = thumbs[old_thumb]
+                    for disposal in archived.disposals:
+                        if disposal["document_path"] == old:
+                            disposal["document_path"] = new
+                    flag_modified(archived, "photos")
+                    flag_modified(archived, "disposals")
+                    session.add(archived)
+            session.commit()
+    finally:
+        if os.path.exists(copy_path):
+            os.remove(copy_path)
+
+    if new != old:
+        for obsolete_path in obsolete:
+            if os.path.exists(obsolete_path):
+                os.remove(obsolete_path)
+    return new
+
+
+def main() -> None:
+    with Session(engine) as session:
+        filenames = _referenced_files(session)
+        migrated = set(session.exec(select(StoredBlob.filename)).all())
+        archive_index = _archive_index(session)
+
+    moved = missing = 0
+    blobs = set()
+    for old in filenames:
+        if old in migrated:
+            blobs.add(old)
+            continue
+        if not os.path.exists(upload_path(old)):
+            print(f"Missing file, left as is: {old}")
+            missing += 1
+            continue
+        blobs.add(_migrate_file(old, archive_index.get(old, [])))
+        moved += 1
+
+    with Session(engine) as session:
+        unreferenced = BlobService.recount(session)
+    print(f"Migrated {moved} files into {len(blobs)} blobs, {missing} missing, {unreferenced} unreferenced blobs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Remove uploaded files nothing references any more, and leaked temporary files,
+e.g. from a nightly cron:
+
+    python -m app.commands.gc_uploads --dry-run
+
+Stored files (photos, thumbnails, disposal documents) are only removed when no
+asset photo, disposal or archived asset references them and they are older
+than the grace period, so uploads whose rows are not committed yet are safe.
+Upload spool files older than the grace period and generated PDFs older than
+--pdf-max-age-minutes are removed as well.
+"""
+
+import argparse
+from datetime import timedelta
+
+from sqlmodel import Session
+
+from app.core.db import engine
+from app.services.gc_service import (
+    TEMP_PDF_MAX_AGE_MINUTES,
+    UPLOAD_GC_BATCH_SIZE,
+    UPLOAD_GC_GRACE_HOURS,
+    UploadGCService,
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--dry-run", action="store_true", help="only list what would be removed")
+    parser.add_argument("--grace-hours", type=float, default=UPLOAD_GC_GRACE_HOURS)
+    parser.add_argument("--pdf-max-age-minutes", type=float, default=TEMP_PDF_MAX_AGE_MINUTES)
+    parser.add_argument("--batch-size", type=int, default=UPLOAD_GC_BATCH_SIZE)
+    args = parser.parse_args()
+    grace = timedelta(hours=args.grace_hours)
+    verb = "Would remove" if args.dry_run else "Removed"
+
+    files = size = 0
+    with Session(engine) as session:
+        for orphans in UploadGCService.find_orphans(session, grace, args.batch_size):
+            if args.dry_run:
+                for stored in orphans:
+                    print(f"Unreferenced: {stored.name} ({stored.size} bytes)")
+            else:
+                removed = set(UploadGCService.remove(session, orphans))
+                orphans = [stored for stored in orphans if stored.name in removed]
+            files += len(orphans)
+            size += sum(stored.size for stored in orphans)
+    print(f"{verb} {files} unreferenced files ({size / (1024 * 1024):.1f} MB)")
+
+    scratch = UploadGCService.stale_scratch_files(grace)
+    pdfs = UploadGCService.stale_temp_pdfs(timedelta(minutes=args.pdf_max_age_minutes))
+    if args.dry_run:
+        for path in scratch + pdfs:
+            print(f"Stale temporary file: {path}")
+    else:
+        UploadGCService.remove_local(scratch + pdfs)
+    print(f"{verb} {len(scratch)} upload spool files and {len(pdfs)} temporary PDFs")
+
+
+if __name__ == "__main__":
+    main()
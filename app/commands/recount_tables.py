@@ -0,0 +1,21 @@
+"""
+Recompute the cached row counts behind X-Total-Count, e.g. from a nightly cron
+to correct drift:
+
+    python -m app.commands.recount_tables
+
+Runs a COUNT(*) per counted table. Tables without a count are seeded at
+startup, so this is not needed to enable the cache.
+"""
+
+from app.core.db import engine
+from app.services.count_service import COUNTED_MODELS, CountService
+
+
+def main() -> None:
+    CountService.recount(engine)
+    print(f"Recounted {len(COUNTED_MODELS)} tables")
+
+
+if __name__ == "__main__":
+    main()
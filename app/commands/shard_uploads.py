@@ -0,0 +1,164 @@
+"""
+Move uploads from the flat UPLOAD_DIR into the sharded layout (ab/cd/<name>):
+
+    python -m app.commands.shard_uploads [--batch-size 500]
+
+Each batch of files is hard-linked (copied across filesystems) into its shard
+directory, then every reference to it (AssetPhoto.filename/thumb_filename,
+Disposal.document_path, StoredBlob.filename and archived assets) is rewritten
+in one transaction, and the flat files are removed after that commit. Media
+stays reachable under the old or the new name throughout, and an interrupted
+run resumes with the names that are still flat.
+
+Works on the local UPLOAD_DIR: run it before switching STORAGE_BACKEND to s3.
+"""
+
+import argparse
+import os
+import shutil
+from collections import defaultdict
+from typing import Dict, List, Set
+
+from sqlalchemy import case, update
+from sqlalchemy.orm.attributes import flag_modified
+from sqlmodel import Session, select
+
+from app.core.db import engine
+from app.core.uploads import shard_name, upload_path
+from app.models.archive import ArchivedAsset
+from app.models.asset_photo import AssetPhoto
+from app.models.operations import Disposal
+from app.models.stored_blob import StoredBlob
+from app.services.read_model_service import AssetReadModelService
+
+DEFAULT_BATCH_SIZE = 500
+
+# Precompressed siblings served by /media move with their file
+_SIBLING_SUFFIXES = ("", ".br", ".gz")
+
+
+def _archived_names(photos: List[dict], disposals: List[dict]) -> Set[str]:
+    names = {p["filename"] for p in photos}
+    names.update(p["thumb_filename"] for p in photos if p.get("thumb_filename"))
+    names.update(d["document_path"] for d in disposals)
+    return names
+
+
+def _flat_names(session: Session) -> List[str]:
+    """Referenced names still in the flat layout"""
+    names: Set[str] = set()
+    for column in (AssetPhoto.filename, AssetPhoto.thumb_filename, Disposal.document_path, StoredBlob.filename):
+        names.update(session.exec(select(column).where(column.not_like("%/%")).distinct()).all())
+    for photos, disposals in session.exec(select(ArchivedAsset.photos, ArchivedAsset.disposals)).all():
+        names.update(_archived_names(photos, disposals))
+    return sorted(name for name in names if name and "/" not in name)
+
+
+def _archive_index(session: Session) -> Dict[str, List[str]]:
+    """flat name -> archived asset ids referencing it"""
+    index = defaultdict(list)
+    for asset_id, photos, disposals in session.exec(
+        select(ArchivedAsset.scom_asset_id, ArchivedAsset.photos, ArchivedAsset.disposals)
+    ).all():
+        for name in _archived_names(photos, disposals):
+            if "/" not in name:
+                index[name].append(asset_id)
+    return index
+
+
+def _link(old: str, new: str) -> bool:
+    """Make the file reachable under its sharded name as well; False if it is missing"""
+    source, target = upload_path(old), upload_path(new)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    for suffix in _SIBLING_SUFFIXES:
+        if os.path.exists(source + suffix) and not os.path.exists(target + suffix):
+            try:
+                os.link(source + suffix, target + suffix)
+            except OSError:
+                shutil.copyfile(source + suffix, target + suffix)
+            # Fresh mtime: the new name is unreferenced until the batch commits,
+            # and gc_uploads leaves files younger than its grace period alone
+            os.utime(target + suffix)
+    return os.path.exists(target)
+
+
+def _rewrite_references(session: Session, renamed: Dict[str, str], archived_ids: Set[str]) -> None:
+    def sharded(column):
+        return case(renamed, value=column, else_=column)
+
+    olds = list(renamed)
+    # Lock the blobs first. An upload registering one of them holds the same
+    # lock (BlobService.add_file), so its reference to the flat name is
+    # committed before the rewrite below runs, and later uploads get the
+    # sharded name: no reference to a flat file outlives the batch
+    session.exec(select(StoredBlob).where(StoredBlob.filename.in_(olds)).with_for_update()).all()
+    asset_ids = set(session.execute(
+        update(AssetPhoto).where(AssetPhoto.filename.in_(olds))
+        .values(filename=sharded(AssetPhoto.filename)).returning(AssetPhoto.asset_id)
+    ).scalars().all())
+    asset_ids.update(session.execute(
+        update(AssetPhoto).where(AssetPhoto.thumb_filename.in_(olds))
+        .values(thumb_filename=sharded(AssetPhoto.thumb_filename)).returning(AssetPhoto.asset_id)
+    ).scalars().all())
+    # Set-based UPDATE: refresh the profile photo names in the read model
+    AssetReadModelService.refresh_assets(session.connection(), asset_ids)
+    session.execute(
+        update(Disposal).where(Disposal.document_path.in_(olds))
+        .values(document_path=sharded(Disposal.document_path))
+    )
+    session.execute(
+        update(StoredBlob).where(StoredBlob.filename.in_(olds))
+        .values(filename=sharded(StoredBlob.filename))
+    )
+
+    if archived_ids:
+        for archived in session.exec(select(ArchivedAsset).where(ArchivedAsset.scom_asset_id.in_(archived_ids))):
+            for photo in archived.photos:
+                photo["filename"] = renamed.get(photo["filename"], photo["filename"])
+                if photo.get("thumb_filename"):
+                    photo["thumb_filename"] = renamed.get(photo["thumb_filename"], photo["thumb_filename"])
+            for disposal in archived.disposals:
+                disposal["document_path"] = renamed.get(disposal["document_path"], disposal["document_path"])
+            flag_modified(archived, "photos")
+            flag_modified(archived, "disposals")
+            session.add(archived)
+
+
+def _migrate_batch(batch: List[str], archive_index: Dict[str, List[str]]) -> int:
+    """Move one batch; returns the number of missing files (their references are rewritten anyway)"""
+    renamed = {old: shard_name(old) for old in batch}
+    missing = sum(not _link(old, new) for old, new in renamed.items())
+    archived_ids = {asset_id for old in batch for asset_id in archive_index.get(old, ())}
+
+    with Session(engine) as session:
+        _rewrite_references(session, renamed, archived_ids)
+        session.commit()
+
+    for old in batch:
+        for suffix in _SIBLING_SUFFIXES:
+            path = upload_path(old) + suffix
+            if os.path.exists(path):
+                os.remove(path)
+    return missing
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    with Session(engine) as session:
+        names = _flat_names(session)
+        archive_index = _archive_index(session)
+
+    moved = missing = 0
+    for start in range(0, len(names), args.batch_size):
+        batch = names[start:start + args.batch_size]
+        missing += _migrate_batch(batch, archive_index)
+        moved += len(batch)
+        print(f"Moved {moved}/{len(names)} files")
+    print(f"Done: {moved} names sharded, {missing} files were missing")
+
+
+if __name__ == "__main__":
+    main()
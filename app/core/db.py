@@ -1,5 +1,8 @@
+from sqlalchemy import DateTime, inspect, text
 from sqlmodel import create_engine, Session, SQLModel
 from app.core.config import settings
+# Keeps AssetReadModel in step with every session's writes (after_flush listener)
+from app.services import read_model_service  # noqa: F401
 
 engine = create_engine(settings.DATABASE_URL)
 
@@ -7,5 +10,41 @@ def get_session():
     with Session(engine) as session:
         yield session
 
+def _add_missing_columns():
+    # create_all does not alter existing tables: add columns introduced on
+    # existing models as nullable columns so older databases keep working.
+    # Required timestamps (updated_at) are backfilled so existing rows still
+    # validate and get an ETag; also when an earlier start added them empty.
+    with engine.begin() as conn:
+        inspector = inspect(conn)
+        for table in SQLModel.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {column["name"]: column for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing:
+                    column_type = column.type.compile(dialect=conn.dialect)
+                    conn.execute(text(f'ALTER TABLE "{table.name}" ADD COLUMN "{column.name}" {column_type}'))
+                added_nullable = column.name not in existing or existing[column.name]["nullable"]
+                if added_nullable and not column.nullable and not column.primary_key \
+                        and isinstance(column.type, DateTime):
+                    conn.execute(text(
+                        f'UPDATE "{table.name}" SET "{column.name}" = CURRENT_TIMESTAMP '
+                        f'WHERE "{column.name}" IS NULL'
+                    ))
+
 def create_db_and_tables():
     SQLModel.metadata.create_all(engine)
+    _add_missing_columns()
+    # create_all skips tables that already exist, so make sure indexes added
+    # to existing models are created as well
+    for table in SQLModel.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(engine, checkfirst=True)
+
+    from app.services.search_service import AssetSearchService
+    from app.services.read_model_service import AssetReadModelService
+    from app.services.count_service import CountService
+    AssetSearchService.ensure_search_index(engine)
+    AssetReadModelService.backfill(engine)
+    CountService.seed(engine)
@@ -0,0 +1,71 @@
+"""
+Conditional GET helpers (ETag / If-None-Match).
+
+Endpoints compute a cheap version fingerprint of what they are about to
+return (keys and updated_at timestamps, never the serialized body). When
+the client already holds that version, a bodyless 304 is returned and the
+expensive loading and serialization is skipped entirely.
+"""
+
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import Any, Iterable, Optional
+
+from fastapi import Request, Response
+
+
+def make_etag(parts: Iterable[Any]) -> str:
+    """
+    Weak ETag over an iterable of version parts (ids, timestamps, counts).
+
+    Weak because the same data may serialize to different bytes (e.g. key
+    order), which is fine for revalidation.
+    """
+    digest = hashlib.sha1()
+    for part in parts:
+        digest.update(repr(part).encode())
+        digest.update(b"\x1f")
+    return f'W/"{digest.hexdigest()}"'
+
+
+def http_date(value: datetime) -> str:
+    """Format a naive UTC datetime as an HTTP date for Last-Modified"""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value, usegmt=True)
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison: ignore the W/ prefix on both sides
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return etag.removeprefix("W/") in candidates
+
+
+def conditional_response(
+    request: Request,
+    response: Response,
+    etag: str,
+    last_modified: Optional[datetime] = None,
+) -> Optional[Response]:
+    """
+    Set the validators on `response` and return a 304 response when the
+    request's If-None-Match already matches `etag` (None otherwise).
+
+    Usage in an endpoint:
+        not_modified = conditional_response(request, response, etag)
+        if not_modified:
+            return not_modified
+    """
+    headers = {"ETag": etag}
+    if last_modified:
+        headers["Last-Modified"] = http_date(last_modified)
+    response.headers.update(headers)
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    return None
+
@@ -0,0 +1,97 @@
+"""
+Keyset (cursor) pagination helpers.
+
+A cursor is an opaque, URL-safe token holding the sort-key values of the
+last row of the previous page. Seeking past those values uses the index on
+the sort key, so every page costs the same however deep the client pages,
+and concurrent inserts/deletes cannot make rows skip or repeat.
+"""
+
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from typing import Any, List, Optional, Sequence
+
+from fastapi import HTTPException, Response
+from sqlalchemy import tuple_
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+TOTAL_COUNT_HEADER = "X-Total-Count"
+# "true" when X-Total-Count is a planner estimate rather than an exact count
+TOTAL_COUNT_ESTIMATED_HEADER = "X-Total-Count-Estimated"
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _decode_value(value: Any, value_type: type) -> Any:
+    if value is None:
+        return None
+    if value_type is datetime:
+        return datetime.fromisoformat(value)
+    if value_type is date:
+        return date.fromisoformat(value)
+    return value_type(value)
+
+
+def encode_cursor(*values: Any) -> str:
+    """
+    Encode the sort-key values of a row into an opaque cursor.
+
+    Example:
+        >>> encode_cursor("LE-001")
+        'WyJMRS0wMDEiXQ'
+    """
+    raw = json.dumps([_encode_value(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, value_types: Sequence[type]) -> List[Any]:
+    """
+    Decode a cursor produced by encode_cursor back into typed key values.
+
+    Raises:
+        HTTPException(400) if the cursor is malformed or does not match the key shape
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(value_types):
+            raise ValueError("cursor shape mismatch")
+        return [_decode_value(v, t) for v, t in zip(values, value_types)]
+    except (ValueError, TypeError, binascii.Error):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+
+
+def keyset_after(columns: Sequence[Any], values: Sequence[Any], descending: bool = False):
+    """WHERE clause selecting rows strictly after `values` in (columns) order"""
+    if len(columns) == 1:
+        left, right = columns[0], values[0]
+    else:
+        left, right = tuple_(*columns), tuple_(*values)
+    return left < right if descending else left > right
+
+
+def set_next_cursor(response: Response, page_size: int, limit: int, *last_values: Any) -> Optional[str]:
+    """
+    Expose the cursor for the following page in the X-Next-Cursor header.
+
+    The header is only set when the page is full; a short page means the
+    client has reached the end of the collection.
+    """
+    if limit <= 0 or page_size < limit:
+        return None
+    next_cursor = encode_cursor(*last_values)
+    response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return next_cursor
+
+
+def set_total_count(response: Response, total: int, estimated: bool = False) -> None:
+    """Expose the size of the whole (filtered) collection in the X-Total-Count header"""
+    response.headers[TOTAL_COUNT_HEADER] = str(total)
+    if estimated:
+        response.headers[TOTAL_COUNT_ESTIMATED_HEADER] = "true"
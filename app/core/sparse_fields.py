@@ -0,0 +1,73 @@
+"""
+Sparse fieldsets for list endpoints (`?fields=SCOMAssetID,assetName`).
+
+Only the requested columns are selected and rows are returned as plain
+dicts, skipping response-model validation and any enrichment.
+"""
+
+from typing import Any, Iterable, List, Sequence, Tuple
+
+from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import select
+
+
+def resolve_fields(model: Any, fields: str) -> List[Tuple[str, str]]:
+    """
+    Map a comma separated `fields` parameter to (output key, attribute name) pairs.
+
+    Fields may be given by API alias (e.g. "assetName") or attribute name
+    ("asset_name"); the output key is always the alias, as in the full response.
+    Only table columns are allowed and excluded fields (passwords) are never exposed.
+
+    Raises:
+        HTTPException(400) for unknown or non-selectable fields
+    """
+    columns = set(model.__table__.columns.keys())
+    lookup = {}
+    for name, info in model.model_fields.items():
+        if name not in columns or info.exclude:
+            continue
+        key = info.alias or name
+        lookup[name] = (key, name)
+        lookup[key] = (key, name)
+
+    resolved: List[Tuple[str, str]] = []
+    for field in (f.strip() for f in fields.split(",")):
+        if not field:
+            continue
+        if field not in lookup:
+            raise HTTPException(status_code=400, detail=f"Unknown field '{field}'")
+        if lookup[field] not in resolved:
+            resolved.append(lookup[field])
+    if not resolved:
+        raise HTTPException(status_code=400, detail="No fields requested")
+    return resolved
+
+
+def fields_statement(model: Any, resolved: Sequence[Tuple[str, str]], required: Iterable[str] = ()):
+    """
+    SELECT of the requested columns plus `required` attributes (e.g. the
+    keyset pagination keys) that were not requested.
+
+    Built with SQLAlchemy's select so results are always rows, even for a
+    single column (sqlmodel's select would turn those into bare scalars).
+    """
+    attributes = [attr for _, attr in resolved]
+    attributes += [attr for attr in required if attr not in attributes]
+    return select(*[getattr(model, attr) for attr in attributes])
+
+
+def sparse_response(rows: Iterable[Any], resolved: Sequence[Tuple[str, str]], response: Any = None) -> JSONResponse:
+    """
+    Serialize selected rows straight to JSON with only the requested keys.
+    Headers already set on the endpoint's `response` (cursor, ETag) are carried over.
+    """
+    content = jsonable_encoder([{key: getattr(row, attr) for key, attr in resolved} for row in rows])
+    json_response = JSONResponse(content=content)
+    if response is not None:
+        for name, value in response.headers.items():
+            if name.lower() not in ("content-length", "content-type"):
+                json_response.headers[name] = value
+    return json_response
@@ -0,0 +1,213 @@
+"""
+Storage backends for uploaded files.
+
+Files are addressed by their stored name (ab/cd/<name>, see app.core.uploads).
+STORAGE_BACKEND selects where they live:
+
+- "local" (default): below UPLOAD_DIR, served by /media or the front proxy.
+- "s3": an S3-compatible bucket (AWS S3, MinIO, moto) shared by every API
+  node; /media redirects to presigned URLs so downloads bypass the API.
+
+Uploads are always spooled to UPLOAD_DIR first (validated and hashed on the
+way) and then handed to the backend with put_file.
+"""
+
+import mimetypes
+import os
+import tempfile
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import BinaryIO, Iterator, Optional
+
+from app.core.config import settings
+from app.core.uploads import upload_path
+
+try:
+    import boto3
+    from boto3.exceptions import Boto3Error
+    from botocore.exceptions import BotoCoreError, ClientError
+except ImportError:  # boto3 is only needed with STORAGE_BACKEND="s3"
+    boto3 = None
+
+STORAGE_BACKEND: str = getattr(settings, "STORAGE_BACKEND", "local")
+S3_BUCKET: Optional[str] = getattr(settings, "S3_BUCKET", None)
+# MinIO / moto server endpoint; None for AWS
+S3_ENDPOINT_URL: Optional[str] = getattr(settings, "S3_ENDPOINT_URL", None)
+S3_REGION: Optional[str] = getattr(settings, "S3_REGION", None)
+# Key prefix, for sharing a bucket between environments
+S3_PREFIX: str = getattr(settings, "S3_PREFIX", "")
+PRESIGNED_URL_EXPIRES: int = getattr(settings, "PRESIGNED_URL_EXPIRES", 3600)
+
+# Downloads larger than this are spooled to disk instead of memory
+_SPOOL_MAX_SIZE = 8 * 1024 * 1024
+
+
+@dataclass
+class StoredFile:
+    name: str
+    size: int
+    modified: datetime  # UTC
+
+
+class Storage(ABC):
+    """Where uploaded files live, addressed by stored name"""
+
+    # Backend failures surface as OSError (FileNotFoundError for missing files),
+    # whatever the backend
+
+    @abstractmethod
+    def put_file(self, path: str, name: str) -> None:
+        """Store the local file at `path` under `name`; the local file is consumed"""
+
+    @abstractmethod
+    def exists(self, name: str) -> bool:
+        ...
+
+    @abstractmethod
+    def open(self, name: str) -> BinaryIO:
+        """Seekable binary file object (raises FileNotFoundError)"""
+
+    @abstractmethod
+    def delete(self, name: str) -> None:
+        """Remove a file; missing files are ignored"""
+
+    @abstractmethod
+    def iter_files(self, prefix: str = "") -> Iterator[StoredFile]:
+        """Every stored file whose name starts with `prefix`"""
+
+    def presigned_url(self, name: str, expires: int = PRESIGNED_URL_EXPIRES) -> Optional[str]:
+        """Time-limited download URL that bypasses the API, if the backend offers one"""
+        return None
+
+
+class LocalStorage(Storage):
+    """Files below UPLOAD_DIR on the local disk"""
+
+    def put_file(self, path: str, name: str) -> None:
+        target = upload_path(name)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        os.replace(path, target)
+
+    def exists(self, name: str) -> bool:
+        return os.path.exists(upload_path(name))
+
+    def open(self, name: str) -> BinaryIO:
+        return open(upload_path(name), "rb")
+
+    def delete(self, name: str) -> None:
+        try:
+            os.remove(upload_path(name))
+        except FileNotFoundError:
+            pass
+
+    def iter_files(self, prefix: str = "") -> Iterator[StoredFile]:
+        for directory, subdirectories, filenames in os.walk(settings.UPLOAD_DIR):
+            # Hidden entries are temporary files (uploads in progress, partial thumbnails)
+            subdirectories[:] = [d for d in subdirectories if not d.startswith(".")]
+            relative = os.path.relpath(directory, settings.UPLOAD_DIR)
+            for filename in filenames:
+                if filename.startswith("."):
+                    continue
+                name = filename if relative == "." else f"{relative.replace(os.sep, '/')}/{filename}"
+                if not name.startswith(prefix):
+                    continue
+                try:
+                    stat = os.stat(os.path.join(directory, filename))
+                except FileNotFoundError:
+                    continue
+                yield StoredFile(name, stat.st_size, datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc))
+
+
+_S3_NOT_FOUND = ("404", "NoSuchKey", "NotFound")
+
+
+@contextmanager
+def _s3_errors(name: str = ""):
+    """Raise boto3/botocore errors as OSError, like the local backend"""
+    try:
+        yield
+    except ClientError as e:
+        if e.response["Error"]["Code"] in _S3_NOT_FOUND:
+            raise FileNotFoundError(name) from e
+        raise OSError(f"S3 error for {name or 'bucket'}: {e}") from e
+    except (BotoCoreError, Boto3Error) as e:  # Boto3Error: e.g. S3UploadFailedError from upload_file
+        raise OSError(f"S3 error for {name or 'bucket'}: {e}") from e
+
+
+class S3Storage(Storage):
+    """Objects in an S3-compatible bucket (AWS S3, MinIO, moto)"""
+
+    def __init__(
+        self,
+        bucket: str,
+        endpoint_url: Optional[str] = None,
+        region: Optional[str] = None,
+        prefix: str = "",
+    ):
+        if boto3 is None:
+            raise RuntimeError("STORAGE_BACKEND=s3 requires boto3")
+        if not bucket:
+            raise RuntimeError("STORAGE_BACKEND=s3 requires S3_BUCKET")
+        self.bucket = bucket
+        self.prefix = prefix
+        self.client = boto3.client("s3", endpoint_url=endpoint_url, region_name=region)
+
+    def _key(self, name: str) -> str:
+        return self.prefix + name
+
+    def put_file(self, path: str, name: str) -> None:
+        content_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+        with _s3_errors(name):
+            self.client.upload_file(path, self.bucket, self._key(name), ExtraArgs={"ContentType": content_type})
+        os.remove(path)
+
+    def exists(self, name: str) -> bool:
+        try:
+            with _s3_errors(name):
+                self.client.head_object(Bucket=self.bucket, Key=self._key(name))
+        except FileNotFoundError:
+            return False
+        return True
+
+    def open(self, name: str) -> BinaryIO:
+        f = tempfile.SpooledTemporaryFile(max_size=_SPOOL_MAX_SIZE)
+        try:
+            with _s3_errors(name):
+                self.client.download_fileobj(self.bucket, self._key(name), f)
+        except OSError:
+            f.close()
+            raise
+        f.seek(0)
+        return f
+
+    def delete(self, name: str) -> None:
+        with _s3_errors(name):
+            self.client.delete_object(Bucket=self.bucket, Key=self._key(name))
+
+    def iter_files(self, prefix: str = "") -> Iterator[StoredFile]:
+        paginator = self.client.get_paginator("list_objects_v2")
+        with _s3_errors():
+            for page in paginator.paginate(Bucket=self.bucket, Prefix=self._key(prefix)):
+                for item in page.get("Contents", []):
+                    yield StoredFile(item["Key"][len(self.prefix):], item["Size"], item["LastModified"])
+
+    def presigned_url(self, name: str, expires: int = PRESIGNED_URL_EXPIRES) -> Optional[str]:
+        with _s3_errors(name):
+            return self.client.generate_presigned_url(
+                "get_object",
+                Params={"Bucket": self.bucket, "Key": self._key(name)},
+                ExpiresIn=expires,
+            )
+
+
+@lru_cache(maxsize=1)
+def get_storage() -> Storage:
+    """The configured backend (one instance per process)"""
+    if STORAGE_BACKEND == "s3":
+        return S3Storage(S3_BUCKET, S3_ENDPOINT_URL, S3_REGION, S3_PREFIX)
+    if STORAGE_BACKEND != "local":
+        raise RuntimeError(f"Unknown STORAGE_BACKEND: {STORAGE_BACKEND}")
+    return LocalStorage()
@@ -0,0 +1,230 @@
+"""
+Upload validation and incremental writing.
+
+Uploads are written chunk by chunk to a temporary file in UPLOAD_DIR (the
+same filesystem as their final location, so they are moved into place with
+a rename), hashed on the way and rejected as soon as they exceed their size
+limit or their first bytes do not match an allowed file type.
+
+Stored uploads are spread over two levels of directories named after the
+first hex digits of their hash (UPLOAD_DIR/ab/cd/<name>); the stored name
+(AssetPhoto.filename, Disposal.document_path, ...) is that relative path.
+Files stored before sharding keep a flat name until migrated with
+`python -m app.commands.shard_uploads`.
+"""
+
+import hashlib
+import os
+import re
+import tempfile
+from dataclasses import dataclass
+from typing import BinaryIO, FrozenSet, Optional
+
+from fastapi import HTTPException
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+MB = 1024 * 1024
+
+# Bytes read/written per iteration
+UPLOAD_CHUNK_SIZE = MB
+
+# Whole request bodies (multipart forms with several files, CSV imports)
+MAX_REQUEST_BYTES = getattr(settings, "MAX_REQUEST_BYTES", 64 * MB)
+
+# File type -> (extension, magic-byte check)
+_SIGNATURES = {
+    "image/jpeg": (".jpg", lambda h: h.startswith(b"\xff\xd8\xff")),
+    "image/png": (".png", lambda h: h.startswith(b"\x89PNG\r\n\x1a\n")),
+    "image/gif": (".gif", lambda h: h[:6] in (b"GIF87a", b"GIF89a")),
+    "image/webp": (".webp", lambda h: h[:4] == b"RIFF" and h[8:12] == b"WEBP"),
+    "image/heic": (".heic", lambda h: h[4:8] == b"ftyp" and h[8:12] in (b"heic", b"heix", b"mif1", b"msf1")),
+    "application/pdf": (".pdf", lambda h: h.startswith(b"%PDF-")),
+}
+
+# Bytes needed to recognize every signature above
+_SNIFF_BYTES = 16
+
+_HEX_PREFIX = re.compile(r"^[0-9a-f]{4}")
+
+
+@dataclass(frozen=True)
+class UploadPolicy:
+    max_bytes: int
+    allowed_types: FrozenSet[str]
+
+
+PHOTO_UPLOAD = UploadPolicy(
+    max_bytes=getattr(settings, "MAX_PHOTO_BYTES", 15 * MB),
+    allowed_types=frozenset({"image/jpeg", "image/png", "image/gif", "image/webp", "image/heic"}),
+)
+DOCUMENT_UPLOAD = UploadPolicy(
+    max_bytes=getattr(settings, "MAX_DOCUMENT_BYTES", 25 * MB),
+    allowed_types=frozenset({"application/pdf", "image/jpeg", "image/png"}),
+)
+
+
+def shard_name(filename: str) -> str:
+    """
+    Sharded stored name of an upload: ab/cd/<name>. Content-addressed names
+    are sharded by their own leading hex digits, other names by their hash.
+    """
+    name = os.path.basename(filename)
+    key = name if _HEX_PREFIX.match(name) else hashlib.sha256(name.encode()).hexdigest()
+    return f"{key[:2]}/{key[2:4]}/{name}"
+
+
+def upload_path(filename: str) -> str:
+    """Location on disk of a stored upload name (sharded or legacy flat)"""
+    return os.path.join(settings.UPLOAD_DIR, *filename.split("/"))
+
+
+def sniff_content_type(head: bytes) -> Optional[str]:
+    """File type from the first bytes of a file (None if not recognized)"""
+    for content_type, (_, matches) in _SIGNATURES.items():
+        if matches(head):
+            return content_type
+    return None
+
+
+def too_large(policy: UploadPolicy) -> HTTPException:
+    return HTTPException(status_code=413, detail=f"File too large (max {policy.max_bytes // MB} MB)")
+
+
+class UploadWriter:
+    """
+    Incremental upload writer enforcing an UploadPolicy.
+
+    Usage:
+        writer = UploadWriter(PHOTO_UPLOAD)
+        try:
+            for chunk in chunks:
+                writer.write(chunk)
+            writer.finish()
+            ...  # move writer.path into place
+        finally:
+            writer.discard()
+
+    Raises:
+        HTTPException(413) once the size limit is exceeded,
+        HTTPException(415) if the content is not an allowed file type
+    """
+
+    def __init__(self, policy: UploadPolicy):
+        self.policy = policy
+        self.size = 0
+        self.content_type: Optional[str] = None
+        self._digest = hashlib.sha256()
+        self._head = b""
+        os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
+        fd, self.path = tempfile.mkstemp(dir=settings.UPLOAD_DIR, prefix=".upload_")
+        self._file = os.fdopen(fd, "wb")
+
+    @property
+    def digest(self) -> str:
+        return self._digest.hexdigest()
+
+    @property
+    def extension(self) -> str:
+        return _SIGNATURES[self.content_type][0]
+
+    def _check_type(self) -> None:
+        self.content_type = sniff_content_type(self._head)
+        if self.content_type not in self.policy.allowed_types:
+            raise HTTPException(status_code=415, detail="Unsupported file type")
+
+    def write(self, chunk: bytes) -> None:
+        self.size += len(chunk)
+        if self.size > self.policy.max_bytes:
+            raise too_large(self.policy)
+        if self.content_type is None and len(self._head) < _SNIFF_BYTES:
+            self._head += chunk[:_SNIFF_BYTES - len(self._head)]
+            if len(self._head) >= _SNIFF_BYTES:
+                self._check_type()
+        self._digest.update(chunk)
+        self._file.write(chunk)
+
+    def copy_from(self, fileobj: BinaryIO) -> None:
+        while chunk := fileobj.read(UPLOAD_CHUNK_SIZE):
+            self.write(chunk)
+
+    def finish(self) -> None:
+        """Flush the file; validates the type of files shorter than the sniffed prefix"""
+        if self.content_type is None:
+            self._check_type()
+        self._file.close()
+
+    def discard(self) -> None:
+        """Close and remove the temporary file if it was not moved into place"""
+        if not self._file.closed:
+            self._file.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class RequestBodyTooLarge(HTTPException):
+    def __init__(self) -> None:
+        super().__init__(status_code=413, detail="Request body too large")
+
+
+class RequestSizeLimitMiddleware:
+    """
+    Rejects request bodies larger than `max_bytes` with 413 before they are
+    parsed or spooled: up front from Content-Length, and while streaming for
+    chunked bodies without one.
+
+    Streamed bodies are cut off by raising RequestBodyTooLarge from receive():
+    being an HTTPException, it is answered with 413 by the app's exception
+    handling, even where FastAPI turns body parsing errors into 400.
+    """
+
+    def __init__(self, app: ASGIApp, max_bytes: int = MAX_REQUEST_BYTES):
+        self.app = app
+        self.max_bytes = max_bytes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        content_length = headers.get(b"content-length")
+        if content_length and content_length.isdigit() and int(content_length) > self.max_bytes:
+            await self._reject(send)
+            return
+
+        received = 0
+        response_started = False
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    raise RequestBodyTooLarge()
+            return message
+
+        async def tracking_send(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, tracking_send)
+        except RequestBodyTooLarge:
+            # Read outside the app's exception handling (e.g. by another middleware)
+            if not response_started:
+                await self._reject(send)
+
+    @staticmethod
+    async def _reject(send: Send) -> None:
+        body = b'{"detail":"Request body too large"}'
+        await send({
+            "type": "http.response.start",
+            "status": 413,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+        })
+        await send({"type": "http.response.body", "body": body})
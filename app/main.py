@@ -2,14 +2,22 @@ from fastapi import FastAPI
 from starlette.middleware.cors import CORSMiddleware
 
 from app.api.v1.api import api_router
+from app.api.media import router as media_router
 from app.core.config import settings
 from app.core.db import create_db_and_tables
+from app.core.uploads import RequestSizeLimitMiddleware
+from app.core.pagination import NEXT_CURSOR_HEADER, TOTAL_COUNT_ESTIMATED_HEADER, TOTAL_COUNT_HEADER
+from app.core.storage import LocalStorage, get_storage
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
 )
 
+# Reject oversized bodies before multipart parsing spools them
+# (added first so CORS headers are still set on its 413 responses)
+app.add_middleware(RequestSizeLimitMiddleware)
+
 # Set all CORS enabled origins
 if settings.BACKEND_CORS_ORIGINS:
     app.add_middleware(
@@ -18,15 +26,27 @@ if settings.BACKEND_CORS_ORIGINS:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=[
+            NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER, TOTAL_COUNT_ESTIMATED_HEADER, "ETag", "Last-Modified"
+        ],
     )
 
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
+from fastapi.responses import RedirectResponse
 from fastapi.staticfiles import StaticFiles
 import os
+# Uploads are spooled here before being stored (and stored here by the local backend)
 if not os.path.exists(settings.UPLOAD_DIR):
     os.makedirs(settings.UPLOAD_DIR)
-app.mount("/static", StaticFiles(directory=settings.UPLOAD_DIR), name="static")
+# Legacy URLs; new ones point at /media (immutable caching, ETags, ranges)
+if isinstance(get_storage(), LocalStorage):
+    app.mount("/static", StaticFiles(directory=settings.UPLOAD_DIR), name="static")
+else:
+    @app.get("/static/{filename:path}", include_in_schema=False)
+    def read_static(filename: str):
+        return RedirectResponse(f"/media/{filename}", status_code=301)
+app.include_router(media_router, prefix="/media", tags=["media"])
 
 @app.on_event("startup")
 def on_startup():
@@ -0,0 +1,26 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from sqlalchemy import JSON, Column
+from sqlmodel import Field
+from app.models.base import CamelModel
+
+
+class ArchivedAsset(CamelModel, table=True):
+    """
+    A disposed asset moved out of the live tables after the retention period.
+
+    The asset row and its photos, verifications, maintenance, transfers and
+    disposals are kept as JSON documents (attribute name -> value), exactly as
+    they were when archived. No foreign keys: referenced rows may be gone later.
+    """
+    scom_asset_id: str = Field(primary_key=True, alias="SCOMAssetID")
+    asset_name: str = Field(alias="assetName")
+    physical_asset_tag_number: Optional[str] = Field(default=None, index=True, alias="physicalAssetTagNumber")
+    disposed_at: Optional[datetime] = Field(default=None, alias="disposedAt")
+    archived_at: datetime = Field(default_factory=datetime.utcnow, index=True, alias="archivedAt")
+    asset: Dict[str, Any] = Field(default_factory=dict, sa_column=Column(JSON, nullable=False))
+    photos: List[Dict[str, Any]] = Field(default_factory=list, sa_column=Column(JSON, nullable=False))
+    verifications: List[Dict[str, Any]] = Field(default_factory=list, sa_column=Column(JSON, nullable=False))
+    maintenance: List[Dict[str, Any]] = Field(default_factory=list, sa_column=Column(JSON, nullable=False))
+    transfers: List[Dict[str, Any]] = Field(default_factory=list, sa_column=Column(JSON, nullable=False))
+    disposals: List[Dict[str, Any]] = Field(default_factory=list, sa_column=Column(JSON, nullable=False))
@@ -1,7 +1,8 @@
 from datetime import date
 from typing import Optional
-from sqlmodel import Field, Relationship
-from app.models.base import CamelModel
+from sqlmodel import Field, Relationship, SQLModel
+from sqlalchemy import Index
+from app.models.base import CamelModel, TimestampedModel
 from app.models.enums import AssetStatus
 
 
@@ -40,8 +41,28 @@ class AssetBase(CamelModel):
     last_physical_verification: Optional[str] = Field(default=None, alias="lastPhysicalVerification")
     date_of_last_physical_verification: Optional[date] = Field(default=None, alias="dateOfLastPhysicalVerification")
 
-class Asset(AssetBase, table=True):
+class Asset(AssetBase, TimestampedModel, table=True):
+    # Indexes backing the GET /assets filters and sort orders
+    # (sort indexes end with the primary key so keyset pagination can seek on them)
+    __table_args__ = (
+        Index("ix_asset_location_status", "location_id", "asset_status"),
+        Index("ix_asset_custodian_status", "custodian_id", "asset_status"),
+        Index("ix_asset_category_sub_category", "category_id", "sub_category_id"),
+        Index("ix_asset_sub_category", "sub_category_id"),
+        Index("ix_asset_legal_entity_project", "legal_entity_id", "project_id"),
+        Index("ix_asset_project", "project_id"),
+        Index("ix_asset_status_acquisition", "asset_status", "date_of_acquisition"),
+        Index("ix_asset_acquisition_id", "date_of_acquisition", "scom_asset_id"),
+        Index("ix_asset_name_id", "asset_name", "scom_asset_id"),
+        Index("ix_asset_price_id", "acquisition_price", "scom_asset_id"),
+    )
+
     scom_asset_id: str = Field(primary_key=True, alias="SCOMAssetID")
     
     photos: list["AssetPhoto"] = Relationship(back_populates="asset")
 
+class ScomIdCounter(SQLModel, table=True):
+    # Last sequence number handed out per SCOM ID prefix (see ScomIdService)
+    prefix: str = Field(primary_key=True)
+    last_value: int = 0
+
@@ -0,0 +1,33 @@
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict, Optional
+from sqlalchemy import JSON, Column, Index
+from sqlmodel import Field, SQLModel
+
+
+class AssetChangeOperation(str, Enum):
+    CREATE = "CREATE"
+    UPDATE = "UPDATE"
+    DELETE = "DELETE"
+
+
+class AssetChange(SQLModel, table=True):
+    """
+    Append-only journal of asset mutations, one row per changed asset per flush.
+
+    `diff` maps attribute name -> [old, new] (JSON encoded values); for CREATE
+    old values are null, for DELETE new values are null, so a DELETE row holds
+    the full last state. No foreign key: entries outlive the asset they describe.
+    """
+    __table_args__ = (
+        Index("ix_assetchange_asset_changed", "asset_id", "changed_at"),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    asset_id: str
+    changed_at: datetime = Field(default_factory=datetime.utcnow, index=True)
+    operation: AssetChangeOperation
+    source: str  # e.g. update_asset, transfer, disposal, verification
+    reference: Optional[str] = None  # transfer / disposal / verification id
+    changed_by: Optional[str] = None
+    diff: Dict[str, Any] = Field(default_factory=dict, sa_column=Column(JSON, nullable=False))
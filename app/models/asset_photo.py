@@ -1,5 +1,6 @@
 from datetime import datetime
 from typing import Optional
+from sqlalchemy import Index
 from sqlmodel import Field, SQLModel, Relationship
 
 class AssetPhotoBase(SQLModel):
@@ -7,6 +8,11 @@ class AssetPhotoBase(SQLModel):
     is_profile: bool = False
     
 class AssetPhoto(AssetPhotoBase, table=True):
+    # Backs per-asset and batch photo lookups (profile photo first)
+    __table_args__ = (
+        Index("ix_assetphoto_asset_profile", "asset_id", "is_profile"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     asset_id: str = Field(foreign_key="asset.scom_asset_id")
     # Checking Asset model: scom_asset_id: str = Field(primary_key=True, alias="SCOMAssetID")
@@ -23,6 +29,8 @@ class AssetPhoto(AssetPhotoBase, table=True):
     # If no sa_column_args, the column name defaults to field name `scom_asset_id`.
     
     created_at: datetime = Field(default_factory=datetime.utcnow)
+    # Set by ThumbnailService once the thumbnail has been generated
+    thumb_filename: Optional[str] = None
     
     # Relationship
     asset: "Asset" = Relationship(back_populates="photos")
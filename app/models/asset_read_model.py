@@ -0,0 +1,26 @@
+from datetime import datetime
+from typing import Optional
+from sqlmodel import Field, SQLModel
+
+
+class AssetReadModel(SQLModel, table=True):
+    """
+    Denormalized, read-optimized companion row of an Asset (1:1 on scom_asset_id).
+
+    Holds the resolved location/site and photo summary served by AssetDetailedRead,
+    so list/detail reads do not join Location, Site and AssetPhoto. Maintained by
+    AssetReadModelService whenever assets, photos, locations or sites change.
+    No foreign key: rows are derived data and are removed right after their asset.
+    """
+    scom_asset_id: str = Field(primary_key=True)
+    location_id: Optional[str] = Field(default=None, index=True)
+    location_code: Optional[str] = None
+    location_name: Optional[str] = None
+    location_name_code: Optional[str] = None
+    site_id: Optional[str] = Field(default=None, index=True)
+    site_code: Optional[str] = None
+    site_name: Optional[str] = None
+    photo_count: int = 0
+    profile_photo_filename: Optional[str] = None
+    profile_thumb_filename: Optional[str] = None
+    refreshed_at: datetime = Field(default_factory=datetime.utcnow)
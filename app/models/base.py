@@ -1,6 +1,7 @@
+from datetime import datetime
 from pydantic import ConfigDict
 from pydantic.alias_generators import to_camel
-from sqlmodel import SQLModel
+from sqlmodel import Field, SQLModel
 
 class CamelModel(SQLModel):
     model_config = ConfigDict(
@@ -8,3 +9,11 @@ class CamelModel(SQLModel):
         populate_by_name=True,
         from_attributes=True
     )
+
+class TimestampedModel(CamelModel):
+    # Bumped on every UPDATE; used to compute ETags for conditional GETs
+    updated_at: datetime = Field(
+        default_factory=datetime.utcnow,
+        sa_column_kwargs={"onupdate": datetime.utcnow},
+        alias="updatedAt"
+    )
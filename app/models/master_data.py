@@ -1,47 +1,47 @@
 from typing import Optional
 from sqlmodel import Field, Relationship
-from app.models.base import CamelModel
+from app.models.base import TimestampedModel
 
-class Site(CamelModel, table=True):
+class Site(TimestampedModel, table=True):
     site_id: str = Field(primary_key=True, alias="siteId")
     site_code: str = Field(unique=True, alias="siteCode")
     site_name: str = Field(alias="siteName")
 
-class LegalEntity(CamelModel, table=True):
+class LegalEntity(TimestampedModel, table=True):
     legal_entity_id: str = Field(primary_key=True, alias="legalEntityId")
     legal_entity_code: str = Field(alias="legalEntityCode")
     legal_entity_name: str = Field(alias="legalEntityName")
 
-class AssetCategory(CamelModel, table=True):
+class AssetCategory(TimestampedModel, table=True):
     category_id: str = Field(primary_key=True, alias="categoryId")
     name: str
     description: Optional[str] = None
 
-class AssetSubCategory(CamelModel, table=True):
+class AssetSubCategory(TimestampedModel, table=True):
     sub_category_id: str = Field(primary_key=True, alias="subCategoryId")
     category_id: str = Field(foreign_key="assetcategory.category_id", alias="categoryId")
     name: str
     useful_life_years: int = Field(alias="usefulLifeYears")
     description: Optional[str] = None
 
-class Location(CamelModel, table=True):
+class Location(TimestampedModel, table=True):
     location_id: str = Field(primary_key=True, alias="locationId")
     location_code: str = Field(unique=True, alias="locationCode")  # Auto-generated: site_code + location_name_code
     location_name: str = Field(alias="locationName")
     location_name_code: str = Field(alias="locationNameCode")  # User-provided identifier for this location
-    site_id: str = Field(foreign_key="site.site_id", alias="siteId")
+    site_id: str = Field(foreign_key="site.site_id", index=True, alias="siteId")
 
-class Project(CamelModel, table=True):
+class Project(TimestampedModel, table=True):
     project_id: str = Field(primary_key=True, alias="projectId")
     project_code: str = Field(alias="projectCode")
     name: str
 
-class Vendor(CamelModel, table=True):
+class Vendor(TimestampedModel, table=True):
     vendor_id: str = Field(primary_key=True, alias="vendorId")
     vendor_name: str = Field(alias="vendorName")
     vendor_account: str = Field(alias="vendorAccount")
 
-class FundingSource(CamelModel, table=True):
+class FundingSource(TimestampedModel, table=True):
     funding_source_id: str = Field(primary_key=True, alias="fundingSourceId")
     name: str
     description: Optional[str] = None
@@ -25,6 +25,7 @@ class Disposal(CamelModel, table=True):
     requested_at: datetime = Field(alias="requestedAt")
     status: DisposalStatus
     document_path: str = Field(alias="documentPath")
+    decided_at: Optional[datetime] = Field(default=None, alias="decidedAt")
 
 class Maintenance(CamelModel, table=True):
     maintenance_id: str = Field(primary_key=True, alias="maintenanceId")
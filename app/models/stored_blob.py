@@ -0,0 +1,17 @@
+from datetime import datetime
+from sqlmodel import Field, SQLModel
+
+
+class StoredBlob(SQLModel, table=True):
+    """
+    An uploaded file stored once under its content hash (UPLOAD_DIR/ab/cd/<sha256><ext>).
+
+    ref_count is the number of rows pointing at `filename` (AssetPhoto.filename,
+    Disposal.document_path, including archived ones); the file is removed when
+    it drops to zero.
+    """
+    sha256: str = Field(primary_key=True, max_length=64)
+    filename: str = Field(unique=True)
+    size: int
+    ref_count: int = 0
+    created_at: datetime = Field(default_factory=datetime.utcnow)
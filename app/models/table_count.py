@@ -0,0 +1,14 @@
+from typing import Optional
+from sqlmodel import Field, SQLModel
+
+
+class TableCountDelta(SQLModel, table=True):
+    """
+    Row count of a large table, as a sum of rows: a base count written by
+    CountService.seed/recount plus one delta row per transaction that inserted or
+    deleted rows. Appending deltas takes no shared row lock, so concurrent
+    writers never queue on a counter; CountService compacts them on read.
+    """
+    id: Optional[int] = Field(default=None, primary_key=True)
+    table_name: str = Field(index=True)
+    row_count: int = 0
@@ -2,6 +2,7 @@ from datetime import datetime
 from typing import List, Optional
 from enum import Enum
 from sqlmodel import Field, SQLModel, Relationship
+from sqlalchemy import Index
 from app.models.enums import AssetStatus
 
 class SessionStatus(str, Enum):
@@ -38,6 +39,12 @@ class AssetVerificationBase(SQLModel):
     notes: Optional[str] = None
 
 class AssetVerification(AssetVerificationBase, table=True):
+    __table_args__ = (
+        # Keyset pagination order for the verification lists
+        Index("ix_assetverification_scanned_at_id", "scanned_at", "id"),
+        Index("ix_assetverification_asset_id_scanned_at", "asset_id", "scanned_at"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     session_id: Optional[int] = Field(default=None, foreign_key="verificationsession.id")
     
@@ -1,6 +1,6 @@
-from typing import Optional
+from typing import List, Optional
 from datetime import date
-from pydantic import Field
+from pydantic import AliasChoices, BaseModel, Field, model_validator
 from app.models.asset import AssetBase
 from app.models.enums import AssetStatus
 from app.models.base import CamelModel
@@ -62,3 +62,72 @@ class AssetDetailedRead(AssetBase):
     profile_photo_url: Optional[str] = None
     profile_photo_thumb_url: Optional[str] = None
     location: Optional[LocationInfo] = None
+
+class AssetScanRead(CamelModel):
+    """Slim payload for handheld tag scanners"""
+    scom_asset_id: str = Field(alias="SCOMAssetID")
+    asset_name: str = Field(alias="assetName")
+    asset_status: AssetStatus = Field(alias="assetStatus")
+    location_code: Optional[str] = Field(default=None, alias="locationCode")
+    custodian_name: Optional[str] = Field(default=None, alias="custodianName")
+
+class LocationNode(CamelModel):
+    location_id: str = Field(alias="locationId")
+    location_code: str = Field(alias="locationCode")
+    location_name: str = Field(alias="locationName")
+    asset_count: int = Field(default=0, alias="assetCount")
+    total_value: float = Field(default=0, alias="totalValue")
+
+class SiteNode(CamelModel):
+    """Site of the site -> location tree, with totals over its locations"""
+    site_id: str = Field(alias="siteId")
+    site_code: str = Field(alias="siteCode")
+    site_name: str = Field(alias="siteName")
+    asset_count: int = Field(default=0, alias="assetCount")
+    total_value: float = Field(default=0, alias="totalValue")
+    locations: List[LocationNode] = []
+
+class AssetFilter(BaseModel):
+    """Server-side filters for the asset register (query parameters on GET /assets)"""
+    asset_status: Optional[AssetStatus] = None
+    location_id: Optional[str] = None
+    site_id: Optional[str] = None
+    custodian_id: Optional[str] = None
+    category_id: Optional[str] = None
+    sub_category_id: Optional[str] = None
+    legal_entity_id: Optional[str] = None
+    project_id: Optional[str] = None
+    acquired_from: Optional[date] = None  # inclusive
+    acquired_to: Optional[date] = None  # inclusive
+
+# Bulk import
+class AssetImportError(BaseModel):
+    row: int
+    error: str
+
+class AssetImportReport(BaseModel):
+    total_rows: int
+    created: int
+    failed: int
+    errors: List[AssetImportError] = []
+
+# Bulk update
+class AssetBulkUpdate(BaseModel):
+    """Apply the same partial update to a list of assets or to every asset matching a filter"""
+    asset_ids: Optional[List[str]] = Field(
+        default=None, validation_alias=AliasChoices("assetIds", "asset_ids")
+    )
+    filter: Optional[AssetFilter] = None
+    changes: AssetUpdate
+
+    @model_validator(mode='after')
+    def check_target(self) -> 'AssetBulkUpdate':
+        if (self.asset_ids is None) == (self.filter is None):
+            raise ValueError("Provide either asset_ids or filter.")
+        if self.filter is not None and not self.filter.model_dump(exclude_none=True):
+            raise ValueError("filter must contain at least one criterion.")
+        return self
+
+class AssetBulkUpdateResult(BaseModel):
+    updated: int
+    not_found: List[str] = []  # requested asset_ids that do not exist
@@ -1,6 +1,11 @@
 from datetime import datetime
+from typing import List, Optional
+from pydantic import AliasChoices, BaseModel, Field
 from sqlmodel import SQLModel
 
+# Asset IDs accepted per batch photo request
+MAX_PHOTO_BATCH_SIZE = 500
+
 class AssetPhotoBase(SQLModel):
     filename: str
     is_profile: bool
@@ -13,3 +18,11 @@ class AssetPhotoRead(AssetPhotoBase):
     asset_id: str
     created_at: datetime
     url: str  # Computed URL
+    thumb_url: Optional[str] = None  # Thumbnail, or the full image until it is generated
+
+class AssetPhotoBatchRequest(BaseModel):
+    asset_ids: List[str] = Field(
+        min_length=1,
+        max_length=MAX_PHOTO_BATCH_SIZE,
+        validation_alias=AliasChoices("assetIds", "asset_ids"),
+    )
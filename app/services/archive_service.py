@@ -0,0 +1,152 @@
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import delete, func
+from sqlmodel import Session, select
+from app.core.config import settings
+from app.models.archive import ArchivedAsset
+from app.models.asset import Asset
+from app.models.asset_photo import AssetPhoto
+from app.models.enums import AssetStatus, DisposalStatus
+from app.models.operations import Disposal, Maintenance, Transfer
+from app.models.verification import AssetVerification
+from app.schemas.asset import AssetDetailedRead
+from app.services.count_service import CountService
+from app.services.journal_service import AssetJournalService
+from app.services.photo_service import PhotoService
+
+# Days a disposed asset stays in the live tables before it may be archived
+ARCHIVE_RETENTION_DAYS = getattr(settings, "ARCHIVE_RETENTION_DAYS", 365)
+
+# Assets moved (and committed) per batch
+ARCHIVE_BATCH_SIZE = 500
+
+# Child tables moved together with their asset: (ArchivedAsset attribute, model)
+_CHILD_TABLES = [
+    ("photos", AssetPhoto),
+    ("verifications", AssetVerification),
+    ("maintenance", Maintenance),
+    ("transfers", Transfer),
+    ("disposals", Disposal),
+]
+
+
+def _dump(obj: Any) -> Dict[str, Any]:
+    return jsonable_encoder(obj.model_dump())
+
+
+def _profile_photo(photos: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Profile photo, otherwise the first one uploaded (same choice as the live read model)"""
+    if not photos:
+        return None
+    return min(photos, key=lambda p: (not p.get("is_profile"), p["id"]))
+
+
+class ArchiveService:
+    """
+    Moves DISPOSED assets out of the live tables into ArchivedAsset.
+
+    Live lists, counts and reports then only scan live inventory; archived
+    assets stay readable through the archive endpoints or `include_archived`.
+    Photo files are kept in storage, archived rows still reference them.
+    """
+
+    @staticmethod
+    def _eligible(session: Session, cutoff: datetime, limit: int) -> List[Tuple[str, Optional[datetime]]]:
+        """
+        Disposed assets whose disposal was approved before `cutoff`, with that date.
+
+        Disposals approved before decided_at existed fall back to the asset's
+        updated_at; without either date the retention period is considered over.
+        """
+        decided = (
+            select(Disposal.asset_id, func.max(Disposal.decided_at).label("decided_at"))
+            .where(Disposal.status == DisposalStatus.APPROVED)
+            .group_by(Disposal.asset_id)
+            .subquery()
+        )
+        disposed_at = func.coalesce(decided.c.decided_at, Asset.updated_at)
+        statement = (
+            select(Asset.scom_asset_id, disposed_at)
+            .outerjoin(decided, decided.c.asset_id == Asset.scom_asset_id)
+            .where(Asset.asset_status == AssetStatus.DISPOSED)
+            .where(func.coalesce(disposed_at, cutoff) <= cutoff)
+            .order_by(Asset.scom_asset_id)
+            .limit(limit)
+        )
+        return [(row[0], row[1]) for row in session.exec(statement).all()]
+
+    @staticmethod
+    def _archive_batch(session: Session, eligible: List[Tuple[str, Optional[datetime]]]) -> int:
+        ids = [asset_id for asset_id, _ in eligible]
+        disposed_at = dict(eligible)
+        assets = session.exec(select(Asset).where(Asset.scom_asset_id.in_(ids))).all()
+
+        children: Dict[str, Dict[str, List[Dict[str, Any]]]] = {asset_id: {} for asset_id in ids}
+        for attribute, model in _CHILD_TABLES:
+            for row in session.exec(select(model).where(model.asset_id.in_(ids))).all():
+                children[row.asset_id].setdefault(attribute, []).append(_dump(row))
+                session.expunge(row)  # deleted below with a set-based DELETE
+
+        for asset in assets:
+            session.add(ArchivedAsset(
+                scom_asset_id=asset.scom_asset_id,
+                asset_name=asset.asset_name,
+                physical_asset_tag_number=asset.physical_asset_tag_number,
+                disposed_at=disposed_at.get(asset.scom_asset_id),
+                asset=_dump(asset),
+                **children[asset.scom_asset_id]
+            ))
+
+        # Children first (foreign keys), then the assets through the ORM so the
+        # read model, scanner cache and change journal follow automatically
+        for _, model in _CHILD_TABLES:
+            result = session.execute(delete(model).where(model.asset_id.in_(ids)).execution_options(synchronize_session=False))
+            CountService.adjust(session.connection(), model, -result.rowcount)
+        AssetJournalService.attribute(session, "archive")
+        for asset in assets:
+            session.delete(asset)
+        session.commit()
+        return len(assets)
+
+    @staticmethod
+    def archive_disposed(
+        session: Session,
+        retention_days: Optional[int] = None,
+        batch_size: int = ARCHIVE_BATCH_SIZE,
+    ) -> int:
+        """Archive every disposed asset past the retention period, one transaction per batch"""
+        if retention_days is None:
+            retention_days = ARCHIVE_RETENTION_DAYS
+        cutoff = datetime.utcnow() - timedelta(days=retention_days)
+        archived = 0
+        while True:
+            eligible = ArchiveService._eligible(session, cutoff, batch_size)
+            if not eligible:
+                return archived
+            archived += ArchiveService._archive_batch(session, eligible)
+
+    @staticmethod
+    def list_archived(session: Session, skip: int = 0, limit: int = 100) -> List[ArchivedAsset]:
+        return list(session.exec(
+            select(ArchivedAsset)
+            .order_by(ArchivedAsset.archived_at.desc(), ArchivedAsset.scom_asset_id)
+            .offset(skip).limit(limit)
+        ).all())
+
+    @staticmethod
+    def get_archived(session: Session, asset_id: str) -> Optional[ArchivedAsset]:
+        return session.get(ArchivedAsset, asset_id)
+
+    @staticmethod
+    def to_detailed_read(archived: ArchivedAsset) -> AssetDetailedRead:
+        """Archived asset in the shape of the live detail response (without location info)"""
+        profile = _profile_photo(archived.photos)
+        return AssetDetailedRead.model_validate({
+            **archived.asset,
+            "photo_count": len(archived.photos),
+            "profile_photo_url": PhotoService.get_photo_url(profile["filename"]) if profile else None,
+            "profile_photo_thumb_url": (
+                PhotoService.get_thumb_url(profile["filename"], profile.get("thumb_filename")) if profile else None
+            ),
+        })
@@ -0,0 +1,260 @@
+from datetime import date, datetime
+from typing import Any, List, Optional, Tuple
+from fastapi import HTTPException
+from sqlmodel import Session, select
+from app.core.http_cache import make_etag
+from app.core.pagination import keyset_after
+from app.core.sparse_fields import fields_statement
+from app.models.asset import Asset
+from app.models.asset_read_model import AssetReadModel
+from app.schemas.asset import AssetDetailedRead, AssetFilter, LocationInfo, SiteInfo
+from app.services.photo_service import PhotoService
+from app.services.count_service import CountService
+
+# Whitelisted sort fields for GET /assets and the python type of their cursor value.
+# All of them are NOT NULL and indexed together with the primary key (see Asset.__table_args__).
+SORTABLE_FIELDS = {
+    "scom_asset_id": str,
+    "asset_name": str,
+    "asset_status": str,
+    "date_of_acquisition": date,
+    "acquisition_price": float,
+}
+DEFAULT_SORT = "scom_asset_id"
+
+class AssetQueryService:
+    @staticmethod
+    def parse_sort(sort: str) -> Tuple[List[str], bool]:
+        """
+        Resolve a sort parameter such as "asset_name" or "-date_of_acquisition".
+
+        Returns the key fields (the primary key is appended as tie-breaker) and
+        whether the order is descending. Unknown fields are rejected with 400.
+        """
+        descending = sort.startswith("-")
+        field = sort.lstrip("-+")
+        if field not in SORTABLE_FIELDS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid sort field '{field}'. Allowed: {', '.join(SORTABLE_FIELDS)}"
+            )
+        keys = [field] if field == DEFAULT_SORT else [field, DEFAULT_SORT]
+        return keys, descending
+
+    @staticmethod
+    def cursor_types(sort: str) -> List[type]:
+        keys, _ = AssetQueryService.parse_sort(sort)
+        return [SORTABLE_FIELDS[k] for k in keys]
+
+    @staticmethod
+    def cursor_values(asset: Any, sort: str) -> List[Any]:
+        """Sort-key values of a row (Asset or AssetDetailedRead) to build the next cursor from"""
+        keys, _ = AssetQueryService.parse_sort(sort)
+        return [getattr(asset, k) for k in keys]
+
+    @staticmethod
+    def apply_filters(statement, filters: Optional[AssetFilter]):
+        """Add the WHERE clauses for the given filters. Site filtering needs AssetReadModel joined."""
+        if not filters:
+            return statement
+        if filters.asset_status:
+            statement = statement.where(Asset.asset_status == filters.asset_status)
+        if filters.location_id:
+            statement = statement.where(Asset.location_id == filters.location_id)
+        if filters.site_id:
+            statement = statement.where(AssetReadModel.site_id == filters.site_id)
+        if filters.custodian_id:
+            statement = statement.where(Asset.custodian_id == filters.custodian_id)
+        if filters.category_id:
+            statement = statement.where(Asset.category_id == filters.category_id)
+        if filters.sub_category_id:
+            statement = statement.where(Asset.sub_category_id == filters.sub_category_id)
+        if filters.legal_entity_id:
+            statement = statement.where(Asset.legal_entity_id == filters.legal_entity_id)
+        if filters.project_id:
+            statement = statement.where(Asset.project_id == filters.project_id)
+        if filters.acquired_from:
+            statement = statement.where(Asset.date_of_acquisition >= filters.acquired_from)
+        if filters.acquired_to:
+            statement = statement.where(Asset.date_of_acquisition <= filters.acquired_to)
+        return statement
+
+    @staticmethod
+    def join_filter_tables(statement, filters: Optional[AssetFilter]):
+        """Join AssetReadModel to a statement on Asset columns only when apply_filters needs it"""
+        if filters and filters.site_id:
+            statement = statement.outerjoin(AssetReadModel, AssetReadModel.scom_asset_id == Asset.scom_asset_id)
+        return statement
+
+    @staticmethod
+    def count(session: Session, filters: Optional[AssetFilter] = None) -> Tuple[int, bool]:
+        """
+        Total number of assets matching `filters`; returns (count, estimated).
+        Unfiltered totals come from the counter cache, no scan involved.
+        """
+        if not filters or not any(filters.model_dump().values()):
+            return CountService.total(session, Asset), False
+        statement = AssetQueryService.apply_filters(
+            AssetQueryService.join_filter_tables(select(Asset.scom_asset_id), filters),
+            filters,
+        )
+        return CountService.count(session, statement)
+
+    @staticmethod
+    def apply_sort(statement, sort: str, after: Optional[List[Any]] = None):
+        """ORDER BY the sort keys and, when `after` (decoded cursor) is given, seek past it"""
+        keys, descending = AssetQueryService.parse_sort(sort)
+        columns = [getattr(Asset, k) for k in keys]
+        if after is not None:
+            statement = statement.where(keyset_after(columns, after, descending=descending))
+        return statement.order_by(*[c.desc() if descending else c.asc() for c in columns])
+
+    @staticmethod
+    def detailed_statement():
+        """Assets joined 1:1 (on the primary key) to their denormalized read-model row"""
+        return (
+            select(Asset, AssetReadModel)
+            .outerjoin(AssetReadModel, AssetReadModel.scom_asset_id == Asset.scom_asset_id)
+        )
+
+    @staticmethod
+    def to_detailed_read(asset: Asset, read_model: Optional[AssetReadModel]) -> AssetDetailedRead:
+        """Build the AssetDetailedRead response from already loaded rows (no further queries)"""
+        asset_detailed = AssetDetailedRead.model_validate(asset)
+        if not read_model:
+            return asset_detailed
+
+        # Populate photo info
+        asset_detailed.photo_count = read_model.photo_count
+        if read_model.profile_photo_filename:
+            asset_detailed.profile_photo_url = PhotoService.get_photo_url(read_model.profile_photo_filename)
+            asset_detailed.profile_photo_thumb_url = PhotoService.get_thumb_url(
+                read_model.profile_photo_filename, read_model.profile_thumb_filename
+            )
+
+        if read_model.location_id:
+            location_info = LocationInfo(
+                location_id=read_model.location_id,
+                location_code=read_model.location_code,
+                location_name=read_model.location_name,
+                location_name_code=read_model.location_name_code
+            )
+            if read_model.site_id:
+                location_info.site = SiteInfo(
+                    site_id=read_model.site_id,
+                    site_code=read_model.site_code,
+                    site_name=read_model.site_name
+                )
+            asset_detailed.location = location_info
+
+        return asset_detailed
+
+    @staticmethod
+    def _page(statement, filters: Optional[AssetFilter], sort: str, skip: int, limit: int, after: Optional[List[Any]]):
+        statement = AssetQueryService.apply_filters(statement, filters)
+        statement = AssetQueryService.apply_sort(statement, sort, after)
+        if after is None:
+            statement = statement.offset(skip)
+        return statement.limit(limit)
+
+    @staticmethod
+    def version_statement():
+        """Only the version columns of an asset and its read-model row (for ETags)"""
+        return (
+            select(Asset.scom_asset_id, Asset.updated_at, AssetReadModel.refreshed_at)
+            .outerjoin(AssetReadModel, AssetReadModel.scom_asset_id == Asset.scom_asset_id)
+        )
+
+    @staticmethod
+    def page_etag(
+        session: Session,
+        filters: Optional[AssetFilter] = None,
+        sort: str = DEFAULT_SORT,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[List[Any]] = None,
+        total: Optional[Tuple[int, bool]] = None,
+    ) -> str:
+        """
+        ETag of the page list_detailed would return for the same arguments.
+        Changes when a row enters/leaves the page, is updated or its read model is refreshed,
+        and with `total` (the X-Total-Count sent with the page) when assets elsewhere come or go.
+        """
+        statement = AssetQueryService._page(
+            AssetQueryService.version_statement(), filters, sort, skip, limit, after
+        )
+        return make_etag([*session.exec(statement).all(), total])
+
+    @staticmethod
+    def asset_version(session: Session, asset_id: str) -> Optional[Tuple[str, Optional[datetime]]]:
+        """(ETag, last modified) of a single asset, or None when it does not exist"""
+        row = session.exec(
+            AssetQueryService.version_statement().where(Asset.scom_asset_id == asset_id)
+        ).first()
+        if not row:
+            return None
+        timestamps = [t for t in row[1:] if t]
+        return make_etag(row), max(timestamps) if timestamps else None
+
+    @staticmethod
+    def list_detailed(
+        session: Session,
+        filters: Optional[AssetFilter] = None,
+        sort: str = DEFAULT_SORT,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[List[Any]] = None,
+    ) -> List[AssetDetailedRead]:
+        """
+        One page of detailed assets in a single query, whatever the page size.
+
+        When `after` (the decoded cursor) is given it seeks past those sort-key
+        values and `skip` is ignored.
+        """
+        statement = AssetQueryService._page(
+            AssetQueryService.detailed_statement(), filters, sort, skip, limit, after
+        )
+        rows = session.exec(statement).all()
+        return [AssetQueryService.to_detailed_read(asset, read_model) for asset, read_model in rows]
+
+    @staticmethod
+    def list_fields(
+        session: Session,
+        resolved: List[Tuple[str, str]],
+        filters: Optional[AssetFilter] = None,
+        sort: str = DEFAULT_SORT,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[List[Any]] = None,
+    ) -> List[Any]:
+        """
+        Same page as list_detailed, selecting only the requested Asset columns
+        (see app.core.sparse_fields); sort keys are added for the cursor. The
+        read model is only joined for a site filter.
+        """
+        keys, _ = AssetQueryService.parse_sort(sort)
+        statement = AssetQueryService.join_filter_tables(fields_statement(Asset, resolved, required=keys), filters)
+        statement = AssetQueryService._page(statement, filters, sort, skip, limit, after)
+        return session.exec(statement).all()
+
+    @staticmethod
+    def get_detailed_many(session: Session, asset_ids: List[str]) -> List[AssetDetailedRead]:
+        """Detailed assets for the given IDs in one query, returned in the order of `asset_ids`"""
+        if not asset_ids:
+            return []
+        statement = AssetQueryService.detailed_statement().where(Asset.scom_asset_id.in_(asset_ids))
+        by_id = {
+            asset.scom_asset_id: AssetQueryService.to_detailed_read(asset, read_model)
+            for asset, read_model in session.exec(statement).all()
+        }
+        return [by_id[asset_id] for asset_id in asset_ids if asset_id in by_id]
+
+    @staticmethod
+    def get_detailed(session: Session, asset_id: str) -> Optional[AssetDetailedRead]:
+        """Single detailed asset, or None when it does not exist"""
+        statement = AssetQueryService.detailed_statement().where(Asset.scom_asset_id == asset_id)
+        row = session.exec(statement).first()
+        if not row:
+            return None
+        asset, read_model = row
+        return AssetQueryService.to_detailed_read(asset, read_model)
@@ -0,0 +1,178 @@
+import hashlib
+import logging
+from collections import Counter
+from typing import BinaryIO, Iterable, Optional, Tuple
+from sqlalchemy import event, func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session as OrmSession
+from sqlmodel import Session, select
+from app.core.storage import get_storage
+from app.core.uploads import UploadPolicy, UploadWriter, shard_name
+from app.models.archive import ArchivedAsset
+from app.models.asset_photo import AssetPhoto
+from app.models.operations import Disposal
+from app.models.stored_blob import StoredBlob
+
+# Bytes read per iteration while hashing existing files
+HASH_CHUNK_SIZE = 1024 * 1024
+
+_PENDING_REMOVALS = "blob_pending_removals"
+
+logger = logging.getLogger(__name__)
+
+
+class BlobService:
+    """
+    Content-addressed storage of uploads in the configured storage backend.
+
+    Identical bytes are stored once, as ab/cd/<sha256><ext>, and shared by every
+    AssetPhoto / Disposal pointing at that filename; StoredBlob.ref_count
+    tracks how many do. Files are removed after the commit that drops the
+    last reference.
+    """
+
+    @staticmethod
+    def blob_filename(digest: str, extension: str) -> str:
+        return shard_name(f"{digest}{extension.lower()}")
+
+    @staticmethod
+    def hash_file(path: str) -> Tuple[str, int]:
+        digest = hashlib.sha256()
+        size = 0
+        with open(path, "rb") as f:
+            while chunk := f.read(HASH_CHUNK_SIZE):
+                digest.update(chunk)
+                size += len(chunk)
+        return digest.hexdigest(), size
+
+    @staticmethod
+    def store(session: Session, fileobj: BinaryIO, policy: UploadPolicy, references: int = 1) -> str:
+        """
+        Store an upload and return the filename to reference it by.
+        `references` is the number of rows that will point at it.
+
+        Raises:
+            HTTPException(413/415) if the upload breaks `policy` (nothing is kept)
+        """
+        writer = UploadWriter(policy)
+        try:
+            writer.copy_from(fileobj)
+            writer.finish()
+            return BlobService.store_upload(session, writer, references)
+        finally:
+            writer.discard()
+
+    @staticmethod
+    def store_upload(session: Session, writer: UploadWriter, references: int = 1) -> str:
+        """Store a finished UploadWriter (e.g. a streamed request body); the extension follows the sniffed type"""
+        return BlobService.add_file(session, writer.path, writer.digest, writer.size, writer.extension, references)
+
+    @staticmethod
+    def add_file(
+        session: Session,
+        path: str,
+        digest: str,
+        size: int,
+        extension: str,
+        references: int = 1,
+    ) -> str:
+        """
+        Register a file already written at `path` with its content hash. The
+        file is moved into place if the content is new, otherwise left alone
+        (callers remove it). Returns the shared filename.
+
+        A file moved into place whose transaction then rolls back is left
+        unreferenced in storage; app.commands.gc_uploads removes it.
+        """
+        blob = BlobService._get(session, StoredBlob.sha256 == digest)
+        if blob is None:
+            filename = BlobService.blob_filename(digest, extension)
+            try:
+                with session.begin_nested():
+                    session.add(StoredBlob(sha256=digest, filename=filename, size=size, ref_count=references))
+            except IntegrityError:
+                # The same content was stored concurrently
+                blob = BlobService._get(session, StoredBlob.sha256 == digest)
+            else:
+                # Always written: an unreferenced copy left by a rolled-back upload
+                # may be about to be garbage collected
+                get_storage().put_file(path, filename)
+                return filename
+
+        blob.ref_count += references
+        session.add(blob)
+        BlobService._put_in_place(path, blob.filename)  # in case the file went missing
+        return blob.filename
+
+    @staticmethod
+    def _get(session: Session, condition) -> Optional[StoredBlob]:
+        return session.exec(select(StoredBlob).where(condition).with_for_update()).first()
+
+    @staticmethod
+    def _put_in_place(path: str, filename: str) -> None:
+        storage = get_storage()
+        if not storage.exists(filename):
+            storage.put_file(path, filename)
+
+    @staticmethod
+    def release(session: Session, filename: str, *derived: Optional[str]) -> None:
+        """
+        Drop one reference to `filename`. When none are left, the file and its
+        `derived` files (thumbnails) are removed once the transaction commits.
+        Files stored before deduplication (no StoredBlob) are removed directly.
+        """
+        blob = BlobService._get(session, StoredBlob.filename == filename)
+        if blob is not None:
+            blob.ref_count -= 1
+            if blob.ref_count > 0:
+                session.add(blob)
+                return
+            session.delete(blob)
+        BlobService.delete_after_commit(session, [filename, *derived])
+
+    @staticmethod
+    def delete_after_commit(session: Session, filenames: Iterable[Optional[str]]) -> None:
+        """Remove files from storage once the transaction commits (kept if it rolls back)"""
+        removals = session.info.setdefault(_PENDING_REMOVALS, set())
+        removals.update(f for f in filenames if f)
+
+    @staticmethod
+    def recount(session: Session) -> int:
+        """
+        Recompute every ref_count from the referencing rows, archived ones
+        included. Returns the number of blobs left without references.
+        """
+        references = Counter()
+        for filename, count in session.exec(
+            select(AssetPhoto.filename, func.count()).group_by(AssetPhoto.filename)
+        ).all():
+            references[filename] += count
+        for filename, count in session.exec(
+            select(Disposal.document_path, func.count()).group_by(Disposal.document_path)
+        ).all():
+            references[filename] += count
+        for photos, disposals in session.exec(select(ArchivedAsset.photos, ArchivedAsset.disposals)).all():
+            references.update(p["filename"] for p in photos)
+            references.update(d["document_path"] for d in disposals)
+
+        unreferenced = 0
+        for blob in session.exec(select(StoredBlob)).all():
+            blob.ref_count = references.get(blob.filename, 0)
+            unreferenced += blob.ref_count == 0
+            session.add(blob)
+        session.commit()
+        return unreferenced
+
+
+@event.listens_for(OrmSession, "after_commit")
+def _remove_released_files(session):
+    for filename in session.info.pop(_PENDING_REMOVALS, ()):
+        try:
+            get_storage().delete(filename)
+        except Exception as e:
+            logger.warning("Could not remove %s: %s", filename, e)
+
+
+@event.listens_for(OrmSession, "after_rollback")
+def _keep_released_files(session):
+    session.info.pop(_PENDING_REMOVALS, None)
@@ -0,0 +1,112 @@
+from typing import Any, Dict, List, Optional
+from fastapi import HTTPException
+from sqlalchemy import update
+from sqlmodel import Session, select
+from app.models.asset import Asset
+from app.models.asset_read_model import AssetReadModel
+from app.models.master_data import (
+    AssetCategory, AssetSubCategory, FundingSource, LegalEntity, Location, Project,
+)
+from app.models.user import User
+from app.schemas.asset import AssetBulkUpdate, AssetBulkUpdateResult
+from app.services.asset_query_service import AssetQueryService
+from app.services.journal_service import AssetJournalService
+from app.services.read_model_service import AssetReadModelService
+from app.services.scan_service import ScanService
+from app.services.hierarchy_service import HierarchyService
+
+# IDs per UPDATE ... WHERE scom_asset_id IN (...) statement
+BULK_UPDATE_BATCH_SIZE = 1000
+
+# Unique per asset, so never set in bulk
+_NOT_BULK_UPDATABLE = {"physical_asset_tag_number"}
+
+# Foreign keys checked before the UPDATE, so an unknown ID is a 400 rather
+# than an IntegrityError after the journal rows were written
+_REFERENCE_CHECKS = [
+    ("legal_entity_id", LegalEntity, "legal entity"),
+    ("location_id", Location, "location"),
+    ("project_id", Project, "project"),
+    ("funding_source_id", FundingSource, "funding source"),
+    ("custodian_id", User, "custodian"),
+    ("category_id", AssetCategory, "category"),
+]
+
+
+class AssetBulkService:
+    @staticmethod
+    def _values(session: Session, bulk_in: AssetBulkUpdate) -> Dict[str, Any]:
+        values = bulk_in.changes.model_dump(exclude_unset=True)
+        if not values:
+            raise HTTPException(status_code=400, detail="No changes given")
+        forbidden = _NOT_BULK_UPDATABLE & values.keys()
+        if forbidden:
+            raise HTTPException(status_code=400, detail=f"Cannot bulk update: {', '.join(sorted(forbidden))}")
+
+        # Keep category consistent with a new sub-category, as create_asset does
+        if values.get("sub_category_id") and not values.get("category_id"):
+            sub_cat = session.get(AssetSubCategory, values["sub_category_id"])
+            if not sub_cat:
+                raise HTTPException(status_code=400, detail="Sub-category not found")
+            values["category_id"] = sub_cat.category_id
+        for field, model, label in _REFERENCE_CHECKS:
+            if values.get(field) and not session.get(model, values[field]):
+                raise HTTPException(status_code=400, detail=f"Unknown {label} '{values[field]}'")
+        return values
+
+    @staticmethod
+    def _update(session: Session, condition, values: Dict[str, Any], changed_by: Optional[str]) -> List[str]:
+        # Old values for the change journal, locked until the transaction ends
+        old_rows = session.execute(
+            select(Asset.scom_asset_id, *[getattr(Asset, field) for field in values])
+            .where(condition)
+            .with_for_update()
+        ).all()
+        AssetJournalService.record_updates(session, old_rows, values, source="bulk_update", changed_by=changed_by)
+
+        statement = (
+            update(Asset)
+            .where(condition)
+            .values(**values)
+            .returning(Asset.scom_asset_id)
+            .execution_options(synchronize_session=False)
+        )
+        return list(session.execute(statement).scalars().all())
+
+    @staticmethod
+    def bulk_update(session: Session, bulk_in: AssetBulkUpdate, changed_by: Optional[str] = None) -> AssetBulkUpdateResult:
+        """
+        Apply one partial update to many assets with set-based UPDATE statements.
+
+        Everything runs in a single transaction: either all targeted assets are
+        updated or none. updated_at is bumped by the column's onupdate.
+        """
+        values = AssetBulkService._values(session, bulk_in)
+
+        updated_ids: List[str] = []
+        if bulk_in.asset_ids is not None:
+            requested = list(dict.fromkeys(bulk_in.asset_ids))
+            for i in range(0, len(requested), BULK_UPDATE_BATCH_SIZE):
+                batch = requested[i:i + BULK_UPDATE_BATCH_SIZE]
+                updated_ids += AssetBulkService._update(session, Asset.scom_asset_id.in_(batch), values, changed_by)
+            found = set(updated_ids)
+            not_found = [asset_id for asset_id in requested if asset_id not in found]
+        else:
+            matching = AssetQueryService.apply_filters(
+                select(Asset.scom_asset_id)
+                .outerjoin(AssetReadModel, AssetReadModel.scom_asset_id == Asset.scom_asset_id),
+                bulk_in.filter,
+            )
+            updated_ids = AssetBulkService._update(session, Asset.scom_asset_id.in_(matching), values, changed_by)
+            not_found = []
+
+        # The UPDATE bypasses the unit of work; only a location change alters read-model data
+        if "location_id" in values and updated_ids:
+            AssetReadModelService.refresh_assets(session.connection(), updated_ids)
+
+        session.commit()
+        if updated_ids:
+            ScanService.clear_cache()
+            if {"location_id", "acquisition_price"} & values.keys():
+                HierarchyService.clear_cache()
+        return AssetBulkUpdateResult(updated=len(updated_ids), not_found=not_found)
@@ -0,0 +1,170 @@
+import json
+import logging
+from collections import Counter
+from typing import Any, Tuple
+from sqlalchemy import delete, event, exists, func, insert, literal, select as sa_select
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session as OrmSession
+from sqlmodel import Session
+from app.models.asset import Asset
+from app.models.operations import Maintenance
+from app.models.table_count import TableCountDelta
+from app.models.user import User
+from app.models.verification import AssetVerification, VerificationSession
+
+# Tables whose row count is cached in TableCountDelta
+COUNTED_MODELS = (Asset, User, VerificationSession, AssetVerification, Maintenance)
+
+# Planner estimates below this are cheap enough to replace with an exact count
+EXACT_COUNT_THRESHOLD = 10000
+
+# Delta rows of one table folded into a single row once there are more than this
+COMPACT_THRESHOLD = 1000
+
+_COUNTED_TABLES = {model.__tablename__ for model in COUNTED_MODELS}
+
+logger = logging.getLogger(__name__)
+
+
+class CountService:
+    """
+    Total counts for paginated lists.
+
+    Unfiltered totals are the sum of the TableCountDelta rows of a table:
+    a base count written by `seed` at startup (or `recount`, python -m
+    app.commands.recount_tables, to fix drift) plus the deltas appended by the
+    after_flush listener below for ORM inserts/deletes. Set-based INSERT and
+    DELETE statements must call `adjust` themselves. Tables without a base
+    count yet are counted with COUNT(*).
+    Filtered totals use the Postgres planner estimate when it is large and an
+    exact COUNT otherwise.
+    """
+
+    @staticmethod
+    def adjust(conn: Connection, model: Any, delta: int) -> None:
+        """
+        Record a change of `delta` rows in `model`'s table (no-op for uncounted
+        tables). Appends a row instead of updating a shared one, and only once
+        the table has a base count.
+        """
+        name = model.__tablename__
+        if not delta or name not in _COUNTED_TABLES:
+            return
+        seeded = exists().where(TableCountDelta.table_name == name)
+        conn.execute(
+            insert(TableCountDelta).from_select(
+                ["table_name", "row_count"],
+                sa_select(literal(name), literal(delta)).where(seeded),
+            )
+        )
+
+    @staticmethod
+    def seed(engine: Engine) -> None:
+        """Write the base count of every counted table that has none yet (run at startup)"""
+        for model in COUNTED_MODELS:
+            name = model.__tablename__
+            seeded = exists().where(TableCountDelta.table_name == name)
+            count = sa_select(func.count()).select_from(model).scalar_subquery()
+            with engine.begin() as conn:
+                if conn.dialect.name == "postgresql":
+                    # Workers starting together must not both seed a table; the
+                    # lock also holds back delta appends until the base row exists
+                    conn.exec_driver_sql(
+                        f'LOCK TABLE "{TableCountDelta.__tablename__}" IN SHARE ROW EXCLUSIVE MODE'
+                    )
+                conn.execute(
+                    insert(TableCountDelta).from_select(
+                        ["table_name", "row_count"],
+                        sa_select(literal(name), count).where(~seeded),
+                    )
+                )
+
+    @staticmethod
+    def recount(engine: Engine) -> None:
+        """Replace every table's count with a COUNT(*) (resync; run from the recount_tables command)"""
+        for model in COUNTED_MODELS:
+            name = model.__tablename__
+            with engine.begin() as conn:
+                count = conn.execute(sa_select(func.count()).select_from(model)).scalar_one()
+                conn.execute(delete(TableCountDelta).where(TableCountDelta.table_name == name))
+                conn.execute(insert(TableCountDelta).values(table_name=name, row_count=count))
+
+    @staticmethod
+    def compact(conn: Connection, model: Any) -> None:
+        """
+        Fold the committed delta rows of a table into one. Only rows this
+        statement actually deleted are summed, so concurrent compactions
+        never count a delta twice.
+        """
+        name = model.__tablename__
+        deleted = conn.execute(
+            delete(TableCountDelta)
+            .where(TableCountDelta.table_name == name)
+            .returning(TableCountDelta.row_count)
+        ).scalars().all()
+        if deleted:
+            conn.execute(insert(TableCountDelta).values(table_name=name, row_count=sum(deleted)))
+
+    @staticmethod
+    def total(session: Session, model: Any) -> int:
+        """Exact row count of a counted table, without scanning it"""
+        name = model.__tablename__
+        row_count, rows = session.exec(
+            sa_select(func.coalesce(func.sum(TableCountDelta.row_count), 0), func.count())
+            .where(TableCountDelta.table_name == name)
+        ).one()
+        if not rows:
+            return session.exec(sa_select(func.count()).select_from(model)).one()[0]
+        if rows > COMPACT_THRESHOLD:
+            bind = session.get_bind()
+            if isinstance(bind, Engine):
+                # Own short transaction: the request's one stays read-only
+                with bind.begin() as conn:
+                    CountService.compact(conn, model)
+        return max(row_count, 0)
+
+    @staticmethod
+    def _estimate(session: Session, statement) -> int:
+        bind = session.get_bind()
+        sql = statement.compile(dialect=bind.dialect, compile_kwargs={"literal_binds": True})
+        plan = session.connection().exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}").scalar_one()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    @staticmethod
+    def count(session: Session, statement) -> Tuple[int, bool]:
+        """
+        Count the rows of a filtered SELECT; returns (count, estimated).
+
+        On Postgres large results are estimated from planner statistics
+        (EXPLAIN) instead of being counted, small ones are counted exactly.
+        """
+        statement = statement.order_by(None)
+        if session.get_bind().dialect.name == "postgresql":
+            try:
+                # Savepoint: a failed EXPLAIN must not abort the request's transaction
+                with session.begin_nested():
+                    estimate = CountService._estimate(session, statement)
+                if estimate >= EXACT_COUNT_THRESHOLD:
+                    return estimate, True
+            except Exception as e:
+                logger.warning("Count estimate failed, counting exactly: %s", e)
+        exact = session.exec(sa_select(func.count()).select_from(statement.subquery())).one()[0]
+        return exact, False
+
+
+@event.listens_for(OrmSession, "after_flush")
+def _maintain_counts(session, flush_context):
+    deltas = Counter()
+    for obj in session.new:
+        if isinstance(obj, COUNTED_MODELS):
+            deltas[type(obj)] += 1
+    for obj in session.deleted:
+        if isinstance(obj, COUNTED_MODELS):
+            deltas[type(obj)] -= 1
+    if not deltas:
+        return
+    conn = session.connection()
+    for model, delta in deltas.items():
+        CountService.adjust(conn, model, delta)
@@ -0,0 +1,88 @@
+import csv
+import io
+import json
+from typing import Any, Dict, Iterator, List, Optional
+from sqlmodel import Session
+from app.core.db import engine
+from app.models.asset import Asset
+from app.schemas.asset import AssetDetailedRead, AssetFilter
+from app.services.asset_query_service import AssetQueryService
+
+# Rows fetched per round trip from the server-side cursor
+EXPORT_BATCH_SIZE = 500
+
+# Flattened columns for the nested location/site of AssetDetailedRead
+_LOCATION_COLUMNS = [
+    "locationCode",
+    "locationName",
+    "locationNameCode",
+    "siteId",
+    "siteCode",
+    "siteName",
+]
+
+
+class AssetExportService:
+    @staticmethod
+    def csv_columns() -> List[str]:
+        """CSV header: AssetDetailedRead aliases with the nested location flattened"""
+        columns = [
+            field.alias or name
+            for name, field in AssetDetailedRead.model_fields.items()
+            if name != "location"
+        ]
+        return columns + _LOCATION_COLUMNS
+
+    @staticmethod
+    def iter_assets(filters: Optional[AssetFilter] = None) -> Iterator[AssetDetailedRead]:
+        """
+        Stream every matching asset as AssetDetailedRead.
+
+        Uses its own session because the generator outlives the request
+        dependency. yield_per keeps a server-side cursor open and only holds
+        one batch in memory at a time.
+        """
+        with Session(engine) as session:
+            statement = AssetQueryService.apply_filters(AssetQueryService.detailed_statement(), filters)
+            statement = statement.order_by(Asset.scom_asset_id).execution_options(yield_per=EXPORT_BATCH_SIZE)
+            for asset, read_model in session.exec(statement):
+                yield AssetQueryService.to_detailed_read(asset, read_model)
+
+    @staticmethod
+    def _flatten(asset: AssetDetailedRead) -> Dict[str, Any]:
+        row = asset.model_dump(mode="json", by_alias=True)
+        location = row.pop("location", None) or {}
+        site = location.pop("site", None) or {}
+        for key in ("locationCode", "locationName", "locationNameCode"):
+            row[key] = location.get(key)
+        for key in ("siteId", "siteCode", "siteName"):
+            row[key] = site.get(key)
+        return row
+
+    @staticmethod
+    def stream_csv(filters: Optional[AssetFilter] = None) -> Iterator[str]:
+        """CSV text chunks, one chunk per EXPORT_BATCH_SIZE rows"""
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=AssetExportService.csv_columns(), extrasaction="ignore")
+        writer.writeheader()
+        count = 0
+        for asset in AssetExportService.iter_assets(filters):
+            writer.writerow(AssetExportService._flatten(asset))
+            count += 1
+            if count % EXPORT_BATCH_SIZE == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate(0)
+        yield buffer.getvalue()
+
+    @staticmethod
+    def stream_ndjson(filters: Optional[AssetFilter] = None) -> Iterator[str]:
+        """One JSON document per line, full AssetDetailedRead shape (nested location kept)"""
+        lines = []
+        for asset in AssetExportService.iter_assets(filters):
+            lines.append(json.dumps(asset.model_dump(mode="json", by_alias=True)))
+            if len(lines) >= EXPORT_BATCH_SIZE:
+                yield "\n".join(lines) + "\n"
+                lines = []
+        if lines:
+            yield "\n".join(lines) + "\n"
@@ -0,0 +1,153 @@
+import os
+import tempfile
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Iterator, List, Set
+from sqlalchemy import Text, cast, delete, or_
+from sqlmodel import Session, select
+from app.core.config import settings
+from app.core.storage import StoredFile, get_storage
+from app.models.archive import ArchivedAsset
+from app.models.asset_photo import AssetPhoto
+from app.models.operations import Disposal
+from app.models.stored_blob import StoredBlob
+from app.services.blob_service import BlobService
+from app.services.pdf_service import TEMP_PDF_PREFIXES
+
+# Files younger than this are never collected: their rows may not be committed yet
+UPLOAD_GC_GRACE_HOURS = getattr(settings, "UPLOAD_GC_GRACE_HOURS", 24)
+# Generated PDFs are only needed until the response is sent
+TEMP_PDF_MAX_AGE_MINUTES = getattr(settings, "TEMP_PDF_MAX_AGE_MINUTES", 60)
+UPLOAD_GC_BATCH_SIZE = 1000
+
+# Spool files left in UPLOAD_DIR by interrupted uploads, photo normalization, thumbnails and commands
+_SCRATCH_PREFIXES = (".upload_", ".ingest_", ".thumb_", ".dedupe_", ".copy_")
+# Precompressed siblings live as long as the file they were made from
+_SIBLING_SUFFIXES = (".br", ".gz")
+
+
+def _source_name(name: str) -> str:
+    for suffix in _SIBLING_SUFFIXES:
+        if name.endswith(suffix):
+            return name[:-len(suffix)]
+    return name
+
+
+def _batches(files: Iterable[StoredFile], size: int) -> Iterator[List[StoredFile]]:
+    batch: List[StoredFile] = []
+    for stored in files:
+        batch.append(stored)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class UploadGCService:
+    """
+    Garbage collection of uploaded files.
+
+    Stored files no row references (photos of deleted assets, uploads whose
+    transaction rolled back, ...) are found by diffing the storage listing
+    against AssetPhoto, Disposal and archived asset references, one batch of
+    listed files at a time.
+    """
+
+    @staticmethod
+    def _archived(session: Session, names: List[str]) -> Set[str]:
+        """Which of `names` archived assets reference"""
+        # Only the archived rows whose JSON mentions one of the names are
+        # loaded, then matched exactly
+        documents = cast(ArchivedAsset.photos, Text) + cast(ArchivedAsset.disposals, Text)
+        statement = select(ArchivedAsset.photos, ArchivedAsset.disposals).where(
+            or_(*(documents.contains(name, autoescape=True) for name in names))
+        )
+        wanted = set(names)
+        referenced: Set[str] = set()
+        for photos, disposals in session.exec(statement).all():
+            for photo in photos:
+                referenced.update({photo["filename"], photo.get("thumb_filename")} & wanted)
+            referenced.update({d["document_path"] for d in disposals} & wanted)
+        return referenced
+
+    @staticmethod
+    def _referenced(session: Session, names: List[str]) -> Set[str]:
+        """Which of `names` live or archived rows reference"""
+        referenced = UploadGCService._archived(session, names)
+        for column in (AssetPhoto.filename, AssetPhoto.thumb_filename, Disposal.document_path):
+            referenced.update(session.exec(select(column).where(column.in_(names)).distinct()).all())
+        return referenced
+
+    @staticmethod
+    def find_orphans(
+        session: Session,
+        grace: timedelta = timedelta(hours=UPLOAD_GC_GRACE_HOURS),
+        batch_size: int = UPLOAD_GC_BATCH_SIZE,
+    ) -> Iterator[List[StoredFile]]:
+        """Unreferenced stored files older than `grace`, in batches (references are checked per batch)"""
+        cutoff = datetime.now(timezone.utc) - grace
+        for batch in _batches(get_storage().iter_files(), batch_size):
+            candidates = [f for f in batch if f.modified < cutoff]
+            if not candidates:
+                continue
+            referenced = UploadGCService._referenced(session, list({_source_name(f.name) for f in candidates}))
+            orphans = [f for f in candidates if _source_name(f.name) not in referenced]
+            if orphans:
+                yield orphans
+
+    @staticmethod
+    def remove(session: Session, files: List[StoredFile]) -> List[str]:
+        """
+        Delete orphaned files and the StoredBlob rows still pointing at them.
+        References are checked again with the blobs locked, so an upload of
+        the same content or an asset archived in the meantime keeps its file.
+        Files are only removed once the rows are gone (after the commit).
+        Returns the removed names.
+        """
+        names = [f.name for f in files]
+        session.exec(select(StoredBlob).where(StoredBlob.filename.in_(names)).with_for_update()).all()
+        referenced = UploadGCService._referenced(session, list({_source_name(name) for name in names}))
+        orphans = [name for name in names if _source_name(name) not in referenced]
+        session.execute(delete(StoredBlob).where(StoredBlob.filename.in_(orphans)))
+        BlobService.delete_after_commit(session, orphans)
+        session.commit()
+        return orphans
+
+    @staticmethod
+    def _stale_files(directory: str, prefixes: Iterable[str], max_age: timedelta) -> List[str]:
+        cutoff = (datetime.now(timezone.utc) - max_age).timestamp()
+        stale = []
+        try:
+            entries = list(os.scandir(directory))
+        except FileNotFoundError:
+            return stale
+        for entry in entries:
+            if not entry.name.startswith(tuple(prefixes)) or not entry.is_file(follow_symlinks=False):
+                continue
+            try:
+                if entry.stat().st_mtime < cutoff:
+                    stale.append(entry.path)
+            except FileNotFoundError:
+                continue
+        return stale
+
+    @staticmethod
+    def stale_scratch_files(grace: timedelta = timedelta(hours=UPLOAD_GC_GRACE_HOURS)) -> List[str]:
+        """Upload spool files in UPLOAD_DIR left behind by interrupted requests"""
+        return UploadGCService._stale_files(settings.UPLOAD_DIR, _SCRATCH_PREFIXES, grace)
+
+    @staticmethod
+    def stale_temp_pdfs(max_age: timedelta = timedelta(minutes=TEMP_PDF_MAX_AGE_MINUTES)) -> List[str]:
+        """PDFs generated by PDFService in the temp directory and never removed"""
+        return [
+            path for path in UploadGCService._stale_files(tempfile.gettempdir(), TEMP_PDF_PREFIXES, max_age)
+            if path.endswith(".pdf")
+        ]
+
+    @staticmethod
+    def remove_local(paths: Iterable[str]) -> None:
+        for path in paths:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
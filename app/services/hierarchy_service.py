@@ -0,0 +1,106 @@
+from itertools import chain
+from typing import Dict, List
+from sqlalchemy import event, func, inspect
+from sqlalchemy.orm import Session as OrmSession
+from sqlmodel import Session, select
+from app.core.cache import LRUCache
+from app.models.asset import Asset
+from app.models.master_data import Location, Site
+from app.schemas.asset import LocationNode, SiteNode
+
+# One entry: the whole tree. The TTL bounds staleness across worker processes.
+_tree_cache = LRUCache(maxsize=1, ttl=300)
+_TREE_KEY = "tree"
+
+_PENDING_CLEAR = "hierarchy_cache_pending_clear"
+
+# Asset attributes the tree aggregates on
+_TREE_FIELDS = ("location_id", "acquisition_price")
+
+
+class HierarchyService:
+    """
+    Site -> location tree with asset counts and acquisition value per node.
+
+    Cached in-process; the cache is cleared when a commit moves, adds or
+    removes assets (update_asset, approve_transfer, imports...) or changes sites
+    and locations. See the session listeners below.
+    """
+
+    @staticmethod
+    def _build(session: Session) -> List[SiteNode]:
+        rows = session.exec(
+            select(
+                Site.site_id, Site.site_code, Site.site_name,
+                Location.location_id, Location.location_code, Location.location_name,
+                func.count(Asset.scom_asset_id),
+                func.coalesce(func.sum(Asset.acquisition_price), 0),
+            )
+            .select_from(Site)
+            .outerjoin(Location, Location.site_id == Site.site_id)
+            .outerjoin(Asset, Asset.location_id == Location.location_id)
+            .group_by(
+                Site.site_id, Site.site_code, Site.site_name,
+                Location.location_id, Location.location_code, Location.location_name,
+            )
+            .order_by(Site.site_code, Location.location_code)
+        ).all()
+
+        sites: Dict[str, SiteNode] = {}
+        for site_id, site_code, site_name, location_id, location_code, location_name, count, value in rows:
+            site = sites.get(site_id)
+            if site is None:
+                site = sites[site_id] = SiteNode(site_id=site_id, site_code=site_code, site_name=site_name)
+            if location_id is None:
+                continue  # site without locations
+            site.locations.append(LocationNode(
+                location_id=location_id,
+                location_code=location_code,
+                location_name=location_name,
+                asset_count=count,
+                total_value=float(value),
+            ))
+            site.asset_count += count
+            site.total_value += float(value)
+        return list(sites.values())
+
+    @staticmethod
+    def get_tree(session: Session) -> List[SiteNode]:
+        tree = _tree_cache.get(_TREE_KEY)
+        if tree is None:
+            tree = HierarchyService._build(session)
+            _tree_cache.set(_TREE_KEY, tree)
+        return tree
+
+    @staticmethod
+    def clear_cache() -> None:
+        """For set-based writes that bypass the ORM (bulk update, import)"""
+        _tree_cache.clear()
+
+
+@event.listens_for(OrmSession, "after_flush")
+def _collect_hierarchy_changes(session, flush_context):
+    for obj in chain(session.new, session.deleted):
+        if isinstance(obj, (Asset, Location, Site)):
+            session.info[_PENDING_CLEAR] = True
+            return
+    for obj in session.dirty:
+        if isinstance(obj, (Location, Site)):
+            session.info[_PENDING_CLEAR] = True
+            return
+        if isinstance(obj, Asset):
+            attrs = inspect(obj).attrs
+            if any(attrs[field].history.has_changes() for field in _TREE_FIELDS):
+                session.info[_PENDING_CLEAR] = True
+                return
+
+
+@event.listens_for(OrmSession, "after_commit")
+def _apply_hierarchy_changes(session):
+    if session.info.pop(_PENDING_CLEAR, False):
+        _tree_cache.clear()
+
+
+@event.listens_for(OrmSession, "after_rollback")
+def _discard_hierarchy_changes(session):
+    session.info.pop(_PENDING_CLEAR, None)
@@ -0,0 +1,149 @@
+import hashlib
+import logging
+import multiprocessing
+import os
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Optional, Tuple
+from app.core.config import settings
+
+try:
+    from PIL import Image, ImageOps, features
+except ImportError:  # Pillow is optional: without it photos are stored as uploaded
+    Image = None
+
+# The UI never displays photos larger than this (longest edge, in pixels)
+PHOTO_MAX_EDGE = getattr(settings, "PHOTO_MAX_EDGE", 1600)
+PHOTO_QUALITY = getattr(settings, "PHOTO_QUALITY", 82)
+IMAGE_INGEST_WORKERS = getattr(settings, "IMAGE_INGEST_WORKERS", 2)
+# Seconds to wait for a worker before storing the upload as is
+IMAGE_INGEST_TIMEOUT = getattr(settings, "IMAGE_INGEST_TIMEOUT", 30)
+
+# Metadata dropped from the re-encoded image (location, device, ...)
+_METADATA_KEYS = ("exif", "xmp", "XML:com.adobe.xmp", "comment")
+
+logger = logging.getLogger(__name__)
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+@dataclass
+class NormalizedImage:
+    path: str
+    digest: str
+    size: int
+    extension: str
+
+
+def _normalize(source: str, target: str) -> Optional[Tuple[str, int, str]]:
+    """
+    Worker process: resize, re-encode and strip metadata into the existing
+    file `target`. Returns (sha256, size, extension) of the new content,
+    None to keep the upload as is.
+    """
+    if Image is None:
+        return None
+    webp = features.check("webp")
+    try:
+        with Image.open(source) as image:
+            if getattr(image, "is_animated", False):
+                return None
+            # JPEGs are decoded at a reduced scale when much larger than needed
+            image.draft("RGB", (PHOTO_MAX_EDGE, PHOTO_MAX_EDGE))
+            icc_profile = image.info.get("icc_profile")
+            image = ImageOps.exif_transpose(image)
+            image.thumbnail((PHOTO_MAX_EDGE, PHOTO_MAX_EDGE), Image.LANCZOS)
+            if image.mode not in ("RGB", "RGBA") or (not webp and image.mode == "RGBA"):
+                has_alpha = image.mode in ("LA", "PA") or "transparency" in image.info
+                image = image.convert("RGBA" if webp and has_alpha else "RGB")
+            for key in _METADATA_KEYS:
+                image.info.pop(key, None)
+
+            save_options = {"quality": PHOTO_QUALITY, "exif": b""}
+            if icc_profile:
+                save_options["icc_profile"] = icc_profile
+            # Never created here: a caller that gave up has removed it already
+            with open(target, "r+b") as out:
+                out.truncate()
+                if webp:
+                    image.save(out, format="WEBP", method=4, **save_options)
+                else:
+                    image.save(out, format="JPEG", optimize=True, progressive=True, **save_options)
+    except Exception as e:
+        logger.warning("Could not normalize %s: %s", source, e)
+        return None
+
+    digest = hashlib.sha256()
+    size = 0
+    with open(target, "rb") as f:
+        while chunk := f.read(1024 * 1024):
+            digest.update(chunk)
+            size += len(chunk)
+    return digest.hexdigest(), size, ".webp" if webp else ".jpg"
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # Spawned, not forked: the API process holds threads and DB connections
+            _executor = ProcessPoolExecutor(
+                max_workers=IMAGE_INGEST_WORKERS, mp_context=multiprocessing.get_context("spawn")
+            )
+        return _executor
+
+
+def _reset_executor() -> None:
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+
+class ImageIngestService:
+    """
+    Normalization of uploaded photos before they are stored.
+
+    Photos are decoded with their EXIF orientation applied, capped at
+    PHOTO_MAX_EDGE pixels, re-encoded as WebP (JPEG if Pillow lacks WebP) and
+    stripped of EXIF/XMP metadata. The work runs in a process pool so image
+    decoding does not hold the API workers' GIL.
+    """
+
+    @staticmethod
+    def scratch_path() -> str:
+        """Empty file in UPLOAD_DIR to normalize into; the caller removes it"""
+        fd, path = tempfile.mkstemp(dir=settings.UPLOAD_DIR, prefix=".ingest_")
+        os.close(fd)
+        return path
+
+    @staticmethod
+    def normalize(path: str, target: str) -> Optional[NormalizedImage]:
+        """
+        Write a normalized copy of the validated upload at `path` into
+        `target` (see scratch_path). None to store the upload as is: Pillow
+        missing, undecodable or animated image, or no worker answered in time.
+        A worker still running after a timeout cannot leave files behind: it
+        only writes to `target`, which the caller removes.
+        """
+        if Image is None:
+            return None
+        try:
+            future = _get_executor().submit(_normalize, path, target)
+            result = future.result(timeout=IMAGE_INGEST_TIMEOUT)
+        except FutureTimeoutError:
+            future.cancel()
+            logger.warning("Photo normalization timed out for %s; storing it as uploaded", path)
+            return None
+        except BrokenProcessPool:
+            logger.warning("Photo normalization pool crashed; storing %s as uploaded", path)
+            _reset_executor()
+            return None
+        if result is None:
+            return None
+        return NormalizedImage(target, *result)
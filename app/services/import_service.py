@@ -0,0 +1,190 @@
+import csv
+import io
+from collections import defaultdict
+from datetime import date
+from typing import Any, Dict, Iterator, List, Tuple
+from fastapi import HTTPException, UploadFile
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, select
+from app.models.asset import Asset
+from app.models.master_data import AssetSubCategory, FundingSource, LegalEntity, Location, Project
+from app.models.user import User
+from app.schemas.asset import AssetCreate, AssetImportError, AssetImportReport
+from app.services.scom_id_service import ScomIdService
+from app.services.read_model_service import AssetReadModelService
+from app.services.journal_service import AssetJournalService
+from app.services.count_service import CountService
+from app.services.hierarchy_service import HierarchyService
+
+# Rows validated, looked up and inserted together
+IMPORT_CHUNK_SIZE = 1000
+
+# Foreign keys checked per chunk with one IN query each, so a bad reference
+# fails its own row instead of the whole multi-row insert
+_REFERENCE_CHECKS = [
+    ("legal_entity_id", LegalEntity.legal_entity_id, "legal entity"),
+    ("location_id", Location.location_id, "location"),
+    ("project_id", Project.project_id, "project"),
+    ("funding_source_id", FundingSource.funding_source_id, "funding source"),
+    ("custodian_id", User.user_id, "custodian"),
+]
+
+
+class AssetImportService:
+    @staticmethod
+    def read_rows(file: UploadFile) -> Iterator[Dict[str, Any]]:
+        """Yield raw rows (header -> value) from a CSV or XLSX upload"""
+        name = (file.filename or "").lower()
+        if name.endswith(".xlsx"):
+            try:
+                from openpyxl import load_workbook
+            except ImportError:
+                raise HTTPException(status_code=400, detail="XLSX import is not available, please upload a CSV file")
+            workbook = load_workbook(file.file, read_only=True, data_only=True)
+            rows = workbook.active.iter_rows(values_only=True)
+            header = [str(h).strip() if h is not None else "" for h in next(rows, [])]
+            for values in rows:
+                yield dict(zip(header, values))
+            workbook.close()
+        elif name.endswith(".csv"):
+            reader = csv.DictReader(io.TextIOWrapper(file.file, encoding="utf-8-sig"))
+            for row in reader:
+                yield row
+        else:
+            raise HTTPException(status_code=400, detail="Unsupported file type, expected .csv or .xlsx")
+
+    @staticmethod
+    def _chunks(rows: Iterator[Dict[str, Any]]) -> Iterator[List[Tuple[int, Dict[str, Any]]]]:
+        chunk = []
+        # Row numbers are 1-based and count the header line, as in a spreadsheet
+        for row_number, row in enumerate(rows, start=2):
+            chunk.append((row_number, row))
+            if len(chunk) >= IMPORT_CHUNK_SIZE:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    @staticmethod
+    def _existing(session: Session, column, values) -> set:
+        values = {v for v in values if v}
+        if not values:
+            return set()
+        return set(session.exec(select(column).where(column.in_(values))).all())
+
+    @staticmethod
+    def _import_chunk(
+        session: Session,
+        chunk: List[Tuple[int, Dict[str, Any]]],
+        verified_by: str,
+        changed_by: str,
+        errors: List[AssetImportError],
+    ) -> int:
+        # 1. Validate
+        valid: List[Tuple[int, AssetCreate]] = []
+        for row_number, raw in chunk:
+            cleaned = {k.strip(): v for k, v in raw.items() if k and v not in (None, "")}
+            try:
+                valid.append((row_number, AssetCreate.model_validate(cleaned)))
+            except ValidationError as e:
+                errors.append(AssetImportError(row=row_number, error=str(e)))
+
+        # 2. Resolve category_id from the sub-category in one lookup
+        sub_ids = {a.sub_category_id for _, a in valid}
+        categories = dict(session.exec(
+            select(AssetSubCategory.sub_category_id, AssetSubCategory.category_id)
+            .where(AssetSubCategory.sub_category_id.in_(sub_ids))
+        ).all()) if sub_ids else {}
+
+        # 3. Check references and tag uniqueness (against the database and within the file)
+        existing_refs = {
+            field: AssetImportService._existing(session, column, (getattr(a, field) for _, a in valid))
+            for field, column, _ in _REFERENCE_CHECKS
+        }
+        taken_tags = AssetImportService._existing(
+            session, Asset.physical_asset_tag_number, (a.physical_asset_tag_number for _, a in valid)
+        )
+
+        accepted: List[Tuple[int, AssetCreate]] = []
+        for row_number, asset_in in valid:
+            problem = None
+            if asset_in.sub_category_id not in categories:
+                problem = f"Unknown sub-category '{asset_in.sub_category_id}'"
+            for field, _, label in _REFERENCE_CHECKS:
+                if not problem and getattr(asset_in, field) not in existing_refs[field]:
+                    problem = f"Unknown {label} '{getattr(asset_in, field)}'"
+            if not problem and asset_in.physical_asset_tag_number in taken_tags:
+                problem = f"Physical Asset Tag Number '{asset_in.physical_asset_tag_number}' already exists"
+            if problem:
+                errors.append(AssetImportError(row=row_number, error=problem))
+                continue
+            taken_tags.add(asset_in.physical_asset_tag_number)
+            if not asset_in.category_id:
+                asset_in.category_id = categories[asset_in.sub_category_id]
+            accepted.append((row_number, asset_in))
+
+        # 4. Reserve a block of SCOM IDs per (legal entity, location, project) group
+        groups: Dict[Tuple[str, str, str], List[Tuple[int, AssetCreate]]] = defaultdict(list)
+        for row_number, asset_in in accepted:
+            groups[(asset_in.legal_entity_id, asset_in.location_id, asset_in.project_id)].append((row_number, asset_in))
+
+        values = []
+        today = date.today()
+        for group, members in groups.items():
+            try:
+                scom_ids = ScomIdService.reserve_block(session, *group, count=len(members))
+            except ValueError as e:
+                errors.extend(AssetImportError(row=row_number, error=str(e)) for row_number, _ in members)
+                continue
+            for (row_number, asset_in), scom_id in zip(members, scom_ids):
+                asset = Asset.model_validate(asset_in, update={
+                    "scom_asset_id": scom_id,
+                    "last_physical_verification": verified_by,
+                    "date_of_last_physical_verification": today
+                })
+                values.append((row_number, asset.model_dump()))
+
+        if not values:
+            return 0
+
+        # 5. Multi-row insert, committed per chunk
+        try:
+            session.execute(insert(Asset), [v for _, v in values])
+            # Bulk INSERT bypasses the unit of work, so refresh the read model explicitly
+            AssetReadModelService.refresh_assets(session.connection(), [v["scom_asset_id"] for _, v in values])
+            AssetJournalService.record_created(session, [v for _, v in values], source="import", changed_by=changed_by)
+            CountService.adjust(session.connection(), Asset, len(values))
+            session.commit()
+            HierarchyService.clear_cache()
+        except IntegrityError as e:
+            session.rollback()
+            errors.extend(
+                AssetImportError(row=row_number, error=f"Database rejected the chunk: {e.orig}")
+                for row_number, _ in values
+            )
+            return 0
+        return len(values)
+
+    @staticmethod
+    def import_assets(session: Session, file: UploadFile, verified_by: str, changed_by: str) -> AssetImportReport:
+        """Import assets from a CSV/XLSX upload in chunks and report per-row errors at the end.
+
+        `verified_by` is the name written to last_physical_verification, `changed_by`
+        the importing user's ID recorded in the asset journal.
+        """
+        errors: List[AssetImportError] = []
+        total = 0
+        created = 0
+        for chunk in AssetImportService._chunks(AssetImportService.read_rows(file)):
+            total += len(chunk)
+            created += AssetImportService._import_chunk(session, chunk, verified_by, changed_by, errors)
+
+        errors.sort(key=lambda e: e.row)
+        return AssetImportReport(
+            total_rows=total,
+            created=created,
+            failed=total - created,
+            errors=errors
+        )
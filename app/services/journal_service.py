@@ -0,0 +1,267 @@
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import event, insert, inspect, literal, union_all
+from sqlalchemy.orm import Session as OrmSession
+from sqlmodel import Session, select
+from app.models.asset import Asset
+from app.models.asset_change import AssetChange, AssetChangeOperation
+
+# Bumped on every write, already covered by changed_at
+_NOT_JOURNALED = {"updated_at"}
+
+_JOURNAL_CONTEXT = "asset_journal_context"
+
+_JOURNALED_FIELDS = [c.key for c in Asset.__table__.columns if c.key not in _NOT_JOURNALED]
+
+# IDs per IN (...) lookup
+_ID_BATCH_SIZE = 1000
+
+
+def _encode(value: Any) -> Any:
+    return jsonable_encoder(value)
+
+
+def _snapshot(asset: Asset) -> Dict[str, Any]:
+    return {field: _encode(getattr(asset, field)) for field in _JOURNALED_FIELDS}
+
+
+def _as_naive_utc(value: datetime) -> datetime:
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+class AssetJournalService:
+    """
+    Append-only change journal of assets and point-in-time reconstruction.
+
+    ORM changes to assets are journaled automatically when the session flushes;
+    callers only tag them with `attribute()` (who and through which operation).
+    Set-based writes (bulk update, import) bypass the ORM and call
+    `record_updates` / `record_created` themselves.
+    """
+
+    @staticmethod
+    def attribute(session: Session, source: str, changed_by: Optional[str] = None, reference: Optional[str] = None) -> None:
+        """Attribute the asset changes flushed from now on in this session"""
+        session.info[_JOURNAL_CONTEXT] = {"source": source, "changed_by": changed_by, "reference": reference}
+
+    @staticmethod
+    def _context(session) -> Dict[str, Any]:
+        return session.info.get(_JOURNAL_CONTEXT) or {"source": "api", "changed_by": None, "reference": None}
+
+    @staticmethod
+    def record_updates(
+        session: Session,
+        old_rows: Iterable[Any],
+        values: Dict[str, Any],
+        source: str,
+        changed_by: Optional[str] = None,
+    ) -> None:
+        """
+        Journal a set-based UPDATE. `old_rows` are (scom_asset_id, <fields of values>...)
+        rows selected before the update, in `values` key order.
+        """
+        fields = [f for f in values if f not in _NOT_JOURNALED]
+        new_values = {f: _encode(values[f]) for f in fields}
+        now = datetime.utcnow()
+        entries = []
+        for row in old_rows:
+            old = dict(zip(values.keys(), row[1:]))
+            diff = {f: [_encode(old[f]), new_values[f]] for f in fields if _encode(old[f]) != new_values[f]}
+            if diff:
+                entries.append(dict(
+                    asset_id=row[0], changed_at=now, operation=AssetChangeOperation.UPDATE,
+                    source=source, changed_by=changed_by, diff=diff
+                ))
+        if entries:
+            session.execute(insert(AssetChange), entries)
+
+    @staticmethod
+    def record_created(session: Session, rows: Sequence[Dict[str, Any]], source: str, changed_by: Optional[str] = None) -> None:
+        """Journal assets inserted with a set-based INSERT (`rows` as inserted)"""
+        now = datetime.utcnow()
+        entries = [
+            dict(
+                asset_id=row["scom_asset_id"], changed_at=now, operation=AssetChangeOperation.CREATE,
+                source=source, changed_by=changed_by,
+                diff={f: [None, _encode(row.get(f))] for f in _JOURNALED_FIELDS if row.get(f) is not None}
+            )
+            for row in rows
+        ]
+        if entries:
+            session.execute(insert(AssetChange), entries)
+
+    @staticmethod
+    def history(session: Session, asset_id: str, skip: int = 0, limit: int = 100) -> List[AssetChange]:
+        return list(session.exec(
+            select(AssetChange)
+            .where(AssetChange.asset_id == asset_id)
+            .order_by(AssetChange.changed_at.desc(), AssetChange.id.desc())
+            .offset(skip).limit(limit)
+        ).all())
+
+    @staticmethod
+    def _rewind(state: Optional[Dict[str, Any]], changes: Iterable[AssetChange]) -> Optional[Dict[str, Any]]:
+        """Undo `changes` (newest first) on `state`; None means the asset did not exist"""
+        for change in changes:
+            if change.operation == AssetChangeOperation.CREATE:
+                state = None
+            elif change.operation == AssetChangeOperation.DELETE:
+                state = {field: old for field, (old, _) in change.diff.items()}
+            elif state is not None:
+                for field, (old, _) in change.diff.items():
+                    state[field] = old
+        return state
+
+    @staticmethod
+    def _changes_after(session: Session, at: datetime, asset_ids: Sequence[str]) -> Dict[str, List[AssetChange]]:
+        """Journal rows of `asset_ids` after `at`, newest first per asset"""
+        changes: Dict[str, List[AssetChange]] = {}
+        for i in range(0, len(asset_ids), _ID_BATCH_SIZE):
+            statement = (
+                select(AssetChange)
+                .where(AssetChange.changed_at > at, AssetChange.asset_id.in_(asset_ids[i:i + _ID_BATCH_SIZE]))
+                .order_by(AssetChange.changed_at.desc(), AssetChange.id.desc())
+            )
+            for change in session.exec(statement):
+                changes.setdefault(change.asset_id, []).append(change)
+        return changes
+
+    @staticmethod
+    def _current_states(session: Session, asset_ids: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        states = {}
+        for i in range(0, len(asset_ids), _ID_BATCH_SIZE):
+            for asset in session.exec(select(Asset).where(Asset.scom_asset_id.in_(asset_ids[i:i + _ID_BATCH_SIZE]))):
+                states[asset.scom_asset_id] = _snapshot(asset)
+        return states
+
+    @staticmethod
+    def asset_as_of(session: Session, asset_id: str, at: datetime) -> Optional[Dict[str, Any]]:
+        """
+        State of one asset at `at`: its current row with every journaled change
+        made after `at` undone. Only reads the journal rows after `at`.
+        """
+        at = _as_naive_utc(at)
+        asset = session.get(Asset, asset_id)
+        state = _snapshot(asset) if asset else None
+        changes = AssetJournalService._changes_after(session, at, [asset_id]).get(asset_id, [])
+        return AssetJournalService._rewind(state, changes)
+
+    @staticmethod
+    def register_as_of(
+        session: Session,
+        at: datetime,
+        location_id: Optional[str] = None,
+        custodian_id: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 100,
+    ) -> List[Dict[str, Any]]:
+        """
+        One page of the asset register as it was at `at`, ordered by SCOM ID.
+
+        Assets unchanged since `at` are filtered and ordered in SQL on their
+        current row. Assets changed since (deleted ones included) are merged
+        into the same ordered ID stream and only those reaching the page are
+        rewound, each from its own journal rows. A page costs the rows before
+        it plus the assets changed since `at`, never a scan of the register.
+        """
+        at = _as_naive_utc(at)
+        changed_since = select(AssetChange.asset_id).where(AssetChange.changed_at > at)
+        unchanged = select(Asset.scom_asset_id.label("asset_id"), literal(False).label("changed")).where(
+            Asset.scom_asset_id.not_in(changed_since)
+        )
+        if location_id:
+            unchanged = unchanged.where(Asset.location_id == location_id)
+        if custodian_id:
+            unchanged = unchanged.where(Asset.custodian_id == custodian_id)
+        changed = select(AssetChange.asset_id.label("asset_id"), literal(True).label("changed")).where(
+            AssetChange.changed_at > at
+        ).distinct()
+        candidates = union_all(unchanged, changed).subquery()
+
+        def matches(state: Optional[Dict[str, Any]]) -> bool:
+            return state is not None \
+                and (not location_id or state["location_id"] == location_id) \
+                and (not custodian_id or state["custodian_id"] == custodian_id)
+
+        chunk_size = min(_ID_BATCH_SIZE, max(100, 2 * limit))
+        page: List[tuple] = []  # (asset_id, rewound state or None if unchanged)
+        to_skip = skip
+        last_id = None
+        while len(page) < limit:
+            statement = select(candidates.c.asset_id, candidates.c.changed)
+            if last_id is not None:
+                statement = statement.where(candidates.c.asset_id > last_id)
+            rows = session.exec(statement.order_by(candidates.c.asset_id).limit(chunk_size)).all()
+            if not rows:
+                break
+            last_id = rows[-1][0]
+
+            # Changed assets may have matched the filters (or existed) differently at `at`
+            changed_ids = [asset_id for asset_id, is_changed in rows if is_changed]
+            rewound = {}
+            if changed_ids:
+                current = AssetJournalService._current_states(session, changed_ids)
+                changes = AssetJournalService._changes_after(session, at, changed_ids)
+                rewound = {
+                    asset_id: AssetJournalService._rewind(current.get(asset_id), changes.get(asset_id, []))
+                    for asset_id in changed_ids
+                }
+            for asset_id, is_changed in rows:
+                if is_changed and not matches(rewound[asset_id]):
+                    continue
+                if to_skip:
+                    to_skip -= 1
+                    continue
+                page.append((asset_id, rewound.get(asset_id)))
+                if len(page) == limit:
+                    break
+
+        # Unchanged assets are only loaded once they are known to be on the page
+        current = AssetJournalService._current_states(session, [asset_id for asset_id, state in page if state is None])
+        states = (state if state is not None else current.get(asset_id) for asset_id, state in page)
+        return [state for state in states if state is not None]
+
+
+@event.listens_for(OrmSession, "before_flush")
+def _journal_asset_changes(session, flush_context, instances):
+    context = AssetJournalService._context(session)
+    entries = []
+    for obj in session.new:
+        if isinstance(obj, Asset):
+            diff = {f: [None, v] for f, v in _snapshot(obj).items() if v is not None}
+            entries.append((obj, AssetChangeOperation.CREATE, diff))
+    for obj in session.deleted:
+        if isinstance(obj, Asset):
+            diff = {f: [v, None] for f, v in _snapshot(obj).items()}
+            entries.append((obj, AssetChangeOperation.DELETE, diff))
+    for obj in session.dirty:
+        if not isinstance(obj, Asset) or not session.is_modified(obj, include_collections=False):
+            continue
+        attrs = inspect(obj).attrs
+        diff = {}
+        for field in _JOURNALED_FIELDS:
+            history = attrs[field].history
+            if not history.has_changes():
+                continue
+            old = _encode(history.deleted[0]) if history.deleted else None
+            new = _encode(history.added[0]) if history.added else None
+            if old != new:
+                diff[field] = [old, new]
+        if diff:
+            entries.append((obj, AssetChangeOperation.UPDATE, diff))
+
+    for obj, operation, diff in entries:
+        session.add(AssetChange(asset_id=obj.scom_asset_id, operation=operation, diff=diff, **context))
+
+
+def _load_old_value(target, value, oldvalue, initiator):
+    return value
+
+
+# Load the previous value on assignment, so the journal always sees what was overwritten
+# (by default SQLAlchemy does not load an expired attribute just to replace it)
+for _field in _JOURNALED_FIELDS:
+    event.listen(getattr(Asset, _field), "set", _load_old_value, active_history=True, retval=True)
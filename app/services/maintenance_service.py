@@ -4,6 +4,8 @@ from sqlmodel import Session, select
 from fastapi import HTTPException
 from app.models.operations import Maintenance
 from app.schemas.operations import MaintenanceCreate, MaintenanceUpdate
+from app.core.sparse_fields import fields_statement, resolve_fields
+from app.services.count_service import CountService
 
 class MaintenanceService:
     @staticmethod
@@ -45,6 +47,30 @@ class MaintenanceService:
         
         return session.exec(query).all()
     
+    @staticmethod
+    def count_maintenance(session: Session, asset_id: str = None) -> tuple[int, bool]:
+        """Total for list_maintenance (for X-Total-Count); returns (count, estimated)"""
+        if asset_id:
+            return CountService.count(session, select(Maintenance.maintenance_id).where(Maintenance.asset_id == asset_id))
+        return CountService.total(session, Maintenance), False
+    
+    @staticmethod
+    def list_maintenance_fields(session: Session, fields: str, skip: int = 0, limit: int = 100, asset_id: str = None) -> list:
+        """
+        Sparse variant of list_maintenance: selects only the requested columns
+        (e.g. "maintenanceId,date") and returns rows as dicts keyed by alias,
+        ready to be returned as JSON without MaintenanceRead validation.
+        """
+        resolved = resolve_fields(Maintenance, fields)
+        query = fields_statement(Maintenance, resolved)
+        
+        if asset_id:
+            query = query.where(Maintenance.asset_id == asset_id)
+        
+        query = query.order_by(Maintenance.date_of_maintenance.desc()).offset(skip).limit(limit)
+        
+        return [{key: getattr(row, attr) for key, attr in resolved} for row in session.exec(query).all()]
+    
     @staticmethod
     def get_maintenance(session: Session, maintenance_id: str) -> Maintenance:
         """Get single maintenance record"""
@@ -0,0 +1,184 @@
+import mimetypes
+import os
+import re
+from dataclasses import dataclass
+from typing import Iterator, List, Optional, Tuple
+from fastapi import HTTPException
+from app.core.config import settings
+from app.core.storage import PRESIGNED_URL_EXPIRES, get_storage
+from app.core.uploads import upload_path
+
+# Content-addressed files (ab/cd/<sha256><ext>) and their thumbnails never change
+# under the same name, so their URLs can be cached forever
+_CONTENT_ADDRESSED = re.compile(r"^([0-9a-f]{64}(?:_thumb)?)\.[A-Za-z0-9]+$")
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# Files stored before content addressing may still be replaced: revalidate
+MUTABLE_CACHE_CONTROL = "public, max-age=3600, must-revalidate"
+
+# Accept-Encoding token -> suffix of a precompressed sibling file (preference order)
+_PRECOMPRESSED = [("br", ".br"), ("gzip", ".gz")]
+
+MEDIA_CHUNK_SIZE = 256 * 1024
+
+# Hand the bytes to the front proxy: "X-Accel-Redirect" (nginx) or "X-Sendfile"
+# (Apache/lighttpd) with the internal location prefix the proxy maps to UPLOAD_DIR
+# (the stored name, shard directories included, is appended to it)
+MEDIA_OFFLOAD_HEADER: Optional[str] = getattr(settings, "MEDIA_OFFLOAD_HEADER", None)
+MEDIA_OFFLOAD_PREFIX: str = getattr(settings, "MEDIA_OFFLOAD_PREFIX", "/protected-media/")
+
+
+@dataclass
+class MediaFile:
+    filename: str
+    path: str  # on disk; a precompressed sibling of the stored file if content_encoding is set
+    size: int
+    etag: str
+    content_type: str
+    immutable: bool
+    content_encoding: Optional[str] = None
+
+    @property
+    def cache_control(self) -> str:
+        return IMMUTABLE_CACHE_CONTROL if self.immutable else MUTABLE_CACHE_CONTROL
+
+
+class MediaService:
+    """Resolution, validators and byte ranges for files served from UPLOAD_DIR"""
+
+    @staticmethod
+    def url(filename: str) -> str:
+        return f"/media/{filename}"
+
+    @staticmethod
+    def _name_parts(filename: str) -> List[str]:
+        """
+        Raises:
+            HTTPException(404) for names that are not stored names (or escape UPLOAD_DIR)
+        """
+        # Flat legacy names or ab/cd/<name>; no hidden (temporary) files
+        parts = filename.split("/") if filename else []
+        if not 1 <= len(parts) <= 3 or any(not part or part.startswith(".") or "\\" in part for part in parts):
+            raise HTTPException(status_code=404, detail="File not found")
+        return parts
+
+    @staticmethod
+    def presigned_redirect(filename: str) -> Optional[Tuple[str, str]]:
+        """
+        (presigned URL, Cache-Control) when the storage backend serves
+        downloads itself, None when the API serves the file.
+
+        Raises:
+            HTTPException(404) for invalid names, or unknown files that are not content-addressed
+        """
+        parts = MediaService._name_parts(filename)
+        storage = get_storage()
+        url = storage.presigned_url(filename)
+        if url is None:
+            return None
+        if not _CONTENT_ADDRESSED.match(parts[-1]):
+            # Signing is local and succeeds for any name: check older files exist
+            # (guessing a content-addressed name means knowing the content)
+            if not storage.exists(filename):
+                raise HTTPException(status_code=404, detail="File not found")
+            # They may be replaced under the same name: ask again every time
+            return url, "no-cache"
+        # Clients may reuse the redirect while the signature is still valid
+        return url, f"private, max-age={PRESIGNED_URL_EXPIRES // 2}"
+
+    @staticmethod
+    def resolve(filename: str, accept_encoding: str = "") -> MediaFile:
+        """
+        Locate an uploaded file on the local disk, preferring a precompressed
+        variant the client accepts.
+
+        Raises:
+            HTTPException(404) for unknown files or names escaping UPLOAD_DIR
+        """
+        parts = MediaService._name_parts(filename)
+        path = upload_path(filename)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            raise HTTPException(status_code=404, detail="File not found")
+
+        match = _CONTENT_ADDRESSED.match(parts[-1])
+        # Strong validators: the content hash, or size and mtime for older files
+        etag = f'"{match.group(1)}"' if match else f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+        media = MediaFile(
+            filename=filename,
+            path=path,
+            size=stat.st_size,
+            etag=etag,
+            content_type=mimetypes.guess_type(parts[-1])[0] or "application/octet-stream",
+            immutable=match is not None,
+        )
+
+        accepted = {token.split(";")[0].strip() for token in accept_encoding.split(",")}
+        for encoding, suffix in _PRECOMPRESSED:
+            if encoding in accepted and os.path.exists(path + suffix):
+                media.path = path + suffix
+                media.size = os.path.getsize(media.path)
+                media.etag = f'{etag[:-1]}-{encoding}"'
+                media.content_encoding = encoding
+                break
+        return media
+
+    @staticmethod
+    def offload_path(media: MediaFile) -> str:
+        """Internal location for the front proxy: MEDIA_OFFLOAD_PREFIX + stored name (+ .br/.gz)"""
+        relative = os.path.relpath(media.path, settings.UPLOAD_DIR).replace(os.sep, "/")
+        return MEDIA_OFFLOAD_PREFIX + relative
+
+    @staticmethod
+    def etag_matches(header: Optional[str], etag: str) -> bool:
+        if not header:
+            return False
+        if header.strip() == "*":
+            return True
+        return etag in (tag.strip() for tag in header.split(","))
+
+    @staticmethod
+    def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+        """
+        Single byte range from a Range header as inclusive (start, end).
+        None means serve the whole file (no header, or several ranges).
+
+        Raises:
+            HTTPException(416) if the range cannot be satisfied
+        """
+        if not header or not header.startswith("bytes="):
+            return None
+        ranges: List[str] = header[len("bytes="):].split(",")
+        if len(ranges) != 1:
+            return None
+        start_text, _, end_text = ranges[0].strip().partition("-")
+        try:
+            if start_text:
+                start = int(start_text)
+                end = int(end_text) if end_text else size - 1
+            else:
+                # Suffix range: the last N bytes
+                start = max(size - int(end_text), 0)
+                end = size - 1
+        except ValueError:
+            return None
+        end = min(end, size - 1)
+        if start > end or start >= size:
+            raise HTTPException(
+                status_code=416, detail="Range not satisfiable", headers={"Content-Range": f"bytes */{size}"}
+            )
+        return start, end
+
+    @staticmethod
+    def iter_file(path: str, start: int, end: int) -> Iterator[bytes]:
+        """Bytes start..end (inclusive); a sync generator, so it is read in the threadpool"""
+        with open(path, "rb") as f:
+            f.seek(start)
+            remaining = end - start + 1
+            while remaining > 0:
+                chunk = f.read(min(MEDIA_CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
@@ -1,7 +1,5 @@
-import os
-import shutil
 import uuid
-from typing import List
+from typing import List, Optional
 from datetime import datetime
 from fastapi import UploadFile, HTTPException
 from sqlmodel import Session, select
@@ -12,24 +10,17 @@ from app.services.pdf_service import PDFService
 from app.models.user import User
 from app.models.master_data import Location
 from app.schemas.operations import DisposalCreate, TransferCreate
-from app.core.config import settings
 from app.core.rbac import RoleChecker
+from app.core.uploads import DOCUMENT_UPLOAD
+from app.services.journal_service import AssetJournalService
+from app.services.blob_service import BlobService
 
 class OperationService:
     @staticmethod
     def create_disposal(session: Session, disposal_in: DisposalCreate, file: UploadFile, user_id: str) -> List[Disposal]:
-        # Save document ONCE
-        file_ext = os.path.splitext(file.filename)[1]
-        if not file_ext:
-            file_ext = ".pdf"
-            
-        unique_id = uuid.uuid4().hex
-        filename = f"disposal_{unique_id}{file_ext}"
-        file_path = os.path.join(settings.UPLOAD_DIR, filename)
-        
-        os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        # Save document ONCE, shared by every disposal of the batch
+        # (and with identical documents attached to earlier batches)
+        filename = BlobService.store(session, file.file, DOCUMENT_UPLOAD, references=len(disposal_in.asset_ids))
             
         created_disposals = []
         for asset_id in disposal_in.asset_ids:
@@ -52,10 +43,12 @@ class OperationService:
         return created_disposals
 
     @staticmethod
-    def approve_disposal(session: Session, disposal_id: str, approved: bool) -> Disposal:
+    def approve_disposal(session: Session, disposal_id: str, approved: bool, approved_by: Optional[str] = None) -> Disposal:
+        """`approved_by` is the deciding user's ID (current_user.user_id), recorded in the asset journal"""
         disposal = session.get(Disposal, disposal_id)
         if not disposal:
             raise HTTPException(status_code=404, detail="Disposal not found")
+        AssetJournalService.attribute(session, "disposal", approved_by, reference=disposal_id)
             
         if approved:
             disposal.status = DisposalStatus.APPROVED
@@ -66,6 +59,7 @@ class OperationService:
                 session.add(asset)
         else:
             disposal.status = DisposalStatus.REJECTED
+        disposal.decided_at = datetime.utcnow()
             
         session.add(disposal)
         session.commit()
@@ -101,7 +95,15 @@ class OperationService:
         return created_transfers
 
     @staticmethod
-    def approve_transfer(session: Session, transfer_id: str, approved: bool, user_roles: List[str], approver_name: str):
+    def approve_transfer(
+        session: Session,
+        transfer_id: str,
+        approved: bool,
+        user_roles: List[str],
+        approver_name: str,
+        approver_id: Optional[str] = None,
+    ):
+        """`approver_id` is the deciding user's ID (current_user.user_id), recorded in the asset journal"""
         # Use centralized RoleChecker for multi-role support
         # Only Supply Chain Managers or IT Admins can approve transfers
         if not RoleChecker.has_any_role(user_roles, [UserRole.SUPPLY_CHAIN_MANAGER, UserRole.IT_ADMIN]):
@@ -110,6 +112,7 @@ class OperationService:
         transfer = session.get(Transfer, transfer_id)
         if not transfer:
             raise HTTPException(status_code=404, detail="Transfer not found")
+        AssetJournalService.attribute(session, "transfer", approver_id, reference=transfer_id)
             
         pdf_path = None
         
@@ -8,6 +8,11 @@ from app.core.config import settings
 from app.models.operations import Transfer
 from app.models.asset import Asset
 
+# Generated PDFs are temporary files with these prefixes (removed by app.commands.gc_uploads)
+TRANSFER_PDF_PREFIX = "transfer_"
+ASSET_HOLDER_PDF_PREFIX = "asset_holder_"
+TEMP_PDF_PREFIXES = (TRANSFER_PDF_PREFIX, ASSET_HOLDER_PDF_PREFIX)
+
 class PDFService:
     @staticmethod
     def generate_transfer_pdf(transfer: Transfer, asset: Asset, initiator_name: str, 
@@ -16,7 +21,7 @@ class PDFService:
         
         import tempfile
         # Use temp file - not stored permanently
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".pdf", prefix="transfer_")
+        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".pdf", prefix=TRANSFER_PDF_PREFIX)
         file_path = temp_file.name
         temp_file.close()
         
@@ -177,7 +182,7 @@ class PDFService:
         
         import tempfile
         # Use temp file - not stored permanently
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".pdf", prefix="asset_holder_")
+        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".pdf", prefix=ASSET_HOLDER_PDF_PREFIX)
         file_path = temp_file.name
         temp_file.close()
         
@@ -1,48 +1,111 @@
 import os
-import shutil
-import uuid
-from typing import List
-from fastapi import UploadFile
+from typing import Dict, List, Optional
+from fastapi import HTTPException, UploadFile
+from sqlalchemy import func
 from sqlmodel import Session, select
+from app.core.uploads import PHOTO_UPLOAD, UploadWriter
 from app.models.asset_photo import AssetPhoto
 from app.models.asset import Asset
-from app.core.config import settings
+from app.schemas.asset_photo import AssetPhotoRead
+from app.services.blob_service import BlobService
+from app.services.image_ingest_service import ImageIngestService
+from app.services.media_service import MediaService
+from app.services.thumbnail_service import ThumbnailService
+
+# Photos kept per asset
+MAX_PHOTOS_PER_ASSET = 3
 
 class PhotoService:
+    @staticmethod
+    def photo_count(session: Session, asset_id: str) -> int:
+        return session.exec(select(func.count()).select_from(AssetPhoto).where(AssetPhoto.asset_id == asset_id)).one()
+
     @staticmethod
     def save_photo(session: Session, asset_id: str, file: UploadFile) -> AssetPhoto:
-        # Check current photo count
-        statement = select(AssetPhoto).where(AssetPhoto.asset_id == asset_id)
-        existing_photos = session.exec(statement).all()
-        
-        if len(existing_photos) >= 3:
+        # Save file (type-checked, size-capped and normalized), shared with any identical upload
+        writer = UploadWriter(PHOTO_UPLOAD)
+        try:
+            writer.copy_from(file.file)
+            writer.finish()
+            return PhotoService.save_photo_upload(session, asset_id, writer)
+        finally:
+            writer.discard()
+
+    @staticmethod
+    def save_photo_upload(session: Session, asset_id: str, writer: UploadWriter) -> AssetPhoto:
+        """save_photo for a request body already streamed into an UploadWriter"""
+        # Checked before normalizing, so rejected uploads do not cost a decode and re-encode
+        if not session.get(Asset, asset_id):
+            raise HTTPException(status_code=404, detail="Asset not found")
+        existing_count = PhotoService.photo_count(session, asset_id)
+        if existing_count >= MAX_PHOTOS_PER_ASSET:
             return None # Or raise exception, but letting the caller handle it for unified flow
-            
-        # Generate filename
-        file_ext = os.path.splitext(file.filename)[1]
-        if not file_ext:
-            file_ext = ".jpg"
-            
-        unique_id = uuid.uuid4().hex
-        filename = f"{asset_id}_{unique_id}{file_ext}"
-        file_path = os.path.join(settings.UPLOAD_DIR, filename)
-        
-        # Save file
-        os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-            
-        # Determine if this should be the profile picture
-        is_profile = len(existing_photos) == 0
-        
+
+        target = ImageIngestService.scratch_path()
+        try:
+            normalized = ImageIngestService.normalize(writer.path, target)
+
+            # Stored resized, re-encoded and without EXIF (as uploaded if that failed)
+            if normalized is None:
+                filename = BlobService.store_upload(session, writer)
+            else:
+                filename = BlobService.add_file(
+                    session, normalized.path, normalized.digest, normalized.size, normalized.extension
+                )
+        finally:
+            if os.path.exists(target):
+                os.remove(target)
+        return PhotoService._add_photo(session, asset_id, filename, is_profile=existing_count == 0)
+
+    @staticmethod
+    def _add_photo(session: Session, asset_id: str, filename: str, is_profile: bool) -> AssetPhoto:
+        # Same content uploaded before: its thumbnail can be reused
+        thumb_filename = session.exec(
+            select(AssetPhoto.thumb_filename)
+            .where(AssetPhoto.filename == filename, AssetPhoto.thumb_filename.is_not(None))
+        ).first()
+
         db_photo = AssetPhoto(
             asset_id=asset_id,
             filename=filename,
-            is_profile=is_profile
+            is_profile=is_profile,
+            thumb_filename=thumb_filename
         )
         session.add(db_photo)
+        if not thumb_filename:
+            ThumbnailService.request(session, filename)
         return db_photo
 
+    @staticmethod
+    def get_photos_for_assets(session: Session, asset_ids: List[str]) -> Dict[str, List[AssetPhoto]]:
+        """Photos of many assets from a single IN query, profile photo first; every asset gets a list"""
+        photos: Dict[str, List[AssetPhoto]] = {asset_id: [] for asset_id in asset_ids}
+        statement = (
+            select(AssetPhoto)
+            .where(AssetPhoto.asset_id.in_(list(photos)))
+            .order_by(AssetPhoto.asset_id, AssetPhoto.is_profile.desc(), AssetPhoto.id)
+        )
+        for photo in session.exec(statement).all():
+            photos[photo.asset_id].append(photo)
+        return photos
+
+    @staticmethod
+    def to_read(photo: AssetPhoto) -> AssetPhotoRead:
+        return AssetPhotoRead(
+            id=photo.id,
+            asset_id=photo.asset_id,
+            filename=photo.filename,
+            is_profile=photo.is_profile,
+            created_at=photo.created_at,
+            url=PhotoService.get_photo_url(photo.filename),
+            thumb_url=PhotoService.get_thumb_url(photo.filename, photo.thumb_filename)
+        )
+
     @staticmethod
     def get_photo_url(filename: str) -> str:
-        return f"/static/{filename}"
+        return MediaService.url(filename)
+
+    @staticmethod
+    def get_thumb_url(filename: str, thumb_filename: Optional[str]) -> str:
+        """Thumbnail URL, or the full image while the thumbnail is not generated yet"""
+        return PhotoService.get_photo_url(thumb_filename or filename)
@@ -0,0 +1,163 @@
+from datetime import datetime
+from typing import Iterable, List
+from sqlalchemy import delete, event, exists, func, insert, inspect, literal, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session as OrmSession
+from app.models.asset import Asset
+from app.models.asset_photo import AssetPhoto
+from app.models.asset_read_model import AssetReadModel
+from app.models.master_data import Location, Site
+
+# Keeps IN lists well below driver parameter limits
+REFRESH_BATCH_SIZE = 500
+
+_READ_MODEL_COLUMNS = [
+    "scom_asset_id",
+    "location_id",
+    "location_code",
+    "location_name",
+    "location_name_code",
+    "site_id",
+    "site_code",
+    "site_name",
+    "photo_count",
+    "profile_photo_filename",
+    "profile_thumb_filename",
+    "refreshed_at",
+]
+
+
+def _source_select(condition):
+    """Compute read-model rows for the assets matching `condition` (over Asset/Location/Site)"""
+    photo_count = (
+        select(func.count(AssetPhoto.id))
+        .where(AssetPhoto.asset_id == Asset.scom_asset_id)
+        .scalar_subquery()
+    )
+    # Profile photo, otherwise the first one uploaded
+    def profile_photo(column):
+        return (
+            select(column)
+            .where(AssetPhoto.asset_id == Asset.scom_asset_id)
+            .order_by(AssetPhoto.is_profile.desc(), AssetPhoto.id)
+            .limit(1)
+            .scalar_subquery()
+        )
+
+    return (
+        select(
+            Asset.scom_asset_id,
+            Location.location_id,
+            Location.location_code,
+            Location.location_name,
+            Location.location_name_code,
+            Site.site_id,
+            Site.site_code,
+            Site.site_name,
+            photo_count,
+            profile_photo(AssetPhoto.filename),
+            profile_photo(AssetPhoto.thumb_filename),
+            literal(datetime.utcnow()),
+        )
+        .select_from(Asset)
+        .outerjoin(Location, Asset.location_id == Location.location_id)
+        .outerjoin(Site, Location.site_id == Site.site_id)
+        .where(condition)
+    )
+
+
+def _batches(values: Iterable[str]) -> Iterable[List[str]]:
+    values = list(values)
+    for i in range(0, len(values), REFRESH_BATCH_SIZE):
+        yield values[i:i + REFRESH_BATCH_SIZE]
+
+
+class AssetReadModelService:
+    """
+    Maintains the AssetReadModel table.
+
+    ORM writes are picked up automatically by the after_flush listener below
+    and refreshed inside the same transaction. Set-based writes that bypass
+    the ORM unit of work (bulk INSERT/UPDATE/DELETE statements) must call
+    refresh_assets / remove_assets themselves.
+    """
+
+    @staticmethod
+    def _refresh_where(conn: Connection, condition) -> None:
+        # Upsert rather than delete + insert: two transactions refreshing the
+        # same asset would otherwise both insert and one would hit the primary key
+        dialect = {"postgresql": postgresql, "sqlite": sqlite}[conn.dialect.name]
+        stmt = dialect.insert(AssetReadModel).from_select(_READ_MODEL_COLUMNS, _source_select(condition))
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[AssetReadModel.scom_asset_id],
+            set_={name: stmt.excluded[name] for name in _READ_MODEL_COLUMNS if name != "scom_asset_id"},
+        )
+        conn.execute(stmt)
+
+    @staticmethod
+    def refresh_assets(conn: Connection, asset_ids: Iterable[str]) -> None:
+        """Recompute the read-model rows of the given assets"""
+        for batch in _batches(set(asset_ids)):
+            AssetReadModelService._refresh_where(conn, Asset.scom_asset_id.in_(batch))
+
+    @staticmethod
+    def refresh_locations(conn: Connection, location_ids: Iterable[str]) -> None:
+        """Recompute the rows of every asset at the given locations (location renamed/moved)"""
+        for batch in _batches(set(location_ids)):
+            AssetReadModelService._refresh_where(conn, Asset.location_id.in_(batch))
+
+    @staticmethod
+    def refresh_sites(conn: Connection, site_ids: Iterable[str]) -> None:
+        """Recompute the rows of every asset at a location of the given sites"""
+        for batch in _batches(set(site_ids)):
+            AssetReadModelService._refresh_where(conn, Location.site_id.in_(batch))
+
+    @staticmethod
+    def remove_assets(conn: Connection, asset_ids: Iterable[str]) -> None:
+        for batch in _batches(set(asset_ids)):
+            conn.execute(delete(AssetReadModel).where(AssetReadModel.scom_asset_id.in_(batch)))
+
+    @staticmethod
+    def backfill(engine: Engine) -> None:
+        """Create the missing rows, e.g. for assets that existed before the read model (run at startup)"""
+        missing = ~exists().where(AssetReadModel.scom_asset_id == Asset.scom_asset_id)
+        with engine.begin() as conn:
+            conn.execute(insert(AssetReadModel).from_select(_READ_MODEL_COLUMNS, _source_select(missing)))
+
+
+@event.listens_for(OrmSession, "after_flush")
+def _refresh_read_model(session, flush_context):
+    """Refresh the read model for everything the flush touched, in the same transaction"""
+    asset_ids, deleted_asset_ids, location_ids, site_ids = set(), set(), set(), set()
+
+    # new/dirty/deleted still describe the pre-flush state here
+    for obj in list(session.new) + list(session.dirty):
+        if isinstance(obj, Asset):
+            asset_ids.add(obj.scom_asset_id)
+        elif isinstance(obj, AssetPhoto):
+            asset_ids.add(obj.asset_id)
+            # A photo moved to another asset also changes the one it left
+            asset_ids.update(v for v in inspect(obj).attrs.asset_id.history.deleted if v)
+        elif isinstance(obj, Location):
+            location_ids.add(obj.location_id)
+        elif isinstance(obj, Site):
+            site_ids.add(obj.site_id)
+    for obj in session.deleted:
+        if isinstance(obj, Asset):
+            deleted_asset_ids.add(obj.scom_asset_id)
+        elif isinstance(obj, AssetPhoto):
+            asset_ids.add(obj.asset_id)
+
+    if not (asset_ids or deleted_asset_ids or location_ids or site_ids):
+        return
+
+    conn = session.connection()
+    if deleted_asset_ids:
+        AssetReadModelService.remove_assets(conn, deleted_asset_ids)
+    if asset_ids - deleted_asset_ids:
+        AssetReadModelService.refresh_assets(conn, asset_ids - deleted_asset_ids)
+    if location_ids:
+        AssetReadModelService.refresh_locations(conn, location_ids)
+    if site_ids:
+        AssetReadModelService.refresh_sites(conn, site_ids)
@@ -0,0 +1,96 @@
+from itertools import chain
+from typing import Optional
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session as OrmSession
+from sqlmodel import Session, select
+from app.core.cache import LRUCache
+from app.models.asset import Asset
+from app.models.asset_read_model import AssetReadModel
+from app.models.master_data import Location
+from app.models.user import User
+from app.schemas.asset import AssetScanRead
+
+# Tag number -> AssetScanRead. The TTL bounds staleness across worker processes.
+_tag_cache = LRUCache(maxsize=4096, ttl=300)
+
+_PENDING_TAGS = "scan_cache_pending_tags"
+_PENDING_CLEAR = "scan_cache_pending_clear"
+
+
+class ScanService:
+    """
+    Tag-number lookups for handheld scanners.
+
+    Cached entries are invalidated when a change to the asset (update_asset,
+    transfers, verifications, deletes...) or to a custodian/location name is
+    committed. See the session listeners below.
+    """
+
+    @staticmethod
+    def lookup_by_tag(session: Session, tag_number: str) -> Optional[AssetScanRead]:
+        """Slim scanner payload for a physical tag number, from one indexed query"""
+        cached = _tag_cache.get(tag_number)
+        if cached is not None:
+            return cached
+
+        row = session.exec(
+            select(
+                Asset.scom_asset_id,
+                Asset.asset_name,
+                Asset.asset_status,
+                AssetReadModel.location_code,
+                User.full_name,
+            )
+            .outerjoin(AssetReadModel, AssetReadModel.scom_asset_id == Asset.scom_asset_id)
+            .outerjoin(User, User.user_id == Asset.custodian_id)
+            .where(Asset.physical_asset_tag_number == tag_number)
+        ).first()
+        if not row:
+            return None  # misses are not cached, the tag may be registered any moment
+
+        result = AssetScanRead(
+            scom_asset_id=row[0],
+            asset_name=row[1],
+            asset_status=row[2],
+            location_code=row[3],
+            custodian_name=row[4]
+        )
+        _tag_cache.set(tag_number, result)
+        return result
+
+    @staticmethod
+    def invalidate_tag(tag_number: str) -> None:
+        _tag_cache.invalidate(tag_number)
+
+    @staticmethod
+    def clear_cache() -> None:
+        """For set-based writes that bypass the ORM (bulk update, archiving)"""
+        _tag_cache.clear()
+
+
+@event.listens_for(OrmSession, "after_flush")
+def _collect_scan_cache_changes(session, flush_context):
+    # Only remembered here; the cache is invalidated once the transaction commits,
+    # so a concurrent read cannot re-cache the pre-commit state
+    tags = session.info.setdefault(_PENDING_TAGS, set())
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, Asset):
+            tags.add(obj.physical_asset_tag_number)
+            # Old tag number when it was changed
+            tags.update(inspect(obj).attrs.physical_asset_tag_number.history.deleted or ())
+        elif isinstance(obj, (User, Location)):
+            session.info[_PENDING_CLEAR] = True
+
+
+@event.listens_for(OrmSession, "after_commit")
+def _apply_scan_cache_changes(session):
+    if session.info.pop(_PENDING_CLEAR, False):
+        _tag_cache.clear()
+    for tag in session.info.pop(_PENDING_TAGS, ()):
+        _tag_cache.invalidate(tag)
+
+
+@event.listens_for(OrmSession, "after_rollback")
+def _discard_scan_cache_changes(session):
+    session.info.pop(_PENDING_CLEAR, None)
+    session.info.pop(_PENDING_TAGS, None)
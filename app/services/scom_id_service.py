@@ -0,0 +1,112 @@
+from typing import List, Optional
+from sqlalchemy import func, update
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, select
+from app.models.asset import Asset, ScomIdCounter
+from app.models.master_data import LegalEntity, Location, Project
+
+# Width of the zero-padded sequence number at the end of a SCOM ID
+SCOM_ID_DIGITS = 5
+
+
+class ScomIdService:
+    """
+    SCOM ID allocation from a per-prefix counter table.
+
+    The counter row is bumped with a single UPDATE ... RETURNING in its own
+    short transaction, so the row lock is held for one statement instead of
+    the whole request, concurrent callers never receive the same number and
+    a block of N IDs costs the same as one. Numbers taken by a request that
+    later rolls back are skipped (like a database sequence), never reused.
+    """
+
+    @staticmethod
+    def build_prefix(session: Session, legal_entity_id: str, location_id: str, project_id: str) -> str:
+        """
+        Prefix shared by all assets of a legal entity / location / project.
+
+        Raises:
+            ValueError if any of the referenced master data does not exist
+        """
+        legal_entity = session.get(LegalEntity, legal_entity_id)
+        if not legal_entity:
+            raise ValueError(f"Legal entity '{legal_entity_id}' not found")
+        location = session.get(Location, location_id)
+        if not location:
+            raise ValueError(f"Location '{location_id}' not found")
+        project = session.get(Project, project_id)
+        if not project:
+            raise ValueError(f"Project '{project_id}' not found")
+        return f"{legal_entity.legal_entity_code}-{location.location_code}-{project.project_code}"
+
+    @staticmethod
+    def format_id(prefix: str, number: int) -> str:
+        return f"{prefix}-{number:0{SCOM_ID_DIGITS}d}"
+
+    @staticmethod
+    def _bump(counter_session: Session, prefix: str, count: int) -> Optional[int]:
+        statement = (
+            update(ScomIdCounter)
+            .where(ScomIdCounter.prefix == prefix)
+            .values(last_value=ScomIdCounter.last_value + count)
+            .returning(ScomIdCounter.last_value)
+        )
+        return counter_session.execute(statement).scalar_one_or_none()
+
+    @staticmethod
+    def _highest_existing(counter_session: Session, prefix: str) -> int:
+        """Seed for a new counter: the highest number already used by assets with this prefix"""
+        # Longest first, then by value: numbers past SCOM_ID_DIGITS digits sort
+        # after "-99999" as strings. Codes may contain "_" and "%", hence autoescape
+        statement = (
+            select(Asset.scom_asset_id)
+            .where(Asset.scom_asset_id.startswith(f"{prefix}-", autoescape=True))
+            .order_by(func.length(Asset.scom_asset_id).desc(), Asset.scom_asset_id.desc())
+        )
+        for scom_asset_id in counter_session.exec(statement):
+            suffix = scom_asset_id[len(prefix) + 1:]
+            if suffix.isdigit():
+                return int(suffix)
+        return 0
+
+    @staticmethod
+    def reserve_block(
+        session: Session,
+        legal_entity_id: str,
+        location_id: str,
+        project_id: str,
+        count: int,
+    ) -> List[str]:
+        """
+        Reserve `count` consecutive SCOM IDs for one prefix (bulk work).
+
+        Raises:
+            ValueError if the master data is unknown or count < 1
+        """
+        if count < 1:
+            raise ValueError("count must be at least 1")
+        prefix = ScomIdService.build_prefix(session, legal_entity_id, location_id, project_id)
+
+        # Separate session: the counter commits independently of the caller's transaction
+        with Session(session.get_bind()) as counter_session:
+            last_value = ScomIdService._bump(counter_session, prefix, count)
+            if last_value is None:
+                # First ID for this prefix: create the counter, seeded from existing assets
+                seed = ScomIdService._highest_existing(counter_session, prefix)
+                try:
+                    counter_session.add(ScomIdCounter(prefix=prefix, last_value=seed + count))
+                    counter_session.commit()
+                    last_value = seed + count
+                except IntegrityError:
+                    # Another request created it first
+                    counter_session.rollback()
+                    last_value = ScomIdService._bump(counter_session, prefix, count)
+            counter_session.commit()
+
+        first_value = last_value - count + 1
+        return [ScomIdService.format_id(prefix, n) for n in range(first_value, last_value + 1)]
+
+    @staticmethod
+    def allocate(session: Session, legal_entity_id: str, location_id: str, project_id: str) -> str:
+        """Allocate a single SCOM ID"""
+        return ScomIdService.reserve_block(session, legal_entity_id, location_id, project_id, 1)[0]
@@ -0,0 +1,119 @@
+import re
+from typing import List
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlmodel import Session, select, or_
+from app.models.asset import Asset
+
+# Columns covered by the asset search index
+SEARCH_COLUMNS = (
+    "asset_name",
+    "brand",
+    "model",
+    "physical_asset_tag_number",
+    "vin_number",
+    "scom_asset_id",
+)
+
+# Single lower-cased document per asset. Built only from IMMUTABLE functions so
+# Postgres can index the expression (concat_ws is only STABLE).
+_PG_DOCUMENT = "lower(" + " || ' ' || ".join(f"coalesce({c}, '')" for c in SEARCH_COLUMNS) + ")"
+
+_PG_INDEX_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    f"CREATE INDEX IF NOT EXISTS ix_asset_search_trgm ON asset USING gin (({_PG_DOCUMENT}) gin_trgm_ops)",
+    f"CREATE INDEX IF NOT EXISTS ix_asset_search_tsv ON asset USING gin (to_tsvector('simple', {_PG_DOCUMENT}))",
+]
+
+_PG_SEARCH = text(f"""
+    SELECT scom_asset_id FROM asset
+    WHERE :q <% {_PG_DOCUMENT}
+       OR to_tsvector('simple', {_PG_DOCUMENT}) @@ plainto_tsquery('simple', :q)
+       OR scom_asset_id = :raw
+       OR physical_asset_tag_number = :raw
+    ORDER BY (scom_asset_id = :raw OR physical_asset_tag_number = :raw) DESC,
+             ts_rank(to_tsvector('simple', {_PG_DOCUMENT}), plainto_tsquery('simple', :q))
+             + word_similarity(:q, {_PG_DOCUMENT}) DESC,
+             scom_asset_id
+    LIMIT :limit
+""")
+
+# SQLite (local runs): external-content FTS5 table kept in sync with triggers.
+# asset has a text primary key, so its rowid is implicit and VACUUM may
+# renumber it: the index is rebuilt from asset on every startup
+_FTS_COLUMNS = ", ".join(SEARCH_COLUMNS)
+_FTS_NEW = ", ".join(f"new.{c}" for c in SEARCH_COLUMNS)
+_FTS_OLD = ", ".join(f"old.{c}" for c in SEARCH_COLUMNS)
+
+_SQLITE_INDEX_DDL = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS asset_fts USING fts5({_FTS_COLUMNS}, content='asset', content_rowid='rowid')",
+    f"""CREATE TRIGGER IF NOT EXISTS asset_fts_ai AFTER INSERT ON asset BEGIN
+        INSERT INTO asset_fts(rowid, {_FTS_COLUMNS}) VALUES (new.rowid, {_FTS_NEW});
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS asset_fts_ad AFTER DELETE ON asset BEGIN
+        INSERT INTO asset_fts(asset_fts, rowid, {_FTS_COLUMNS}) VALUES ('delete', old.rowid, {_FTS_OLD});
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS asset_fts_au AFTER UPDATE ON asset BEGIN
+        INSERT INTO asset_fts(asset_fts, rowid, {_FTS_COLUMNS}) VALUES ('delete', old.rowid, {_FTS_OLD});
+        INSERT INTO asset_fts(rowid, {_FTS_COLUMNS}) VALUES (new.rowid, {_FTS_NEW});
+    END""",
+]
+
+_SQLITE_SEARCH = text("""
+    SELECT asset.scom_asset_id FROM asset_fts
+    JOIN asset ON asset.rowid = asset_fts.rowid
+    WHERE asset_fts MATCH :match
+    ORDER BY bm25(asset_fts), asset.scom_asset_id
+    LIMIT :limit
+""")
+
+
+class AssetSearchService:
+    @staticmethod
+    def ensure_search_index(engine: Engine) -> None:
+        """Create the dialect-specific search index (idempotent, run at startup; rebuilds the SQLite one)"""
+        dialect = engine.dialect.name
+        with engine.begin() as conn:
+            if dialect == "postgresql":
+                for ddl in _PG_INDEX_DDL:
+                    conn.execute(text(ddl))
+            elif dialect == "sqlite":
+                for ddl in _SQLITE_INDEX_DDL:
+                    conn.execute(text(ddl))
+                # Rows from before the FTS table, and rowids changed by a VACUUM since the last run
+                conn.execute(text("INSERT INTO asset_fts(asset_fts) VALUES ('rebuild')"))
+
+    @staticmethod
+    def search(session: Session, q: str, limit: int = 20) -> List[str]:
+        """
+        Ranked asset IDs matching `q` across name, brand, model, tag number, VIN and SCOM ID.
+
+        Postgres uses the trigram (fuzzy) and tsvector indexes, SQLite the FTS5
+        table with prefix matching. Other backends fall back to a LIKE scan.
+        """
+        q = q.strip()
+        if not q:
+            return []
+
+        dialect = session.get_bind().dialect.name
+        if dialect == "postgresql":
+            rows = session.execute(_PG_SEARCH, {"q": q.lower(), "raw": q, "limit": limit}).all()
+            return [row[0] for row in rows]
+
+        if dialect == "sqlite":
+            tokens = re.findall(r"\w+", q)
+            if not tokens:
+                return []
+            # Every token must match, each as a prefix ("lapt" finds "laptop")
+            match = " ".join(f'"{token}"*' for token in tokens)
+            rows = session.execute(_SQLITE_SEARCH, {"match": match, "limit": limit}).all()
+            return [row[0] for row in rows]
+
+        pattern = f"%{q}%"
+        statement = (
+            select(Asset.scom_asset_id)
+            .where(or_(*[getattr(Asset, c).ilike(pattern) for c in SEARCH_COLUMNS]))
+            .order_by(Asset.scom_asset_id)
+            .limit(limit)
+        )
+        return list(session.exec(statement).all())
@@ -0,0 +1,124 @@
+import logging
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Optional
+from sqlalchemy import event, update
+from sqlalchemy.orm import Session as OrmSession
+from sqlmodel import Session
+from app.core.config import settings
+from app.core.storage import get_storage
+from app.models.asset_photo import AssetPhoto
+from app.services.read_model_service import AssetReadModelService
+
+try:
+    from PIL import Image, ImageOps, features
+except ImportError:  # Pillow is optional: without it thumbnail URLs fall back to the full image
+    Image = None
+
+# Bounding box of the generated thumbnails (aspect ratio is kept)
+THUMBNAIL_SIZE = (320, 320)
+THUMBNAIL_QUALITY = 80
+THUMBNAIL_WORKERS = getattr(settings, "THUMBNAIL_WORKERS", 2)
+
+_PENDING_THUMBNAILS = "pending_thumbnails"
+
+logger = logging.getLogger(__name__)
+
+_executor = ThreadPoolExecutor(max_workers=THUMBNAIL_WORKERS, thread_name_prefix="thumbnails")
+
+
+class ThumbnailService:
+    """
+    Fixed-size WebP (JPEG if Pillow lacks WebP) thumbnails of asset photos.
+
+    Generated on a small worker pool once the upload is committed, never on
+    the request thread; AssetPhoto.thumb_filename and the read model are
+    updated when the thumbnail is written.
+    """
+
+    @staticmethod
+    def thumbnail_name(filename: str) -> str:
+        stem = os.path.splitext(filename)[0]
+        extension = ".webp" if Image is not None and features.check("webp") else ".jpg"
+        return f"{stem}_thumb{extension}"
+
+    @staticmethod
+    def render(filename: str) -> Optional[str]:
+        """Write the thumbnail of an uploaded file and return its filename (None if not possible)"""
+        if Image is None:
+            return None
+        # Next to the photo, in the same shard directory
+        thumb_filename = ThumbnailService.thumbnail_name(filename)
+        storage = get_storage()
+        partial = None
+        try:
+            with storage.open(filename) as source, Image.open(source) as image:
+                image = ImageOps.exif_transpose(image)
+                image.thumbnail(THUMBNAIL_SIZE)
+                if image.mode not in ("RGB", "RGBA"):
+                    image = image.convert("RGB")
+                if thumb_filename.endswith(".jpg") and image.mode == "RGBA":
+                    image = image.convert("RGB")
+                # Written locally and stored whole, so readers never see a partial file
+                fd, partial = tempfile.mkstemp(dir=settings.UPLOAD_DIR, prefix=".thumb_")
+                os.close(fd)
+                image.save(partial, format="WEBP" if thumb_filename.endswith(".webp") else "JPEG",
+                           quality=THUMBNAIL_QUALITY)
+            storage.put_file(partial, thumb_filename)
+        except (OSError, ValueError) as e:
+            logger.warning("Could not create thumbnail for %s: %s", filename, e)
+            return None
+        finally:
+            if partial and os.path.exists(partial):
+                os.remove(partial)
+        return thumb_filename
+
+    @staticmethod
+    def generate(filename: str) -> Optional[str]:
+        """Render the thumbnail and point every photo using `filename` at it"""
+        from app.core.db import engine
+
+        thumb_filename = ThumbnailService.render(filename)
+        if not thumb_filename:
+            return None
+        with Session(engine) as session:
+            asset_ids = session.execute(
+                update(AssetPhoto)
+                .where(AssetPhoto.filename == filename)
+                .values(thumb_filename=thumb_filename)
+                .returning(AssetPhoto.asset_id)
+            ).scalars().all()
+            AssetReadModelService.refresh_assets(session.connection(), asset_ids)
+            session.commit()
+        return thumb_filename
+
+    @staticmethod
+    def schedule(filenames: Iterable[str]) -> None:
+        """Queue thumbnail generation on the worker pool"""
+        for filename in filenames:
+            _executor.submit(ThumbnailService._generate_logged, filename)
+
+    @staticmethod
+    def _generate_logged(filename: str) -> None:
+        try:
+            ThumbnailService.generate(filename)
+        except Exception:
+            logger.exception("Thumbnail generation failed for %s", filename)
+
+    @staticmethod
+    def request(session: Session, filename: str) -> None:
+        """Generate the thumbnail of `filename` once the session's transaction commits"""
+        session.info.setdefault(_PENDING_THUMBNAILS, set()).add(filename)
+
+
+@event.listens_for(OrmSession, "after_commit")
+def _schedule_thumbnails(session):
+    filenames = session.info.pop(_PENDING_THUMBNAILS, None)
+    if filenames:
+        ThumbnailService.schedule(filenames)
+
+
+@event.listens_for(OrmSession, "after_rollback")
+def _discard_thumbnails(session):
+    session.info.pop(_PENDING_THUMBNAILS, None)
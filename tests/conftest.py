@@ -0,0 +1,127 @@
+from contextlib import contextmanager
+from datetime import date
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine
+
+from app.api.media import router as media_router
+from app.core.config import settings
+from app.models.archive import ArchivedAsset
+from app.models.asset import Asset
+from app.models.asset_change import AssetChange
+from app.models.asset_photo import AssetPhoto
+from app.models.asset_read_model import AssetReadModel
+from app.models.enums import AssetStatus
+from app.models.master_data import AssetCategory, AssetSubCategory, FundingSource, LegalEntity, Location, Project, Site
+from app.models.operations import Disposal
+from app.models.stored_blob import StoredBlob
+from app.models.table_count import TableCountDelta
+from app.models.user import User  # noqa: F401  target of Asset.custodian_id, not created
+from app.services import read_model_service  # noqa: F401  registers the read-model listener
+
+# Tables the asset read paths touch (User uses a Postgres ARRAY column and is left out)
+_TABLES = [
+    model.__table__
+    for model in (
+        Site, Location, LegalEntity, Project, FundingSource, AssetCategory, AssetSubCategory,
+        Asset, AssetPhoto, AssetReadModel, AssetChange, TableCountDelta, Disposal, StoredBlob, ArchivedAsset,
+    )
+]
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    SQLModel.metadata.create_all(engine, tables=_TABLES)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session(engine):
+    with Session(engine) as session:
+        yield session
+
+
+@pytest.fixture
+def upload_dir(tmp_path, monkeypatch):
+    """Empty UPLOAD_DIR for the local storage backend"""
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture
+def client(upload_dir):
+    """Client for /media, serving files from `upload_dir`"""
+    app = FastAPI()
+    app.include_router(media_router, prefix="/media")
+    return TestClient(app)
+
+
+@pytest.fixture
+def count_queries(engine):
+    """Context manager collecting the SQL statements run on the engine"""
+    @contextmanager
+    def counting():
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+    return counting
+
+
+@pytest.fixture
+def assets(session):
+    """150 assets in one location, the first ones with 1 to 3 photos"""
+    session.add_all([
+        Site(site_id="S1", site_code="DKR", site_name="Dakar"),
+        Location(location_id="L1", location_code="DKR-WH", location_name="Warehouse",
+                 location_name_code="WH", site_id="S1"),
+        LegalEntity(legal_entity_id="LE1", legal_entity_code="SN", legal_entity_name="Senegal"),
+        Project(project_id="P1", project_code="PRJ", name="Project"),
+        FundingSource(funding_source_id="F1", name="Fund"),
+        AssetCategory(category_id="C1", name="IT"),
+        AssetSubCategory(sub_category_id="SC1", category_id="C1", name="Laptop", useful_life_years=3),
+    ])
+    created = []
+    for i in range(150):
+        asset = Asset(
+            scom_asset_id=f"SN-DKR-WH-PRJ-{i:05d}",
+            asset_name=f"Laptop {i}",
+            physical_asset_tag_number=f"TAG-{i:05d}",
+            brand="Brand",
+            model="Model",
+            acquisition_price=1000.0,
+            currency="XOF",
+            date_of_acquisition=date(2024, 1, 1),
+            type_of_acquisition="purchase",
+            asset_status=AssetStatus.GOOD,
+            scom_category="IT",
+            useful_life_years=3,
+            legal_entity_id="LE1",
+            business_unit="BU",
+            project_id="P1",
+            funding_source_id="F1",
+            location_id="L1",
+            custodian_id="U1",
+            sub_category_id="SC1",
+            category_id="C1",
+        )
+        session.add(asset)
+        created.append(asset)
+    for i in range(30):
+        for n in range(i % 3 + 1):
+            session.add(AssetPhoto(asset_id=created[i].scom_asset_id, filename=f"{i}_{n}.jpg", is_profile=n == 0))
+    session.commit()
+    return [asset.scom_asset_id for asset in created]
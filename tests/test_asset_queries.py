@@ -0,0 +1,47 @@
+"""Regression tests: asset list/detail reads cost a constant number of queries."""
+
+from fastapi import Response
+from starlette.requests import Request
+
+from app.api.v1.endpoints.assets import read_asset, read_assets
+from app.schemas.asset import AssetFilter
+
+
+def _request() -> Request:
+    return Request({"type": "http", "method": "GET", "path": "/", "query_string": b"", "headers": []})
+
+
+def _list_queries(session, count_queries, limit):
+    with count_queries() as statements:
+        results = read_assets(
+            session=session, current_user=None, request=_request(), response=Response(),
+            filters=AssetFilter(), sort="scom_asset_id", skip=0, limit=limit, cursor=None, fields=None,
+        )
+    assert len(results) == limit
+    return len(statements)
+
+
+def test_list_query_count_does_not_grow_with_limit(session, assets, count_queries):
+    assert _list_queries(session, count_queries, 1) == _list_queries(session, count_queries, 100)
+
+
+def test_list_enriches_location_site_and_photos(session, assets):
+    results = read_assets(
+        session=session, current_user=None, request=_request(), response=Response(),
+        filters=AssetFilter(), sort="scom_asset_id", skip=0, limit=3, cursor=None, fields=None,
+    )
+    assert results[0].location.location_code == "DKR-WH"
+    assert results[0].location.site.site_code == "DKR"
+    assert [r.photo_count for r in results] == [1, 2, 3]
+
+
+def test_detail_query_count_does_not_grow_with_photos(session, assets, count_queries):
+    counts = []
+    # 1 and 3 photos, and none
+    for asset_id in (assets[0], assets[2], assets[100]):
+        session.expunge_all()
+        with count_queries() as statements:
+            read_asset(asset_id=asset_id, session=session, current_user=None,
+                       request=_request(), response=Response())
+        counts.append(len(statements))
+    assert len(set(counts)) == 1
@@ -0,0 +1,92 @@
+"""Content-addressed uploads: deduplication, reference counting and release after commit."""
+
+import hashlib
+import io
+
+import pytest
+from fastapi import HTTPException
+from sqlmodel import select
+
+from app.core.uploads import DOCUMENT_UPLOAD, PHOTO_UPLOAD
+from app.models.asset_photo import AssetPhoto
+from app.models.stored_blob import StoredBlob
+from app.services.blob_service import BlobService
+
+PDF = b"%PDF-1.4\n" + b"x" * 100
+PDF_NAME = BlobService.blob_filename(hashlib.sha256(PDF).hexdigest(), ".pdf")
+
+
+def _blob(session):
+    session.expire_all()
+    return session.exec(select(StoredBlob).where(StoredBlob.filename == PDF_NAME)).first()
+
+
+def test_identical_uploads_are_stored_once(session, upload_dir):
+    first = BlobService.store(session, io.BytesIO(PDF), DOCUMENT_UPLOAD)
+    second = BlobService.store(session, io.BytesIO(PDF), DOCUMENT_UPLOAD, references=2)
+    session.commit()
+
+    assert first == second == PDF_NAME
+    assert upload_dir.joinpath(*PDF_NAME.split("/")).read_bytes() == PDF
+    assert _blob(session).ref_count == 3
+    # Only the stored copy is left, no spool files
+    assert [p.name for p in upload_dir.rglob("*") if p.is_file()] == [PDF_NAME.split("/")[-1]]
+
+
+def test_rejected_upload_stores_nothing(session, upload_dir):
+    with pytest.raises(HTTPException) as e:
+        BlobService.store(session, io.BytesIO(PDF), PHOTO_UPLOAD)
+    assert e.value.status_code == 415
+    assert session.exec(select(StoredBlob)).all() == []
+    assert [p for p in upload_dir.rglob("*") if p.is_file()] == []
+
+
+def test_file_is_removed_after_the_commit_dropping_the_last_reference(session, upload_dir):
+    BlobService.store(session, io.BytesIO(PDF), DOCUMENT_UPLOAD, references=2)
+    session.commit()
+    stored = upload_dir.joinpath(*PDF_NAME.split("/"))
+
+    BlobService.release(session, PDF_NAME)
+    session.commit()
+    assert _blob(session).ref_count == 1
+    assert stored.exists()
+
+    BlobService.release(session, PDF_NAME)
+    assert stored.exists()  # still referenced until the commit
+    session.commit()
+    assert _blob(session) is None
+    assert not stored.exists()
+
+
+def test_release_is_undone_by_a_rollback(session, upload_dir):
+    BlobService.store(session, io.BytesIO(PDF), DOCUMENT_UPLOAD)
+    session.commit()
+
+    BlobService.release(session, PDF_NAME, "thumbs/derived.webp")
+    session.rollback()
+    session.commit()
+
+    assert _blob(session).ref_count == 1
+    assert upload_dir.joinpath(*PDF_NAME.split("/")).exists()
+
+
+def test_release_of_an_unregistered_file_removes_it_and_its_derived_files(session, upload_dir):
+    upload_dir.joinpath("legacy.jpg").write_bytes(b"old")
+    upload_dir.joinpath("legacy_thumb.webp").write_bytes(b"old")
+
+    BlobService.release(session, "legacy.jpg", "legacy_thumb.webp", None)
+    session.commit()
+
+    assert not upload_dir.joinpath("legacy.jpg").exists()
+    assert not upload_dir.joinpath("legacy_thumb.webp").exists()
+
+
+def test_recount_follows_the_referencing_rows(session, assets, upload_dir):
+    session.add(StoredBlob(sha256="0" * 64, filename="0_0.jpg", size=1, ref_count=7))
+    session.add(StoredBlob(sha256="1" * 64, filename="nobody.jpg", size=1, ref_count=1))
+    session.add(AssetPhoto(asset_id=assets[1], filename="0_0.jpg"))
+    session.commit()
+
+    assert BlobService.recount(session) == 1
+    counts = dict(session.exec(select(StoredBlob.filename, StoredBlob.ref_count)).all())
+    assert counts == {"0_0.jpg": 2, "nobody.jpg": 0}
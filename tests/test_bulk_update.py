@@ -0,0 +1,51 @@
+"""Bulk PATCH of assets: unknown references are rejected before anything is written."""
+
+import pytest
+from fastapi import HTTPException
+from sqlmodel import select
+
+from app.models.asset import Asset
+from app.models.asset_change import AssetChange
+from app.models.master_data import Location
+from app.schemas.asset import AssetBulkUpdate, AssetUpdate
+from app.services.bulk_update_service import AssetBulkService
+
+
+def _bulk(session, asset_ids, **changes):
+    bulk_in = AssetBulkUpdate(asset_ids=asset_ids, changes=AssetUpdate.model_validate(changes))
+    return AssetBulkService.bulk_update(session, bulk_in, changed_by="U1")
+
+
+def _journal(session):
+    return session.exec(select(AssetChange).where(AssetChange.source == "bulk_update")).all()
+
+
+@pytest.mark.parametrize("changes", [
+    {"location_id": "NOPE"},
+    {"project_id": "NOPE"},
+    {"legal_entity_id": "NOPE"},
+    {"funding_source_id": "NOPE"},
+    {"category_id": "NOPE"},
+    {"sub_category_id": "SC1", "category_id": "NOPE"},
+])
+def test_unknown_reference_is_a_400_and_writes_nothing(session, assets, changes):
+    with pytest.raises(HTTPException) as e:
+        _bulk(session, assets[:5], **changes)
+    assert e.value.status_code == 400
+    assert "NOPE" in e.value.detail
+    session.rollback()
+    assert _journal(session) == []
+
+
+def test_known_location_is_applied(session, assets):
+    session.add(Location(location_id="L2", location_code="DKR-OF", location_name="Office",
+                         location_name_code="OF", site_id="S1"))
+    session.commit()
+
+    result = _bulk(session, assets[:5] + ["MISSING"], location_id="L2")
+
+    assert result.updated == 5
+    assert result.not_found == ["MISSING"]
+    session.expire_all()
+    assert {session.get(Asset, a).location_id for a in assets[:5]} == {"L2"}
+    assert len(_journal(session)) == 5
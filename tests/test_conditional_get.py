@@ -0,0 +1,91 @@
+"""Conditional GET on the asset list and detail: ETags, 304s and invalidation on change."""
+
+from fastapi import Response
+from starlette.requests import Request
+
+from app.api.v1.endpoints.assets import read_asset, read_assets
+from app.models.asset import Asset
+from app.schemas.asset import AssetFilter
+
+
+def _request(if_none_match=None) -> Request:
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+    return Request({"type": "http", "method": "GET", "path": "/", "query_string": b"", "headers": headers})
+
+
+def _list(session, if_none_match=None, limit=10):
+    response = Response()
+    result = read_assets(
+        session=session, current_user=None, request=_request(if_none_match), response=response,
+        filters=AssetFilter(), sort="scom_asset_id", skip=0, limit=limit, cursor=None, fields=None,
+    )
+    return result, response
+
+
+def _detail(session, asset_id, if_none_match=None):
+    response = Response()
+    result = read_asset(asset_id=asset_id, session=session, current_user=None,
+                        request=_request(if_none_match), response=response)
+    return result, response
+
+
+def test_list_matching_etag_returns_304(session, assets):
+    _, response = _list(session)
+    etag = response.headers["ETag"]
+
+    result, _ = _list(session, if_none_match=etag)
+    assert isinstance(result, Response) and result.status_code == 304
+    assert result.headers["ETag"] == etag
+
+
+def test_list_etag_changes_when_an_asset_on_the_page_changes(session, assets):
+    _, response = _list(session)
+    etag = response.headers["ETag"]
+
+    asset = session.get(Asset, assets[5])
+    asset.asset_name = "Renamed"
+    session.add(asset)
+    session.commit()
+
+    result, response = _list(session, if_none_match=etag)
+    assert isinstance(result, list) and len(result) == 10
+    assert response.headers["ETag"] != etag
+
+
+def test_list_etag_changes_when_the_total_changes(session, assets):
+    _, response = _list(session)
+    etag = response.headers["ETag"]
+    assert response.headers["X-Total-Count"] == "150"
+
+    session.delete(session.get(Asset, assets[120]))
+    session.commit()
+
+    result, response = _list(session, if_none_match=etag)
+    assert isinstance(result, list)
+    assert response.headers["ETag"] != etag
+    assert response.headers["X-Total-Count"] == "149"
+
+
+def test_list_etag_ignores_changes_outside_the_page(session, assets):
+    _, response = _list(session)
+    etag = response.headers["ETag"]
+
+    asset = session.get(Asset, assets[120])
+    asset.asset_name = "Renamed"
+    session.add(asset)
+    session.commit()
+
+    result, _ = _list(session, if_none_match=etag)
+    assert result.status_code == 304
+
+
+def test_detail_sets_validators_and_revalidates(session, assets):
+    result, response = _detail(session, assets[0])
+    assert result.scom_asset_id == assets[0]
+    etag = response.headers["ETag"]
+    assert response.headers["Last-Modified"].endswith("GMT")
+
+    result, _ = _detail(session, assets[0], if_none_match=f'"other", {etag}')
+    assert result.status_code == 304
+    result, _ = _detail(session, assets[1], if_none_match=etag)
+    assert result.scom_asset_id == assets[1]
@@ -0,0 +1,42 @@
+"""Cached table counts: seeding at startup and delta maintenance."""
+
+import pytest
+from sqlmodel import select
+
+from app.models.asset import Asset
+from app.models.table_count import TableCountDelta
+from app.services import count_service
+from app.services.count_service import CountService
+
+
+@pytest.fixture
+def counted_assets(monkeypatch):
+    # The other counted tables are not created in the SQLite test database
+    monkeypatch.setattr(count_service, "COUNTED_MODELS", (Asset,))
+
+
+def _base_rows(session):
+    return session.exec(select(TableCountDelta.row_count).where(TableCountDelta.table_name == "asset")).all()
+
+
+def test_seed_writes_the_base_count_once(session, engine, assets, counted_assets):
+    CountService.seed(engine)
+    CountService.seed(engine)
+
+    assert _base_rows(session) == [150]
+
+
+def test_seeded_total_follows_inserts_and_deletes_without_counting(session, engine, assets, counted_assets,
+                                                                   count_queries):
+    CountService.seed(engine)
+    session.delete(session.get(Asset, assets[149]))
+    session.commit()
+
+    with count_queries() as statements:
+        assert CountService.total(session, Asset) == 149
+    assert not any("FROM asset" in s for s in statements)
+
+
+def test_unseeded_table_is_counted_and_gets_no_deltas(session, assets):
+    assert _base_rows(session) == []
+    assert CountService.total(session, Asset) == 150
@@ -0,0 +1,86 @@
+"""Keyset pagination of GET /assets: walking pages with X-Next-Cursor."""
+
+import json
+from datetime import date
+
+import pytest
+from fastapi import HTTPException, Response
+from starlette.requests import Request
+
+from app.api.v1.endpoints.assets import read_assets
+from app.core.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
+from app.models.asset import Asset
+from app.schemas.asset import AssetFilter
+
+
+def _page(session, sort, limit, cursor=None, fields=None):
+    response = Response()
+    results = read_assets(
+        session=session, current_user=None,
+        request=Request({"type": "http", "method": "GET", "path": "/", "query_string": b"", "headers": []}),
+        response=response, filters=AssetFilter(), sort=sort, skip=0, limit=limit, cursor=cursor, fields=fields,
+    )
+    return results, response.headers.get(NEXT_CURSOR_HEADER)
+
+
+def _walk(session, sort, limit, fields=None):
+    seen, cursor, pages = [], None, 0
+    while True:
+        results, cursor = _page(session, sort, limit, cursor, fields)
+        pages += 1
+        if fields:
+            seen.extend(row["SCOMAssetID"] for row in json.loads(results.body))
+        else:
+            seen.extend(r.scom_asset_id for r in results)
+        if not cursor:
+            return seen, pages
+
+
+def test_walks_every_asset_once(session, assets):
+    seen, pages = _walk(session, "scom_asset_id", 40)
+    assert seen == assets
+    assert pages == 4
+
+
+def test_ties_on_the_sort_key_are_broken_by_the_id(session, assets):
+    # Every asset has the same price
+    seen, _ = _walk(session, "acquisition_price", 40)
+    assert seen == assets
+
+
+def test_descending_sort(session, assets):
+    seen, _ = _walk(session, "-asset_name", 50)
+    names = {asset_id: f"Laptop {i}" for i, asset_id in enumerate(assets)}
+    assert len(seen) == 150
+    assert [names[a] for a in seen] == sorted(names.values(), reverse=True)
+
+
+def test_sparse_fields_pages_like_the_full_list(session, assets):
+    seen, _ = _walk(session, "scom_asset_id", 60, fields="SCOMAssetID,assetName")
+    assert seen == assets
+
+
+def test_rows_deleted_before_the_cursor_do_not_shift_the_next_page(session, assets):
+    _, cursor = _page(session, "scom_asset_id", 40)
+    session.delete(session.get(Asset, assets[35]))
+    session.commit()
+
+    second, _ = _page(session, "scom_asset_id", 40, cursor)
+    assert [r.scom_asset_id for r in second] == assets[40:80]
+
+
+def test_short_page_has_no_next_cursor(session, assets):
+    _, cursor = _page(session, "scom_asset_id", 200)
+    assert cursor is None
+
+
+@pytest.mark.parametrize("cursor", ["not-base64!", encode_cursor("a", "b", "c"), encode_cursor()])
+def test_invalid_cursor_is_a_400(session, assets, cursor):
+    with pytest.raises(HTTPException) as e:
+        _page(session, "scom_asset_id", 10, cursor)
+    assert e.value.status_code == 400
+
+
+def test_cursor_round_trips_typed_values():
+    cursor = encode_cursor(date(2024, 1, 31), "SN-1")
+    assert decode_cursor(cursor, [date, str]) == [date(2024, 1, 31), "SN-1"]
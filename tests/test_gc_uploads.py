@@ -0,0 +1,112 @@
+"""Upload garbage collection: grace period, live/archived references, dry-run and commit ordering."""
+
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from sqlmodel import select
+
+from app.commands import gc_uploads
+from app.models.archive import ArchivedAsset
+from app.models.enums import DisposalStatus, DisposalType
+from app.models.operations import Disposal
+from app.models.stored_blob import StoredBlob
+from app.services.gc_service import UploadGCService
+
+OLD = time.time() - 3 * 24 * 3600
+
+
+def _write(upload_dir, name, mtime=OLD):
+    path = upload_dir.joinpath(*name.split("/"))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"data")
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+@pytest.fixture
+def stored(session, assets, upload_dir):
+    """Old files: live photo, disposal document, archived photo, orphans; plus a fresh orphan"""
+    session.add(Disposal(
+        disposal_id="D1", asset_id=assets[0], type_of_disposal=DisposalType.DESTROYED, reason="broken",
+        requested_by="U1", requested_at=datetime(2024, 1, 1), status=DisposalStatus.PENDING,
+        document_path="docs/d1.pdf",
+    ))
+    session.add(ArchivedAsset(
+        scom_asset_id="OLD-1", asset_name="Old laptop",
+        photos=[{"id": 1, "filename": "arch_1.jpg", "thumb_filename": "thumbs/arch_1.webp"}],
+        disposals=[{"document_path": "docs/arch_1.pdf"}],
+    ))
+    session.add(StoredBlob(sha256="ab" * 32, filename="ab/cd/orphan_blob.jpg", size=4, ref_count=0))
+    session.commit()
+    for name in ("0_0.jpg", "docs/d1.pdf", "arch_1.jpg", "thumbs/arch_1.webp", "docs/arch_1.pdf",
+                 "orphan_1.jpg", "orphan_1.jpg.br", "ab/cd/orphan_blob.jpg"):
+        _write(upload_dir, name)
+    _write(upload_dir, "fresh_upload.jpg", mtime=time.time())
+    return upload_dir
+
+
+def _orphans(session, **kwargs):
+    return sorted(f.name for batch in UploadGCService.find_orphans(session, **kwargs) for f in batch)
+
+
+def test_only_old_unreferenced_files_are_orphans(session, stored):
+    assert _orphans(session) == ["ab/cd/orphan_blob.jpg", "orphan_1.jpg", "orphan_1.jpg.br"]
+
+
+def test_references_are_checked_per_batch(session, stored):
+    assert _orphans(session, batch_size=2) == ["ab/cd/orphan_blob.jpg", "orphan_1.jpg", "orphan_1.jpg.br"]
+
+
+def test_grace_period_protects_recent_files(session, stored):
+    assert "fresh_upload.jpg" in _orphans(session, grace=timedelta(0))
+    assert _orphans(session, grace=timedelta(days=7)) == []
+
+
+def test_remove_deletes_files_and_blob_rows(session, stored):
+    orphans = [f for batch in UploadGCService.find_orphans(session) for f in batch]
+    removed = UploadGCService.remove(session, orphans)
+
+    assert sorted(removed) == ["ab/cd/orphan_blob.jpg", "orphan_1.jpg", "orphan_1.jpg.br"]
+    assert not (stored / "orphan_1.jpg").exists()
+    assert not (stored / "ab" / "cd" / "orphan_blob.jpg").exists()
+    assert (stored / "0_0.jpg").exists()
+    assert session.exec(select(StoredBlob)).all() == []
+
+
+def test_remove_keeps_files_when_the_commit_fails(session, stored, monkeypatch):
+    orphans = [f for batch in UploadGCService.find_orphans(session) for f in batch]
+
+    def failing_commit():
+        session.rollback()
+        raise RuntimeError("connection lost")
+
+    monkeypatch.setattr(session, "commit", failing_commit)
+    with pytest.raises(RuntimeError):
+        UploadGCService.remove(session, orphans)
+
+    assert (stored / "orphan_1.jpg").exists()
+    assert (stored / "ab" / "cd" / "orphan_blob.jpg").exists()
+
+
+def test_remove_keeps_files_archived_after_listing(session, stored):
+    orphans = [f for batch in UploadGCService.find_orphans(session) for f in batch]
+    session.add(ArchivedAsset(scom_asset_id="OLD-2", asset_name="Late", photos=[{"id": 2, "filename": "orphan_1.jpg"}]))
+    session.commit()
+
+    assert sorted(UploadGCService.remove(session, orphans)) == ["ab/cd/orphan_blob.jpg"]
+    assert (stored / "orphan_1.jpg.br").exists()
+
+
+def test_dry_run_lists_without_removing(session, engine, stored, monkeypatch, capsys):
+    monkeypatch.setattr(gc_uploads, "engine", engine)
+    monkeypatch.setattr(sys, "argv", ["gc_uploads", "--dry-run"])
+    gc_uploads.main()
+
+    output = capsys.readouterr().out
+    assert "Unreferenced: orphan_1.jpg (4 bytes)" in output
+    assert "Would remove 3 unreferenced files" in output
+    assert (stored / "orphan_1.jpg").exists()
+    assert session.exec(select(StoredBlob)).all() != []
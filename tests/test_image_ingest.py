@@ -0,0 +1,76 @@
+"""Photo normalization on ingest: resize, re-encode, EXIF removal and the store-as-is fallbacks."""
+
+import os
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from app.services import image_ingest_service
+from app.services.image_ingest_service import PHOTO_MAX_EDGE, ImageIngestService
+
+Image = pytest.importorskip("PIL.Image")
+
+
+@pytest.fixture
+def large_jpeg(upload_dir):
+    path = upload_dir / "upload.jpg"
+    exif = Image.Exif()
+    exif[0x010F] = "Camera maker"  # Make
+    exif[0x0112] = 6  # Orientation: rotate 90° clockwise
+    Image.new("RGB", (PHOTO_MAX_EDGE * 2, PHOTO_MAX_EDGE), "red").save(path, format="JPEG", exif=exif)
+    return path
+
+
+@pytest.fixture
+def target(upload_dir):
+    path = ImageIngestService.scratch_path()
+    yield path
+    image_ingest_service._reset_executor()
+
+
+class _StuckExecutor:
+    """Executor whose futures never complete (or fail with `error`)"""
+
+    def __init__(self, error=None):
+        self.error = error
+
+    def submit(self, fn, *args):
+        future = Future()
+        if self.error:
+            future.set_exception(self.error)
+        return future
+
+
+def test_photo_is_resized_oriented_and_stripped(large_jpeg, target):
+    normalized = ImageIngestService.normalize(str(large_jpeg), target)
+
+    assert normalized.path == target
+    with Image.open(target) as image:
+        # Orientation applied: portrait, longest edge capped
+        assert image.size == (PHOTO_MAX_EDGE // 2, PHOTO_MAX_EDGE)
+        assert not image.getexif()
+    assert normalized.extension in (".webp", ".jpg")
+    assert normalized.size == os.path.getsize(target) < large_jpeg.stat().st_size
+
+
+def test_undecodable_image_is_stored_as_uploaded(upload_dir, target):
+    broken = upload_dir / "broken.jpg"
+    broken.write_bytes(b"\xff\xd8\xff" + b"\x00" * 100)
+    assert ImageIngestService.normalize(str(broken), target) is None
+
+
+def test_timeout_falls_back_to_the_upload(large_jpeg, target, monkeypatch):
+    monkeypatch.setattr(image_ingest_service, "_get_executor", lambda: _StuckExecutor())
+    monkeypatch.setattr(image_ingest_service, "IMAGE_INGEST_TIMEOUT", 0.01)
+
+    assert ImageIngestService.normalize(str(large_jpeg), target) is None
+
+
+def test_crashed_pool_falls_back_and_is_replaced(large_jpeg, target, monkeypatch):
+    resets = []
+    monkeypatch.setattr(image_ingest_service, "_get_executor", lambda: _StuckExecutor(BrokenProcessPool()))
+    monkeypatch.setattr(image_ingest_service, "_reset_executor", lambda: resets.append(True))
+
+    assert ImageIngestService.normalize(str(large_jpeg), target) is None
+    assert resets == [True]
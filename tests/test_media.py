@@ -0,0 +1,98 @@
+"""/media: validators, caching headers, byte ranges and precompressed siblings."""
+
+import hashlib
+
+import pytest
+
+from app.services.media_service import IMMUTABLE_CACHE_CONTROL, MUTABLE_CACHE_CONTROL
+
+CONTENT = bytes(range(256)) * 4
+DIGEST = hashlib.sha256(CONTENT).hexdigest()
+NAME = f"{DIGEST[:2]}/{DIGEST[2:4]}/{DIGEST}.jpg"
+
+
+@pytest.fixture
+def photo(upload_dir):
+    path = upload_dir.joinpath(*NAME.split("/"))
+    path.parent.mkdir(parents=True)
+    path.write_bytes(CONTENT)
+    return path
+
+
+def test_content_addressed_file_is_immutable_with_a_strong_etag(client, photo):
+    response = client.get(f"/media/{NAME}")
+    assert response.status_code == 200
+    assert response.content == CONTENT
+    assert response.headers["etag"] == f'"{DIGEST}"'
+    assert response.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+    assert response.headers["content-type"] == "image/jpeg"
+
+
+def test_legacy_file_must_revalidate(client, upload_dir):
+    upload_dir.joinpath("old_photo.jpg").write_bytes(b"old")
+    response = client.get("/media/old_photo.jpg")
+    assert response.headers["cache-control"] == MUTABLE_CACHE_CONTROL
+    assert not response.headers["etag"].startswith("W/")
+
+
+def test_matching_if_none_match_returns_304(client, photo):
+    response = client.get(f"/media/{NAME}", headers={"If-None-Match": f'"other", "{DIGEST}"'})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == f'"{DIGEST}"'
+
+
+def test_single_range(client, photo):
+    response = client.get(f"/media/{NAME}", headers={"Range": "bytes=10-19"})
+    assert response.status_code == 206
+    assert response.content == CONTENT[10:20]
+    assert response.headers["content-range"] == f"bytes 10-19/{len(CONTENT)}"
+    assert response.headers["content-length"] == "10"
+
+
+def test_suffix_and_open_ended_ranges(client, photo):
+    assert client.get(f"/media/{NAME}", headers={"Range": "bytes=-5"}).content == CONTENT[-5:]
+    assert client.get(f"/media/{NAME}", headers={"Range": "bytes=1000-"}).content == CONTENT[1000:]
+
+
+def test_unsatisfiable_range_returns_416(client, photo):
+    response = client.get(f"/media/{NAME}", headers={"Range": f"bytes={len(CONTENT)}-"})
+    assert response.status_code == 416
+    assert response.headers["content-range"] == f"bytes */{len(CONTENT)}"
+
+
+def test_multiple_ranges_serve_the_whole_file(client, photo):
+    response = client.get(f"/media/{NAME}", headers={"Range": "bytes=0-1,5-6"})
+    assert response.status_code == 200
+    assert response.content == CONTENT
+
+
+def test_if_range_with_a_stale_etag_serves_the_whole_file(client, photo):
+    fresh = client.get(f"/media/{NAME}", headers={"Range": "bytes=0-9", "If-Range": f'"{DIGEST}"'})
+    assert fresh.status_code == 206
+    stale = client.get(f"/media/{NAME}", headers={"Range": "bytes=0-9", "If-Range": '"outdated"'})
+    assert stale.status_code == 200
+    assert stale.content == CONTENT
+
+
+def test_precompressed_sibling_is_preferred_and_not_ranged(client, photo):
+    photo.with_name(photo.name + ".br").write_bytes(b"brotli")
+    response = client.get(
+        f"/media/{NAME}", headers={"Accept-Encoding": "gzip, br", "Range": "bytes=0-1"}
+    )
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "br"
+    assert response.headers["etag"] == f'"{DIGEST}-br"'
+    assert response.headers["content-length"] == "6"
+
+
+def test_head_has_headers_only(client, photo):
+    response = client.head(f"/media/{NAME}")
+    assert response.status_code == 200
+    assert response.content == b""
+    assert response.headers["content-length"] == str(len(CONTENT))
+
+
+@pytest.mark.parametrize("name", ["missing.jpg", "ab/.upload_tmp", "a/b/c/d.jpg", "..%2F..%2Fetc%2Fpasswd"])
+def test_unknown_hidden_and_escaping_names_are_404(client, photo, name):
+    assert client.get(f"/media/{name}").status_code == 404
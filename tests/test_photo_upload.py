@@ -0,0 +1,45 @@
+"""Photo uploads are rejected before the photo is normalized."""
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.uploads import PHOTO_UPLOAD, UploadWriter
+from app.services.image_ingest_service import ImageIngestService
+from app.services.photo_service import PhotoService
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 64
+
+
+@pytest.fixture
+def writer(upload_dir):
+    writer = UploadWriter(PHOTO_UPLOAD)
+    writer.write(PNG)
+    writer.finish()
+    yield writer
+    writer.discard()
+
+
+@pytest.fixture
+def normalize_calls(monkeypatch):
+    calls = []
+    monkeypatch.setattr(ImageIngestService, "normalize", staticmethod(lambda path, target: calls.append(path)))
+    return calls
+
+
+def test_asset_with_max_photos_is_rejected_before_normalizing(session, assets, writer, normalize_calls):
+    # assets[2] already has 3 photos
+    assert PhotoService.save_photo_upload(session, assets[2], writer) is None
+    assert normalize_calls == []
+
+
+def test_unknown_asset_is_rejected_before_normalizing(session, assets, writer, normalize_calls):
+    with pytest.raises(HTTPException) as e:
+        PhotoService.save_photo_upload(session, "NO-SUCH-ASSET", writer)
+    assert e.value.status_code == 404
+    assert normalize_calls == []
+
+
+def test_accepted_photo_is_normalized(session, assets, writer, normalize_calls):
+    photo = PhotoService.save_photo_upload(session, assets[100], writer)
+    assert photo.is_profile
+    assert normalize_calls == [writer.path]
@@ -0,0 +1,32 @@
+"""AssetReadModel rows follow photo changes and can be refreshed repeatedly."""
+
+from sqlmodel import select
+
+from app.models.asset_photo import AssetPhoto
+from app.models.asset_read_model import AssetReadModel
+from app.services.read_model_service import AssetReadModelService
+
+
+def _photo_count(session, asset_id):
+    session.expire_all()
+    return session.get(AssetReadModel, asset_id).photo_count
+
+
+def test_moving_a_photo_refreshes_both_assets(session, assets):
+    # assets[2] has 3 photos, assets[100] none
+    photo = session.exec(select(AssetPhoto).where(AssetPhoto.asset_id == assets[2])).first()
+    photo.asset_id = assets[100]
+    session.add(photo)
+    session.commit()
+
+    assert _photo_count(session, assets[2]) == 2
+    assert _photo_count(session, assets[100]) == 1
+
+
+def test_refreshing_existing_rows_updates_them_in_place(session, assets):
+    AssetReadModelService.refresh_assets(session.connection(), assets[:3])
+    AssetReadModelService.refresh_assets(session.connection(), assets[:3])
+    session.commit()
+
+    rows = session.exec(select(AssetReadModel).where(AssetReadModel.scom_asset_id.in_(assets[:3]))).all()
+    assert sorted(r.photo_count for r in rows) == [1, 2, 3]
@@ -0,0 +1,81 @@
+"""S3Storage against moto's in-process S3 stand-in."""
+
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from app.core.storage import S3Storage
+
+moto = pytest.importorskip("moto")
+
+BUCKET = "uploads"
+
+
+@pytest.fixture
+def s3(monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    with moto.mock_aws():
+        storage = S3Storage(BUCKET, region="us-east-1", prefix="test/")
+        storage.client.create_bucket(Bucket=BUCKET)
+        yield storage
+
+
+def _put(storage, tmp_path, name, content):
+    path = tmp_path / name.replace("/", "_")
+    path.write_bytes(content)
+    storage.put_file(str(path), name)
+    return path
+
+
+def test_put_open_exists_delete(s3, tmp_path):
+    local = _put(s3, tmp_path, "ab/cd/abcd.jpg", b"photo bytes")
+
+    assert not local.exists()  # consumed
+    assert s3.exists("ab/cd/abcd.jpg")
+    with s3.open("ab/cd/abcd.jpg") as f:
+        assert f.read() == b"photo bytes"
+    head = s3.client.head_object(Bucket=BUCKET, Key="test/ab/cd/abcd.jpg")
+    assert head["ContentType"] == "image/jpeg"
+
+    s3.delete("ab/cd/abcd.jpg")
+    assert not s3.exists("ab/cd/abcd.jpg")
+    s3.delete("ab/cd/abcd.jpg")  # missing files are ignored
+
+
+def test_iter_files_strips_the_key_prefix_and_filters(s3, tmp_path):
+    _put(s3, tmp_path, "ab/cd/abcd.jpg", b"1")
+    _put(s3, tmp_path, "ab/ef/abef.jpg", b"22")
+    _put(s3, tmp_path, "cd/ef/cdef.pdf", b"333")
+    # Outside the storage prefix
+    s3.client.put_object(Bucket=BUCKET, Key="other/ab/cd/x.jpg", Body=b"x")
+
+    assert sorted(f.name for f in s3.iter_files()) == ["ab/cd/abcd.jpg", "ab/ef/abef.jpg", "cd/ef/cdef.pdf"]
+    files = list(s3.iter_files("ab/"))
+    assert sorted((f.name, f.size) for f in files) == [("ab/cd/abcd.jpg", 1), ("ab/ef/abef.jpg", 2)]
+    assert all(f.modified.tzinfo is not None for f in files)
+
+
+def test_missing_object_raises_file_not_found(s3):
+    with pytest.raises(FileNotFoundError):
+        s3.open("ab/cd/missing.jpg")
+    assert not s3.exists("ab/cd/missing.jpg")
+
+
+def test_other_backend_errors_raise_os_error(s3, tmp_path):
+    broken = S3Storage("no-such-bucket", region="us-east-1")
+    with pytest.raises(OSError) as e:
+        _put(broken, tmp_path, "ab/cd/abcd.jpg", b"1")
+    assert not isinstance(e.value, FileNotFoundError)
+    with pytest.raises(OSError):
+        list(broken.iter_files())
+
+
+def test_presigned_url_signs_the_prefixed_key(s3, tmp_path):
+    _put(s3, tmp_path, "ab/cd/abcd.jpg", b"1")
+    url = urlparse(s3.presigned_url("ab/cd/abcd.jpg", expires=60))
+
+    assert url.path.endswith("/test/ab/cd/abcd.jpg")
+    query = parse_qs(url.query)
+    # SigV2 or SigV4 query parameters depending on the botocore version
+    assert "Signature" in query or "X-Amz-Signature" in query
@@ -0,0 +1,83 @@
+"""Background thumbnails: generation, scheduling after commit, and reuse for identical photos."""
+
+import pytest
+from sqlmodel import select
+
+from app.core import db
+from app.models.asset_photo import AssetPhoto
+from app.models.asset_read_model import AssetReadModel
+from app.services.photo_service import PhotoService
+from app.services.thumbnail_service import THUMBNAIL_SIZE, ThumbnailService
+
+Image = pytest.importorskip("PIL.Image")
+
+PHOTO = "ab/cd/abcd_photo.png"
+
+
+@pytest.fixture
+def scheduled(monkeypatch):
+    filenames = []
+    monkeypatch.setattr(ThumbnailService, "schedule", staticmethod(filenames.extend))
+    return filenames
+
+
+@pytest.fixture
+def photo(session, assets, upload_dir):
+    path = upload_dir.joinpath(*PHOTO.split("/"))
+    path.parent.mkdir(parents=True)
+    Image.new("RGBA", (1200, 600), "blue").save(path, format="PNG")
+    # assets[100] has no photos yet
+    session.add(AssetPhoto(asset_id=assets[100], filename=PHOTO, is_profile=True))
+    session.commit()
+    return assets[100]
+
+
+def test_generate_writes_the_thumbnail_and_updates_photo_and_read_model(session, engine, photo, upload_dir,
+                                                                       monkeypatch):
+    monkeypatch.setattr(db, "engine", engine)
+
+    thumb_filename = ThumbnailService.generate(PHOTO)
+
+    assert thumb_filename.startswith("ab/cd/abcd_photo_thumb.")
+    with Image.open(upload_dir.joinpath(*thumb_filename.split("/"))) as thumb:
+        assert thumb.size == (THUMBNAIL_SIZE[0], THUMBNAIL_SIZE[0] // 2)
+    session.expire_all()
+    assert session.exec(select(AssetPhoto.thumb_filename).where(AssetPhoto.filename == PHOTO)).one() == thumb_filename
+    assert session.get(AssetReadModel, photo).profile_thumb_filename == thumb_filename
+    # Partial files are never left behind
+    assert not [p for p in upload_dir.rglob(".thumb_*")]
+
+
+def test_unreadable_photo_gets_no_thumbnail(upload_dir):
+    upload_dir.joinpath("broken.jpg").write_bytes(b"not an image")
+    assert ThumbnailService.render("broken.jpg") is None
+    assert ThumbnailService.render("missing.jpg") is None
+
+
+def test_thumbnails_are_scheduled_only_after_commit(session, scheduled):
+    ThumbnailService.request(session, "a.jpg")
+    ThumbnailService.request(session, "b.jpg")
+    assert scheduled == []
+    session.commit()
+    assert sorted(scheduled) == ["a.jpg", "b.jpg"]
+
+
+def test_rollback_discards_requested_thumbnails(session, scheduled):
+    # Requested inside a transaction, as by PhotoService after its queries
+    session.exec(select(AssetPhoto)).all()
+    ThumbnailService.request(session, "a.jpg")
+    session.rollback()
+    session.commit()
+    assert scheduled == []
+
+
+def test_identical_photo_reuses_the_existing_thumbnail(session, assets, scheduled):
+    session.add(AssetPhoto(asset_id=assets[100], filename=PHOTO, thumb_filename="ab/cd/abcd_photo_thumb.webp"))
+    session.commit()
+
+    photo = PhotoService._add_photo(session, assets[101], PHOTO, is_profile=True)
+    session.commit()
+
+    assert photo.thumb_filename == "ab/cd/abcd_photo_thumb.webp"
+    assert scheduled == []
+    assert session.get(AssetReadModel, assets[101]).profile_thumb_filename == "ab/cd/abcd_photo_thumb.webp"